@@ -77,14 +77,21 @@ PY
 python "src/student_auth/manage.py" migrate --noinput
 python "src/student_auth/manage.py" collectstatic --noinput || true
 
+# Served over ASGI: submission event streams (SUBMISSION_EVENTS_ENABLED) are
+# coroutines there, where WSGI would buffer each one and hold a thread.
+export SUBMISSION_EVENTS_ENABLED="${SUBMISSION_EVENTS_ENABLED:-1}"
+
 if [ "${DEBUG}" = "1" ]; then
-  exec python "src/student_auth/manage.py" runserver 0.0.0.0:8000
+  exec uvicorn student_auth.asgi:application \
+    --app-dir src/student_auth \
+    --host 0.0.0.0 --port 8000 --reload
 else
-  # Run gunicorn in prod-like mode
+  # Run gunicorn in prod-like mode, with uvicorn workers
   pip install gunicorn
-  exec gunicorn student_auth.wsgi:application \
+  exec gunicorn student_auth.asgi:application \
+    --chdir src/student_auth \
+    --worker-class uvicorn.workers.UvicornWorker \
     --bind 0.0.0.0:8000 \
     --workers ${GUNICORN_WORKERS:-3} \
-    --threads ${GUNICORN_THREADS:-2} \
     --timeout ${GUNICORN_TIMEOUT:-60}
-fi
\ No newline at end of file
+fi
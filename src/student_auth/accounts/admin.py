@@ -33,7 +33,7 @@ class StudentAdmin(admin.ModelAdmin):
 
 # ---------- Contest ----------
 class ContestAdmin(admin.ModelAdmin):
-    list_display = ("name", "start_at", "duration_minutes", "is_active")
+    list_display = ("name", "start_at", "duration_minutes", "is_active", "track")
 
 
 admin.site.register(Contest, ContestAdmin)
@@ -50,7 +50,10 @@ class ProblemAdmin(admin.ModelAdmin):
         "contest",
         "code",
         "title",
+        "evaluation_policy",
+        "checker",
     )
+    list_filter = ("evaluation_policy", "checker")
     inlines = [TestCaseInline]
 
 
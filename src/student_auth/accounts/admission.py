@@ -0,0 +1,146 @@
+"""Admission control for new submissions (``run_code``, ``create_submission``).
+
+Checked in order, before anything is written or queued:
+
+1. Coalescing: a submission identical (same code and language) to one of the
+   student's still QUEUED for the problem is not created again; the caller
+   answers with the queued one.
+2. In flight: at most ``ADMISSION_MAX_IN_FLIGHT`` QUEUED/RUNNING submissions
+   per student and problem. Only submissions younger than
+   ``ADMISSION_IN_FLIGHT_WINDOW_S`` count, so one stuck by a lost task does
+   not lock the student out.
+3. Token buckets: per student (``ADMISSION_STUDENT_RATE_PER_MIN``, bursts of
+   ``ADMISSION_STUDENT_BURST``) and for the whole site
+   (``ADMISSION_GLOBAL_*``).
+
+1 and 2 read the student's recent ``Submission`` rows (one query), which are
+authoritative and never leak a slot. The buckets live in the shared cache;
+updates are not atomic, so concurrent requests may slip a token or two past
+a bucket, and a cache outage admits everything. A rate of 0 disables a
+limit.
+
+Rejections carry ``retry_after`` seconds for the 429's ``Retry-After``.
+"""
+
+import logging
+import math
+import time
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import metrics
+from .models import Submission
+
+logger = logging.getLogger(__name__)
+
+BUCKET_PREFIX = "admission:bucket:"
+
+IN_FLIGHT = "in_flight"
+STUDENT_RATE = "student_rate"
+GLOBAL_RATE = "global_rate"
+
+
+class Decision(NamedTuple):
+    allowed: bool
+    reason: str | None = None
+    retry_after: int = 0
+    # The queued submission a coalesced request should be answered with
+    coalesced: Submission | None = None
+
+
+ADMITTED = Decision(True)
+
+
+def _take(name: str, per_min: float, burst: float) -> float:
+    """Take a token from bucket ``name``: 0 if one was available, otherwise
+    the seconds until one will be."""
+    if per_min <= 0:
+        return 0.0
+    rate = per_min / 60.0
+    key = f"{BUCKET_PREFIX}{name}"
+    now = time.time()
+    try:
+        state = cache.get(key)
+    except Exception:
+        return 0.0
+    tokens, at = state if state else (burst, now)
+    tokens = min(burst, tokens + (now - at) * rate)
+    if tokens < 1:
+        return (1 - tokens) / rate
+    try:
+        # Gone once it would have refilled anyway
+        cache.set(key, (tokens - 1, now), int(burst / rate) + 1)
+    except Exception:
+        pass
+    return 0.0
+
+
+def _reject(reason: str, retry_after: float, **extra) -> Decision:
+    metrics.incr("admission.rejected")
+    metrics.incr(f"admission.rejected.{reason}")
+    logger.info("admission.rejected", extra={"reason": reason, **extra})
+    return Decision(False, reason, max(1, math.ceil(retry_after)))
+
+
+def admit(student, problem, code: str, language: str) -> Decision:
+    """Whether a new submission of ``code`` may be created and queued."""
+    if student is not None:
+        window_s = int(getattr(settings, "ADMISSION_IN_FLIGHT_WINDOW_S", 300))
+        window = timezone.now() - timedelta(seconds=window_s)
+        in_flight = list(
+            Submission.objects.filter(
+                student=student,
+                problem=problem,
+                status__in=[Submission.Status.QUEUED, Submission.Status.RUNNING],
+                created_at__gte=window,
+            ).only("id", "status", "language", "code")
+        )
+        for sub in in_flight:
+            if sub.status == Submission.Status.QUEUED and sub.language == language and sub.code == code:
+                metrics.incr("admission.coalesced")
+                logger.info(
+                    "admission.coalesced",
+                    extra={"submission_id": str(sub.id), "student_id": student.id},
+                )
+                return Decision(True, coalesced=sub)
+
+        limit = int(getattr(settings, "ADMISSION_MAX_IN_FLIGHT", 2))
+        if limit and len(in_flight) >= limit:
+            return _reject(
+                IN_FLIGHT,
+                int(getattr(settings, "ADMISSION_IN_FLIGHT_RETRY_S", 2)),
+                student_id=student.id,
+                problem_id=problem.id,
+            )
+
+        wait = _take(
+            f"student:{student.id}",
+            float(getattr(settings, "ADMISSION_STUDENT_RATE_PER_MIN", 20)),
+            float(getattr(settings, "ADMISSION_STUDENT_BURST", 5)),
+        )
+        if wait:
+            return _reject(STUDENT_RATE, wait, student_id=student.id)
+
+    wait = _take(
+        "global",
+        float(getattr(settings, "ADMISSION_GLOBAL_RATE_PER_MIN", 1200)),
+        float(getattr(settings, "ADMISSION_GLOBAL_BURST", 200)),
+    )
+    if wait:
+        return _reject(GLOBAL_RATE, wait)
+    return ADMITTED
+
+
+def stats() -> dict:
+    return {
+        "coalesced": metrics.get("admission.coalesced"),
+        "rejected": metrics.get("admission.rejected"),
+        **{
+            f"rejected_{reason}": metrics.get(f"admission.rejected.{reason}")
+            for reason in (IN_FLIGHT, STUDENT_RATE, GLOBAL_RATE)
+        },
+    }
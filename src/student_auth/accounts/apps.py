@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class AccountsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "accounts"
+
+    def ready(self):
+        # Signal receivers: TestCase cache invalidation, leaderboard refresh,
+        # submission status events, evaluation memo invalidation
+        from . import events, memo, standings, testsuite  # noqa: F401
@@ -0,0 +1,189 @@
+"""Output checkers: decide whether a program's output answers a test case.
+
+Every evaluation path (Judge0 polling and callbacks, ``LocalCodeExecutor``,
+``SubmissionWrapper``) compares through a checker, so a problem is judged
+the same way wherever it runs. A checker is called as
+``check(output, expected, stdin="") -> bool``.
+
+Modes (``Problem.checker``):
+
+- ``exact``     the whole output equals the expected text, ignoring leading
+  and trailing whitespace (the historical rule, and the default);
+- ``lines``     line by line, ignoring trailing whitespace on each line and
+  blank lines at either end;
+- ``tokens``    whitespace-separated tokens, so spacing and line breaks
+  don't matter;
+- ``float``     tokens, with numbers equal within ``checker_tolerance``
+  (absolute or relative);
+- ``unordered`` the same tokens in any order;
+- ``special``   a special judge: ``special_judge`` is the dotted path of a
+  callable ``(stdin, expected, output) -> bool``.
+
+Comparisons stream: ``exact`` compares fixed-size windows in place, and
+``lines``/``tokens``/``float`` walk both texts with an iterator. They stop at
+the first difference and never build a normalized copy of the output (a
+10 MB answer costs no extra 10 MB). ``unordered`` has to count the tokens.
+Output identical to the expected text short-cuts every mode but ``special``.
+"""
+
+import logging
+import math
+from collections import Counter
+from functools import lru_cache, partial
+from itertools import zip_longest
+
+logger = logging.getLogger(__name__)
+
+EXACT = "exact"
+LINES = "lines"
+TOKENS = "tokens"
+FLOAT = "float"
+UNORDERED = "unordered"
+SPECIAL = "special"
+
+DEFAULT_TOLERANCE = 1e-6
+# Characters per comparison window in ``exact``
+WINDOW = 64 * 1024
+
+_SPACE = " \t\n\r\x0b\x0c"
+
+
+def _bounds(text: str):
+    """``(start, end)`` of ``text`` without surrounding whitespace, found without copying."""
+    start, end = 0, len(text)
+    while start < end and text[start] in _SPACE:
+        start += 1
+    while end > start and text[end - 1] in _SPACE:
+        end -= 1
+    return start, end
+
+
+def exact(output, expected, stdin="") -> bool:
+    output, expected = output or "", str(expected or "")
+    a, b = _bounds(output)
+    c, d = _bounds(expected)
+    if b - a != d - c:
+        return False
+    for offset in range(0, b - a, WINDOW):
+        size = min(WINDOW, b - a - offset)
+        if output[a + offset : a + offset + size] != expected[c + offset : c + offset + size]:
+            return False
+    return True
+
+
+def _lines(text: str):
+    start, end = _bounds(text)
+    while start < end:
+        newline = text.find("\n", start, end)
+        stop = end if newline == -1 else newline
+        yield text[start:stop].rstrip()
+        start = stop + 1
+
+
+def lines(output, expected, stdin="") -> bool:
+    if exact(output, expected):
+        return True
+    missing = object()
+    for got, want in zip_longest(_lines(output or ""), _lines(str(expected or "")), fillvalue=missing):
+        if got != want:
+            return False
+    return True
+
+
+def _tokens(text: str):
+    # str.split() on windows cut at whitespace: much faster than a regex per token
+    start, end = 0, len(text)
+    while start < end:
+        stop = min(start + WINDOW, end)
+        while stop < end and text[stop] not in _SPACE:
+            stop += 1
+        yield from text[start:stop].split()
+        start = stop
+
+
+def tokens(output, expected, stdin="") -> bool:
+    if exact(output, expected):
+        return True
+    missing = object()
+    for got, want in zip_longest(_tokens(output or ""), _tokens(str(expected or "")), fillvalue=missing):
+        if got != want:
+            return False
+    return True
+
+
+def _close(got: str, want: str, tolerance: float) -> bool:
+    if got == want:
+        return True
+    try:
+        x, y = float(got), float(want)
+    except ValueError:
+        return False
+    if math.isnan(x) or math.isnan(y):
+        return math.isnan(x) and math.isnan(y)
+    return math.isclose(x, y, rel_tol=tolerance, abs_tol=tolerance)
+
+
+def floats(output, expected, stdin="", tolerance=DEFAULT_TOLERANCE) -> bool:
+    if exact(output, expected):
+        return True
+    for got, want in zip_longest(_tokens(output or ""), _tokens(str(expected or ""))):
+        if got is None or want is None or not _close(got, want, tolerance):
+            return False
+    return True
+
+
+def unordered(output, expected, stdin="") -> bool:
+    if exact(output, expected):
+        return True
+    return Counter(_tokens(output or "")) == Counter(_tokens(str(expected or "")))
+
+
+@lru_cache(maxsize=64)
+def _special_judge(path: str):
+    from django.utils.module_loading import import_string
+
+    return import_string(path)
+
+
+def special(output, expected, stdin="", judge=None) -> bool:
+    try:
+        return bool(_special_judge(judge)(stdin or "", str(expected or ""), output or ""))
+    except Exception:
+        # A broken judge fails the case rather than the evaluation
+        logger.exception("checker.special_judge_failed", extra={"judge": judge})
+        return False
+
+
+CHECKERS = {
+    EXACT: exact,
+    LINES: lines,
+    TOKENS: tokens,
+    FLOAT: floats,
+    UNORDERED: unordered,
+    SPECIAL: special,
+}
+
+
+def get_checker(kind=EXACT, tolerance=None, special_judge=None):
+    """Checker for ``kind``; unknown kinds fall back to ``exact``."""
+    if kind == FLOAT:
+        return partial(floats, tolerance=DEFAULT_TOLERANCE if tolerance is None else float(tolerance))
+    if kind == SPECIAL:
+        if not special_judge:
+            logger.warning("checker.special_judge_missing")
+            return exact
+        return partial(special, judge=special_judge)
+    return CHECKERS.get(kind or EXACT, exact)
+
+
+def for_problem(problem):
+    return get_checker(problem.checker, problem.checker_tolerance, problem.special_judge)
+
+
+def from_metadata(metadata):
+    """Checker from a test-suite file's ``metadata`` (``checker``,
+    ``checker_tolerance``, ``special_judge`` keys), for offline tools."""
+    metadata = metadata or {}
+    return get_checker(
+        metadata.get("checker", EXACT), metadata.get("checker_tolerance"), metadata.get("special_judge")
+    )
@@ -0,0 +1,157 @@
+"""Submission progress events over Redis pub/sub, streamed to browsers as SSE.
+
+Workers publish every status transition of a ``Submission`` (from its
+``post_save``) and every finished case to ``submission:<id>``.
+``submission_events`` (views) subscribes and relays them as Server-Sent
+Events, so a client holds one connection per submission instead of polling
+``get_submission_status``. It needs an ASGI server (``student_auth.asgi``):
+under WSGI Django buffers the whole stream and holds a worker thread until it
+closes. ``start.html`` only opens it when ``SUBMISSION_EVENTS_ENABLED`` is set
+(the Docker images serve ASGI and set it); otherwise it keeps polling.
+
+Publishing is best effort: events are an optimization, the database stays the
+source of truth. Without Redis (``SUBMISSION_EVENTS_REDIS_URL`` empty, or
+down) the stream sends the current state and closes, and ``EventSource``
+reconnects after ``SUBMISSION_EVENTS_RETRY_MS``, which degrades to slow
+polling.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Submission
+
+logger = logging.getLogger(__name__)
+
+CHANNEL_PREFIX = "submission:"
+TERMINAL = {Submission.Status.DONE, Submission.Status.ERROR}
+# After a failed publish, skip publishing for this long instead of paying a
+# connection attempt per event
+BACKOFF_S = 30.0
+
+_lock = threading.Lock()
+_client = None
+_down_until = 0.0
+
+
+def _url() -> str:
+    return getattr(settings, "SUBMISSION_EVENTS_REDIS_URL", "") or ""
+
+
+def channel(submission_id) -> str:
+    return f"{CHANNEL_PREFIX}{submission_id}"
+
+
+def _redis():
+    global _client
+    with _lock:
+        if _client is None:
+            import redis
+
+            _client = redis.Redis.from_url(_url(), socket_connect_timeout=0.5, socket_timeout=1)
+        return _client
+
+
+def publish(submission_id, event: dict) -> None:
+    """Publish ``event`` (must carry a ``type``) for ``submission_id`` now."""
+    global _down_until
+    if not _url() or time.monotonic() < _down_until:
+        return
+    try:
+        _redis().publish(channel(submission_id), json.dumps(event))
+    except Exception:
+        _down_until = time.monotonic() + BACKOFF_S
+        logger.warning("submission_events.publish_failed", extra={"submission_id": str(submission_id)})
+
+
+def publish_on_commit(submission_id, event: dict) -> None:
+    """Publish once the surrounding transaction commits, so a client that
+    reacts by reading the database sees what the event announced."""
+    transaction.on_commit(lambda: publish(submission_id, event))
+
+
+def status_event(sub) -> dict:
+    return {
+        "type": "status",
+        "status": sub.status,
+        "score": sub.score,
+        "max_score": sub.max_score,
+    }
+
+
+def case_done(submission_id, index, fields) -> None:
+    """A case finished; ``fields`` are its result fields."""
+    publish_on_commit(
+        submission_id,
+        {"type": "case", "index": index, "status": fields.get("status"), "passed": bool(fields.get("passed"))},
+    )
+
+
+@receiver(post_save, sender=Submission, dispatch_uid="submission_events_on_save")
+def _publish_status(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or "status" in update_fields:
+        publish_on_commit(instance.id, status_event(instance))
+
+
+def _format(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+async def stream(sub):
+    """SSE body for ``sub``: its current state, then live events until it
+    reaches DONE or ERROR (or ``SUBMISSION_EVENTS_MAX_S`` passes)."""
+    retry_ms = int(getattr(settings, "SUBMISSION_EVENTS_RETRY_MS", 3000))
+    keepalive_s = float(getattr(settings, "SUBMISSION_EVENTS_KEEPALIVE_S", 15))
+    max_s = float(getattr(settings, "SUBMISSION_EVENTS_MAX_S", 300))
+
+    yield f"retry: {retry_ms}\n\n"
+    client = pubsub = None
+    if _url():
+        try:
+            import redis.asyncio as aioredis
+
+            client = aioredis.Redis.from_url(_url(), socket_connect_timeout=0.5)
+            pubsub = client.pubsub()
+            # Subscribe before reading the state, so nothing falls in between
+            await pubsub.subscribe(channel(sub.id))
+        except Exception:
+            logger.warning("submission_events.subscribe_failed", extra={"submission_id": str(sub.id)})
+            pubsub = None
+
+    try:
+        await sub.arefresh_from_db(fields=["status", "score", "max_score"])
+        yield _format(status_event(sub))
+        if pubsub is None or sub.status in TERMINAL:
+            return
+
+        deadline = time.monotonic() + max_s
+        while time.monotonic() < deadline:
+            try:
+                message = await asyncio.wait_for(
+                    pubsub.get_message(ignore_subscribe_messages=True, timeout=keepalive_s),
+                    timeout=keepalive_s + 1,
+                )
+            except asyncio.TimeoutError:
+                message = None
+            if message is None:
+                yield ": keepalive\n\n"
+                continue
+            event = json.loads(message["data"])
+            yield _format(event)
+            if event.get("type") == "status" and event.get("status") in TERMINAL:
+                return
+    finally:
+        for resource in (pubsub, client):
+            if resource is not None:
+                try:
+                    await resource.aclose()
+                except Exception:
+                    pass
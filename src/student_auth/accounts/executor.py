@@ -0,0 +1,556 @@
+"""Local (fallback) code execution engine.
+
+Test cases run concurrently, one child process each, with at most
+``max_workers`` (CPU count by default) alive at a time. The source is written
+once per submission; stdin/stdout go through files in the same scratch
+directory so large outputs never block on a pipe.
+
+On POSIX every child runs under ``RLIMIT_AS``/``RLIMIT_CPU`` (set by a ``sh``
+that execs it, or by the warm runner) and its CPU time and peak RSS are taken
+from ``wait4()`` rusage. Linux carries the forking process' peak RSS across
+``exec``, so only the ``warm`` backend (which forks from a small runner) gives
+meaningful ``memory_kb``. Elsewhere (Windows) only
+the wall-clock timeout applies and time is measured by the parent.
+
+Two backends start the children:
+
+- ``warm`` (default where ``fork()`` exists): a per-process ``RunnerPool`` of
+  long-lived ``zygote.py`` interpreters compiles the source once and forks a
+  child per case, skipping interpreter start-up.
+- ``subprocess``: a fresh ``sys.executable`` per case.
+
+C, C++ and Java are compiled once per distinct source through ``BuildCache``
+(artifacts keyed by a hash of toolchain and source, shared by every process on
+the host) and the binary is then run for each case.
+
+Django is optional here so standalone scripts can use the executor; limits
+come from ``LOCAL_EXECUTOR_*`` settings when Django is configured.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from . import checkers
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Children killed by RLIMIT_CPU die of SIGXCPU
+SIGXCPU = getattr(signal, "SIGXCPU", None)
+
+
+def _setting(name, default):
+    try:
+        from django.conf import settings
+
+        return getattr(settings, name, default)
+    except Exception:  # Django missing or not configured
+        return default
+
+
+ZYGOTE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "zygote.py")
+
+
+class RunnerError(RuntimeError):
+    pass
+
+
+class _Runner:
+    """One warm ``zygote.py`` interpreter, used by one thread at a time."""
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, ZYGOTE_PATH],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self.lock = threading.Lock()
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def run(self, request: dict) -> list:
+        with self.lock:
+            try:
+                self.process.stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+                self.process.stdin.flush()
+                line = self.process.stdout.readline()
+            except OSError as e:
+                raise RunnerError(str(e))
+        if not line:
+            raise RunnerError("runner exited")
+        response = json.loads(line)
+        if "error" in response:
+            raise RunnerError(response["error"])
+        return response["results"]
+
+    def close(self) -> None:
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=1)
+        except Exception:
+            self.process.kill()
+
+
+class RunnerPool:
+    """Warm runners owned by the current process, started on first use."""
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._runners = []
+        self._lock = threading.Lock()
+
+    def runners(self, count: int) -> list:
+        with self._lock:
+            self._runners = [r for r in self._runners if r.alive()]
+            while len(self._runners) < min(count, self.size):
+                self._runners.append(_Runner())
+            return self._runners[: min(count, self.size)]
+
+    def discard(self, runner) -> None:
+        with self._lock:
+            if runner in self._runners:
+                self._runners.remove(runner)
+        runner.close()
+
+    def close(self) -> None:
+        with self._lock:
+            runners, self._runners = self._runners, []
+        for runner in runners:
+            runner.close()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_runner_pool(size: int) -> RunnerPool:
+    """This process' runner pool, grown to at least ``size`` runners."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = RunnerPool(size)
+        _pool.size = max(_pool.size, size)
+        return _pool
+
+
+def reset_runner_pool() -> None:
+    """Forget runners inherited over ``fork()``; their pipes belong to the parent."""
+    global _pool, _pool_lock
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_runner_pool)
+
+
+# language -> (source file, compile argv, run argv, apply RLIMIT_AS). {src} is
+# the source path and {out} the artifact directory. The JVM reserves far more
+# address space than it uses, so Java only gets the CPU limit.
+TOOLCHAINS = {
+    "cpp": ("main.cpp", ["g++", "-O2", "-std=c++17", "-o", "{out}/main", "{src}"], ["{out}/main"], True),
+    "c": ("main.c", ["gcc", "-O2", "-std=c11", "-o", "{out}/main", "{src}", "-lm"], ["{out}/main"], True),
+    "java": ("Main.java", ["javac", "-d", "{out}", "{src}"], ["java", "-cp", "{out}", "Main"], False),
+}
+COMPILE_ERROR_FILE = "compile_error.txt"
+
+
+class BuildCache:
+    """Compiled artifacts keyed by ``sha256(toolchain + source)``.
+
+    Builds happen in a private staging directory that is renamed into place,
+    so concurrent workers compiling the same source never see a partial
+    artifact. Compilation errors are cached too. The least recently used
+    entries beyond ``max_entries`` are pruned after each build.
+    """
+
+    def __init__(self, root=None, max_entries=None, compile_timeout=30):
+        self.root = root or _setting("LOCAL_EXECUTOR_BUILD_CACHE_DIR", "") or os.path.join(
+            tempfile.gettempdir(), "local_exec_builds"
+        )
+        self.max_entries = int(max_entries or _setting("LOCAL_EXECUTOR_BUILD_CACHE_SIZE", 200))
+        self.compile_timeout = compile_timeout
+
+    def key(self, language, code) -> str:
+        source_name, compile_argv, _, _ = TOOLCHAINS[language]
+        digest = hashlib.sha256(json.dumps([language, source_name, compile_argv]).encode())
+        digest.update(code.encode("utf-8"))
+        return digest.hexdigest()
+
+    def build(self, language, code):
+        """Return ``(artifact_dir, compile_error, cached)``."""
+        os.makedirs(self.root, exist_ok=True)
+        final = os.path.join(self.root, self.key(language, code))
+        if os.path.isdir(final):
+            os.utime(final)  # LRU bookkeeping
+            return final, self._compile_error(final), True
+
+        source_name, compile_argv, _, _ = TOOLCHAINS[language]
+        staging = tempfile.mkdtemp(prefix=".build-", dir=self.root)
+        try:
+            src = os.path.join(staging, source_name)
+            with open(src, "w", encoding="utf-8") as f:
+                f.write(code)
+            try:
+                proc = subprocess.run(
+                    [a.format(src=src, out=staging) for a in compile_argv],
+                    cwd=staging,
+                    capture_output=True,
+                    text=True,
+                    timeout=self.compile_timeout,
+                )
+                error = None
+                if proc.returncode:
+                    # Diagnostics name the staging dir, which is renamed below
+                    error = (proc.stderr or proc.stdout or "compilation failed").replace(
+                        staging + os.sep, ""
+                    )
+            except subprocess.TimeoutExpired:
+                error = "Compilation timed out"
+            if error:
+                with open(os.path.join(staging, COMPILE_ERROR_FILE), "w", encoding="utf-8") as f:
+                    f.write(error)
+            try:
+                os.rename(staging, final)
+            except OSError:
+                pass  # another worker finished the same build first
+            else:
+                staging = None
+                self._prune()
+            return final, self._compile_error(final), False
+        finally:
+            if staging:
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _compile_error(self, path):
+        try:
+            with open(os.path.join(path, COMPILE_ERROR_FILE), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def _prune(self):
+        try:
+            entries = [
+                os.path.join(self.root, name)
+                for name in os.listdir(self.root)
+                if not name.startswith(".")
+            ]
+            if len(entries) <= self.max_entries:
+                return
+            entries.sort(key=os.path.getmtime)
+            for path in entries[: len(entries) - self.max_entries]:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+
+def toolchain_available(language) -> bool:
+    toolchain = TOOLCHAINS.get(language)
+    if toolchain is None:
+        return False
+    programs = {toolchain[1][0], toolchain[2][0]} - {"{out}/main"}
+    return all(shutil.which(program) for program in programs)
+
+
+def _rss_kb(ru_maxrss: int) -> int:
+    # Linux reports kilobytes, macOS bytes
+    return int(ru_maxrss / 1024) if sys.platform == "darwin" else int(ru_maxrss)
+
+
+class LocalCodeExecutor:
+    """Fallback local code executor for when Judge0 fails"""
+
+    def __init__(self, timeout=None, memory_limit_mb=None, max_workers=None, backend=None, checker=None):
+        self.timeout = float(timeout or _setting("LOCAL_EXECUTOR_TIMEOUT_S", 5))
+        self.memory_limit_mb = int(
+            memory_limit_mb or _setting("LOCAL_EXECUTOR_MEMORY_MB", 256)
+        )
+        self.max_workers = int(
+            max_workers
+            or _setting("LOCAL_EXECUTOR_MAX_WORKERS", None)
+            or os.cpu_count()
+            or 1
+        )
+        self.backend = backend or _setting("LOCAL_EXECUTOR_BACKEND", "warm")
+        if self.backend == "warm" and (resource is None or not hasattr(os, "fork")):
+            self.backend = "subprocess"
+        # ``check(output, expected, stdin)``; see ``accounts.checkers``
+        self.checker = checker or checkers.exact
+
+    def _limited(self, argv, limit_memory=True):
+        """``argv`` behind a ``sh`` that sets RLIMIT_CPU (and RLIMIT_AS) and
+        execs it. Not a ``preexec_fn``: that can deadlock a child forked from
+        a threaded process, and cases (and Celery ``-P threads``) run in
+        threads."""
+        script = f"ulimit -t {int(self.timeout) + 1}"
+        if limit_memory:
+            script += f" && ulimit -v {self.memory_limit_mb * 1024}"
+        return ["/bin/sh", "-c", script + ' && exec "$@"', "sh", *argv]
+
+    def execute_code(self, language, code, test_cases):
+        """Run ``code`` in ``language``; unsupported toolchains yield Internal Error rows."""
+        if language == "python":
+            return self.execute_python_code(code, test_cases)
+        if toolchain_available(language):
+            return self.execute_compiled_code(language, code, test_cases)
+        return [
+            self._error_result(i, case, "Internal Error", f"No local toolchain for {language}")
+            for i, case in enumerate(test_cases)
+        ]
+
+    def execute_python_code(self, code, test_cases):
+        """Execute Python code locally with test cases"""
+        if not test_cases:
+            return []
+        workdir = tempfile.mkdtemp(prefix="local_exec_")
+        try:
+            source = os.path.join(workdir, "main.py")
+            with open(source, "w", encoding="utf-8") as f:
+                f.write(code)
+            cases = self._prepare_cases(workdir, test_cases)
+
+            runs = None
+            if self.backend == "warm":
+                runs = self._run_warm({"source": source, "memory_mb": self.memory_limit_mb}, cases)
+            if runs is None:
+                runs = self._run_all_cold([sys.executable, source], workdir, cases)
+
+            return [
+                self._verdict(index, test_case, paths, run)
+                for index, (test_case, paths, run) in enumerate(zip(test_cases, cases, runs))
+            ]
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def execute_compiled_code(self, language, code, test_cases):
+        """Compile once (through the build cache), then run every case on the artifact."""
+        if not test_cases:
+            return []
+        artifact, compile_error, _ = BuildCache().build(language, code)
+        if compile_error:
+            return [
+                self._error_result(i, case, "Compilation Error", compile_error)
+                for i, case in enumerate(test_cases)
+            ]
+
+        _, _, run_argv, limit_memory = TOOLCHAINS[language]
+        workdir = tempfile.mkdtemp(prefix="local_exec_")
+        try:
+            cases = self._prepare_cases(workdir, test_cases)
+            argv = [a.format(out=artifact) for a in run_argv]
+            runs = None
+            if self.backend == "warm":
+                request = {"argv": argv, "memory_mb": self.memory_limit_mb if limit_memory else 0}
+                runs = self._run_warm(request, cases)
+            if runs is None:
+                runs = self._run_all_cold(argv, workdir, cases, limit_memory)
+            return [
+                self._verdict(index, test_case, paths, run)
+                for index, (test_case, paths, run) in enumerate(zip(test_cases, cases, runs))
+            ]
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    def _prepare_cases(self, workdir, test_cases):
+        cases = []
+        for index, test_case in enumerate(test_cases):
+            paths = {
+                name: os.path.join(workdir, f"{index}.{ext}")
+                for name, ext in (("stdin", "in"), ("stdout", "out"), ("stderr", "err"))
+            }
+            with open(paths["stdin"], "w", encoding="utf-8") as f:
+                f.write(test_case.get("stdin", "") or "")
+            cases.append(paths)
+        return cases
+
+    def _run_all_cold(self, argv, workdir, cases, limit_memory=True):
+        workers = max(1, min(self.max_workers, len(cases)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(
+                pool.map(lambda paths: self._run_cold(argv, workdir, paths, limit_memory), cases)
+            )
+
+    def _error_result(self, index, test_case, status, message):
+        return {
+            "index": index,
+            "group": "visible",
+            "weight": 1.0,
+            "status": status,
+            "passed": False,
+            "time_ms": 0,
+            "memory_kb": 0,
+            "output": "",
+            "expected_output": test_case.get("expected_output", ""),
+            "stderr": message,
+            "exit_code": -1,
+        }
+
+    def _run_warm(self, request, cases):
+        """Split the cases round-robin over warm runners, one thread per runner.
+
+        Returns ``None`` when the runners fail, so the caller falls back to
+        cold processes.
+        """
+        pool = get_runner_pool(self.max_workers)
+        try:
+            runners = pool.runners(min(len(cases), self.max_workers))
+        except OSError:
+            return None
+        shares = [list(range(i, len(cases), len(runners))) for i in range(len(runners))]
+
+        def run_share(runner, indexes):
+            share = {**request, "timeout": self.timeout, "cases": [cases[i] for i in indexes]}
+            try:
+                return indexes, runner.run(share)
+            except (RunnerError, ValueError):
+                pool.discard(runner)
+                raise
+
+        runs = [None] * len(cases)
+        try:
+            with ThreadPoolExecutor(max_workers=len(runners)) as threads:
+                for indexes, results in threads.map(run_share, runners, shares):
+                    for i, run in zip(indexes, results):
+                        runs[i] = run
+        except (RunnerError, ValueError):
+            return None
+        return runs
+
+    def _run_cold(self, argv, workdir, paths, limit_memory=True):
+        with open(paths["stdin"], "rb") as stdin, open(paths["stdout"], "wb") as stdout, open(
+            paths["stderr"], "wb"
+        ) as stderr:
+            exit_code, time_ms, memory_kb, timed_out = self._spawn(
+                argv, stdin, stdout, stderr, workdir, limit_memory
+            )
+        return {
+            "exit_code": exit_code,
+            "time_ms": time_ms,
+            "memory_kb": memory_kb,
+            "timed_out": timed_out,
+        }
+
+    def _verdict(self, index, test_case, paths, run):
+        expected_output = test_case.get("expected_output", "")
+        result = {
+            "index": index,
+            "group": "visible",
+            "weight": 1.0,
+            "status": "Internal Error",
+            "passed": False,
+            "time_ms": 0,
+            "memory_kb": 0,
+            "output": "",
+            "expected_output": expected_output,
+            "stderr": "",
+            "exit_code": -1,
+        }
+        try:
+            exit_code, timed_out = run["exit_code"], run["timed_out"]
+            time_ms, memory_kb = run["time_ms"], run["memory_kb"]
+            with open(paths["stdout"], encoding="utf-8", errors="replace") as f:
+                output = f.read()
+            with open(paths["stderr"], encoding="utf-8", errors="replace") as f:
+                err = f.read()
+        except Exception as e:
+            result["stderr"] = str(e)
+            return result
+
+        passed = self.checker(output, expected_output, test_case.get("stdin", ""))
+        output = output.strip()
+        if timed_out or (SIGXCPU and exit_code == -SIGXCPU):
+            status = "Time Limit Exceeded"
+            err = err or "Time limit exceeded"
+            passed = False
+        elif exit_code != 0:
+            status = "Memory Limit Exceeded" if "MemoryError" in err else "Runtime Error"
+            passed = False
+        else:
+            status = "Accepted" if passed else "Wrong Answer"
+
+        result.update(
+            {
+                "status": status,
+                "passed": passed,
+                "time_ms": time_ms,
+                "memory_kb": memory_kb,
+                "output": output if not timed_out else "",
+                "stderr": err,
+                "exit_code": exit_code,
+            }
+        )
+        return result
+
+    def _spawn(self, argv, stdin, stdout, stderr, cwd, limit_memory=True):
+        """Run one child; returns ``(exit_code, time_ms, memory_kb, timed_out)``."""
+        use_rusage = resource is not None and hasattr(os, "wait4")
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            self._limited(argv, limit_memory) if use_rusage else argv,
+            stdin=stdin,
+            stdout=stdout,
+            stderr=stderr,
+            cwd=cwd,
+        )
+
+        if not use_rusage:
+            try:
+                process.wait(timeout=self.timeout)
+                timed_out = False
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+                timed_out = True
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            return process.returncode, round(elapsed_ms, 3), 0, timed_out
+
+        # RLIMIT_CPU does not cover sleeping/blocked children, so a wall-clock
+        # timer backs it up. The timer must never signal a reaped pid (it may
+        # have been reused), so reaping and its check share ``lock``.
+        expired = threading.Event()
+        lock = threading.Lock()
+        reaped = False
+
+        def _kill():
+            with lock:
+                if reaped:
+                    return
+                expired.set()
+                try:
+                    os.kill(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+        timer = threading.Timer(self.timeout, _kill)
+        timer.start()
+        try:
+            if hasattr(os, "waitid"):
+                # Wait for the exit without reaping, so the wait4 below
+                # returns at once and can run under the lock
+                os.waitid(os.P_PID, process.pid, os.WEXITED | os.WNOWAIT)
+                with lock:
+                    _, status, usage = os.wait4(process.pid, 0)
+                    reaped = True
+            else:
+                _, status, usage = os.wait4(process.pid, 0)
+                with lock:
+                    reaped = True
+            process.returncode = os.waitstatus_to_exitcode(status)
+        finally:
+            timer.cancel()
+        cpu_ms = (usage.ru_utime + usage.ru_stime) * 1000
+        return process.returncode, round(cpu_ms, 3), _rss_kb(usage.ru_maxrss), expired.is_set()
@@ -0,0 +1,167 @@
+"""Process-wide, pooled HTTP client for Judge0.
+
+Every Judge0 call goes through one ``requests.Session`` per (process, base URL)
+so TCP connections are kept alive and reused across submissions instead of
+being opened per request. The session is dropped after ``fork()`` (Celery
+prefork children, gunicorn workers) so each worker owns its own pool.
+
+Importing this module does not require Django settings; ``get_client()``
+reads ``JUDGE0_URL``/``JUDGE0_AUTH_TOKEN`` lazily for whichever of
+``base_url``/``auth_token`` is not given (from the environment when Django is
+not configured), and clients built from settings report every outcome to
+``judge0_health``.
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+
+
+class Judge0Client:
+    """Thin wrapper around a tuned ``requests.Session`` for one Judge0 instance."""
+
+    def __init__(
+        self,
+        base_url: str,
+        auth_token: str = "",
+        pool_maxsize: int = 10,
+        max_retries: int = 2,
+        timeout=DEFAULT_TIMEOUT,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        if auth_token:
+            self.session.headers["X-Auth-Token"] = auth_token
+
+        # Connect errors are always safe to retry; read errors and 5xx answers
+        # are retried for idempotent methods only, so a POST never creates
+        # duplicate Judge0 submissions.
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET", "HEAD", "DELETE"}),
+            raise_on_status=False,
+        )
+        self.adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=pool_maxsize, max_retries=retry
+        )
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self.requests_sent = 0
+        # Optional ``hook(response=None, error=None)`` fed with every outcome
+        self.on_response = None
+
+    def request(self, method: str, path: str, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", self.timeout)
+        self.requests_sent += 1
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            self._report(error=e)
+            raise
+        self._report(response=response)
+        return response
+
+    def _report(self, response=None, error=None) -> None:
+        if self.on_response is None:
+            return
+        try:
+            self.on_response(response=response, error=error)
+        except Exception:
+            pass  # health bookkeeping must never break a Judge0 call
+
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+
+    def delete(self, path: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", path, **kwargs)
+
+    def stats(self) -> dict:
+        """Connection-reuse counters for this process' pool."""
+        opened = 0
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is not None:
+                opened += getattr(pool, "num_connections", 0)
+        sent = self.requests_sent
+        return {
+            "pid": os.getpid(),
+            "requests": sent,
+            "connections_opened": opened,
+            "connections_reused": max(0, sent - opened),
+            "reuse_ratio": round((sent - opened) / sent, 3) if sent else 0.0,
+        }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def get_client(base_url: str | None = None, auth_token: str | None = None) -> Judge0Client:
+    """Return the shared client for ``base_url`` (``settings.JUDGE0_URL`` by default)."""
+    from_settings = base_url is None or auth_token is None
+    pool_maxsize = 10
+    if from_settings:
+        from django.conf import settings
+
+        if settings.configured:
+            if base_url is None:
+                base_url = getattr(settings, "JUDGE0_URL", "http://localhost:2358")
+            if auth_token is None:
+                auth_token = getattr(settings, "JUDGE0_AUTH_TOKEN", "")
+            pool_maxsize = int(getattr(settings, "JUDGE0_POOL_MAXSIZE", 10))
+        else:
+            # Standalone script: the same variables, without the breaker
+            if base_url is None:
+                base_url = os.getenv("JUDGE0_URL", "http://localhost:2358")
+            if auth_token is None:
+                auth_token = os.getenv("JUDGE0_AUTH_TOKEN", "")
+            from_settings = False
+
+    key = (base_url.rstrip("/"), auth_token)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = Judge0Client(key[0], auth_token, pool_maxsize=pool_maxsize)
+                _clients[key] = client
+    if from_settings and client.on_response is None:
+        # The configured Judge0 feeds the shared circuit breaker
+        from .judge0_health import record_response
+
+        client.on_response = record_response
+    return client
+
+
+def pool_stats() -> list:
+    return [client.stats() for client in list(_clients.values())]
+
+
+def reset_clients() -> None:
+    """Forget all pooled sessions (sockets are not shared across processes)."""
+    global _lock
+    _clients.clear()
+    _lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=reset_clients)
@@ -0,0 +1,143 @@
+"""Shared Judge0 availability state (circuit breaker).
+
+The state lives in the Django cache so every web and Celery process sees the
+same view. It is refreshed in the background by the ``refresh_judge0_health``
+beat task and updated passively from the outcome of real Judge0 requests made
+through ``judge0_client``; request paths only ever *read* it.
+
+States:
+- ``closed``    Judge0 is healthy, route submissions to it.
+- ``open``      Too many consecutive failures; route to the local executor until
+                ``JUDGE0_BREAKER_COOLDOWN_S`` has passed.
+- ``half_open`` Cooldown elapsed; the next real request decides whether the
+                breaker closes again or re-opens.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY = "judge0:health"
+# Cached state survives well past the beat interval, so a stopped beat never
+# leaves workers without a state to route on.
+STATE_TTL = 24 * 60 * 60
+# How long a process trusts its own copy of a healthy state before re-reading
+LOCAL_TTL = 5.0
+
+_local = {"state": None, "read_at": 0.0}
+
+
+def _threshold() -> int:
+    return int(getattr(settings, "JUDGE0_BREAKER_FAILURE_THRESHOLD", 3))
+
+
+def _cooldown() -> float:
+    return float(getattr(settings, "JUDGE0_BREAKER_COOLDOWN_S", 30))
+
+
+def _initial_state() -> dict:
+    return {
+        "state": "closed",
+        "failures": 0,
+        "error": None,
+        "opened_at": None,
+        "changed_at": None,
+        "checked_at": None,
+    }
+
+
+def _read() -> dict:
+    state = cache.get(CACHE_KEY) or _initial_state()
+    _local["state"] = state
+    _local["read_at"] = time.time()
+    return state
+
+
+def _write(state: dict) -> None:
+    cache.set(CACHE_KEY, state, STATE_TTL)
+    _local["state"] = state
+    _local["read_at"] = time.time()
+
+
+def get_state() -> dict:
+    """Current breaker state, with ``open`` reported as ``half_open`` after cooldown."""
+    state = dict(_read())
+    if (
+        state["state"] == "open"
+        and state.get("opened_at")
+        and time.time() - state["opened_at"] >= _cooldown()
+    ):
+        state["state"] = "half_open"
+    return state
+
+
+def is_available():
+    """Return ``(ok, error)`` without touching the network."""
+    state = get_state()
+    if state["state"] == "open":
+        return False, state.get("error") or "Judge0 circuit breaker is open"
+    return True, None
+
+
+def record_success() -> None:
+    local = _local["state"]
+    if (
+        local
+        and local["state"] == "closed"
+        and not local["failures"]
+        and time.time() - _local["read_at"] < LOCAL_TTL
+    ):
+        return  # already healthy, skip the cache write on the hot path
+
+    state = _read()
+    if state["state"] == "closed" and not state["failures"]:
+        return
+    now = time.time()
+    _write(
+        {
+            **state,
+            "state": "closed",
+            "failures": 0,
+            "error": None,
+            "opened_at": None,
+            "changed_at": now if state["state"] != "closed" else state.get("changed_at"),
+        }
+    )
+
+
+def record_failure(error: str) -> None:
+    state = _read()
+    now = time.time()
+    failures = int(state.get("failures") or 0) + 1
+    new_state = {**state, "failures": failures, "error": str(error)[:500]}
+    # Any failure while (half-)open restarts the cooldown
+    if state["state"] == "open" or failures >= _threshold():
+        if state["state"] != "open":
+            new_state["changed_at"] = now
+        new_state["state"] = "open"
+        new_state["opened_at"] = now
+    _write(new_state)
+
+
+def record_response(response=None, error=None) -> None:
+    """Passive update hook called by ``Judge0Client`` after every request."""
+    if error is not None:
+        record_failure(error)
+    elif response is not None and response.status_code >= 500:
+        record_failure(f"HTTP {response.status_code} from Judge0")
+    else:
+        record_success()
+
+
+def probe() -> dict:
+    """Actively check ``/about`` and return the resulting state (beat task only)."""
+    from .judge0_client import get_client
+
+    try:
+        get_client().get("/about", timeout=5)
+    except Exception:
+        pass  # the client's hook has already recorded the outcome
+    state = _read()
+    _write({**state, "checked_at": time.time()})
+    return get_state()
@@ -1,6 +1,7 @@
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
-from accounts.models import Submission, SubmissionTestCaseResult, UserSolution
+from accounts import standings
+from accounts.models import Contest, Submission, SubmissionTestCaseResult, UserSolution
 
 
 class Command(BaseCommand):
@@ -100,6 +101,7 @@ class Command(BaseCommand):
                 sol_qs = sol_qs.filter(student_id=student_id)
             if problem_id:
                 sol_qs = sol_qs.filter(problem_id=problem_id)
+            contests = set(sol_qs.values_list("problem__contest", flat=True))
             updated = sol_qs.update(
                 is_solved=False,
                 attempts=0,
@@ -113,3 +115,6 @@ class Command(BaseCommand):
                     f"Reset {updated} UserSolution records (is_solved, attempts, solved_at, best_*)."
                 )
             )
+            # update() bypasses the signals that keep standings current
+            for contest in Contest.objects.filter(id__in=contests):
+                standings.rebuild(contest)
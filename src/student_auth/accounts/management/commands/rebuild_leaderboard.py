@@ -0,0 +1,33 @@
+"""
+Recompute materialized leaderboard standings from UserSolution rows.
+
+Standings are kept current on every solve; run this after bulk edits that
+bypass model signals (queryset.update, raw SQL) or after moving a contest's
+start time.
+"""
+
+from django.core.management.base import BaseCommand
+
+from accounts import standings
+from accounts.models import Contest
+
+
+class Command(BaseCommand):
+    help = "Rebuild leaderboard standings for one or all contests"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--contest-id",
+            type=int,
+            help="Only rebuild this contest",
+        )
+
+    def handle(self, *args, **options):
+        contests = Contest.objects.all()
+        if options["contest_id"]:
+            contests = contests.filter(id=options["contest_id"])
+
+        for contest in contests:
+            entries = standings.rebuild(contest)
+            self.stdout.write(f"{contest.name}: {entries} standings")
+        self.stdout.write(self.style.SUCCESS("Leaderboard rebuilt"))
@@ -6,12 +6,14 @@ This command:
 2. Finds files that don't have corresponding TestCase database entries
 3. Creates missing TestCase entries for valid problem/language combinations
 4. Reports on any files that can't be processed
+5. Drops cached parsed suites for the entries it touches
 """
 
 import os
 import json
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
+from accounts import testsuite
 from accounts.models import Problem, TestCase
 
 
@@ -140,6 +142,9 @@ class Command(BaseCommand):
                     self.stdout.write(
                         f"      ✅ TestCase entry already exists (ID: {existing_testcase.id})"
                     )
+                    if not dry_run:
+                        # The file may have been rewritten in place
+                        testsuite.invalidate(existing_testcase.id)
                     stats["entries_existed"] += 1
                     continue
 
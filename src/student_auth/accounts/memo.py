@@ -0,0 +1,189 @@
+"""Evaluation results memoized by source.
+
+Students often resubmit byte-identical code (a double-clicked Run, a retry
+after a network hiccup). Before anything is sent to Judge0,
+``evaluate_submission`` looks the evaluation up under ``key()``: a sha256 of
+the wrapped source, the language and the test-suite version. On a hit the
+per-case results are copied into the new submission.
+
+The suite version covers everything else that decides the verdicts: a
+per-problem counter bumped when a ``TestCase`` or the ``Problem`` is saved or
+deleted (``invalidate``), each test file's path, mtime and size, and the
+problem's checker and evaluation policy.
+
+Only complete (DONE) evaluations are stored, in the shared cache for
+``EVAL_MEMO_TTL_S``, and only when every verdict would repeat: a result with
+a ``TRANSIENT_STATUSES`` row (a TLE under load, an internal error) is not, so
+resubmitting retries it. At most ``EVAL_MEMO_MAX_ENTRIES`` are kept (the oldest
+are evicted first) and results larger than ``EVAL_MEMO_MAX_BYTES`` are not
+stored. ``EVAL_MEMO_ENABLED=0`` turns memoization off.
+"""
+
+import hashlib
+import json
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import metrics, testsuite
+from .models import Problem, Submission, TestCase
+from .results import result_row
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "evalmemo:"
+VERSION_PREFIX = "evalmemo:problem:"
+# Stored keys, oldest first, for the entry bound
+INDEX_KEY = "evalmemo:index"
+
+# Result-row fields copied into the new submission
+FIELDS = ("output", "passed", "status", "time_ms", "memory_kb", "judge0_raw")
+
+# Verdicts a rerun of the same code may not repeat (Judge0 under load, a
+# failed local fallback, a case whose result never arrived)
+TRANSIENT_STATUSES = frozenset(
+    {"Time Limit Exceeded", "Internal Error", "Exec Format Error", "Unknown", "Callback Timeout"}
+)
+
+
+def enabled() -> bool:
+    return bool(getattr(settings, "EVAL_MEMO_ENABLED", True))
+
+
+def _ttl() -> int:
+    return int(getattr(settings, "EVAL_MEMO_TTL_S", 60 * 60))
+
+
+def _max_entries() -> int:
+    return int(getattr(settings, "EVAL_MEMO_MAX_ENTRIES", 1000))
+
+
+def _max_bytes() -> int:
+    return int(getattr(settings, "EVAL_MEMO_MAX_BYTES", 256 * 1024))
+
+
+def _problem_version(problem_id):
+    version_key = f"{VERSION_PREFIX}{problem_id}"
+    # Seeded from the clock so a counter lost to eviction never comes back
+    # at a value old entries were stored under
+    cache.add(version_key, time.time_ns() // 1000, None)
+    return cache.get(version_key)
+
+
+def invalidate(problem_id) -> None:
+    """Forget every memoized evaluation of ``problem_id``."""
+    version_key = f"{VERSION_PREFIX}{problem_id}"
+    try:
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            cache.set(version_key, time.time_ns() // 1000, None)
+    except Exception:
+        logger.warning("evaluation_memo.invalidate_failed", extra={"problem_id": problem_id})
+
+
+def key(wrapped_code: str, language: str, problem, testcases):
+    """Memo key for evaluating ``wrapped_code`` against ``testcases`` (in the
+    order their cases are run), or ``None`` when memoization is off or the
+    suite cannot be versioned."""
+    if not enabled():
+        return None
+    try:
+        version = _problem_version(problem.id)
+        suite = {
+            "version": version,
+            "files": [testsuite.file_stamp(tc) for tc in testcases],
+            "checker": [problem.checker, problem.checker_tolerance, problem.special_judge],
+            "policy": problem.evaluation_policy,
+        }
+    except Exception:
+        return None  # cache outage or unreadable file: evaluate normally
+    if version is None:
+        return None
+    digest = hashlib.sha256()
+    for part in (wrapped_code, language, json.dumps(suite, sort_keys=True)):
+        digest.update(part.encode("utf-8", "surrogatepass"))
+        digest.update(b"\0")
+    return PREFIX + digest.hexdigest()
+
+
+def get(memo_key):
+    """The stored evaluation for ``memo_key``, counting a hit or a miss."""
+    if not memo_key:
+        return None
+    try:
+        entry = cache.get(memo_key)
+    except Exception:
+        entry = None
+    metrics.incr("evaluation_memo.hit" if entry else "evaluation_memo.miss")
+    return entry
+
+
+def rows(entry, sub, tests):
+    """Unsaved result rows for ``sub`` copied from ``entry``; ``None`` if they
+    don't line up with ``tests``."""
+    cases = entry.get("cases") or []
+    if len(cases) != len(tests):
+        return None
+    return [result_row(sub, i, test, **fields) for i, (test, fields) in enumerate(zip(tests, cases))]
+
+
+def store(memo_key, sub, result_rows) -> None:
+    """Remember ``sub``'s evaluation if it completed with repeatable verdicts."""
+    if not memo_key or sub.status != Submission.Status.DONE:
+        return
+    if any(row.status in TRANSIENT_STATUSES for row in result_rows):
+        logger.debug("evaluation_memo.transient", extra={"submission_id": str(sub.id)})
+        return
+    entry = {
+        "submission_id": str(sub.id),
+        "score": sub.score,
+        "max_score": sub.max_score,
+        "cases": [
+            {field: getattr(row, field) for field in FIELDS}
+            for row in sorted(result_rows, key=lambda row: row.index)
+        ],
+    }
+    if len(json.dumps(entry, default=str)) > _max_bytes():
+        logger.debug("evaluation_memo.too_large", extra={"submission_id": str(sub.id)})
+        return
+    try:
+        cache.set(memo_key, entry, _ttl())
+        # Best effort under concurrent writers: a key lost from the index
+        # still expires with its TTL
+        index = [k for k in cache.get(INDEX_KEY) or [] if k != memo_key] + [memo_key]
+        overflow = len(index) - _max_entries()
+        if overflow > 0:
+            cache.delete_many(index[:overflow])
+            index = index[overflow:]
+        cache.set(INDEX_KEY, index, _ttl())
+    except Exception:
+        logger.debug("evaluation_memo.store_failed", extra={"submission_id": str(sub.id)})
+
+
+def stats() -> dict:
+    hits = metrics.get("evaluation_memo.hit")
+    misses = metrics.get("evaluation_memo.miss")
+    total = hits + misses
+    return {
+        "enabled": enabled(),
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else 0.0,
+    }
+
+
+@receiver(post_save, sender=TestCase, dispatch_uid="evaluation_memo_testcase_saved")
+@receiver(post_delete, sender=TestCase, dispatch_uid="evaluation_memo_testcase_deleted")
+def _testcase_changed(sender, instance, **kwargs):
+    invalidate(instance.problem_id)
+
+
+@receiver(post_save, sender=Problem, dispatch_uid="evaluation_memo_problem_saved")
+def _problem_changed(sender, instance, **kwargs):
+    # The checker or evaluation policy may have changed
+    invalidate(instance.id)
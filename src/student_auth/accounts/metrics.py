@@ -0,0 +1,69 @@
+"""Best-effort counters shared by web and worker processes.
+
+Values live in the Django cache (Redis when ``DJANGO_CACHE_URL`` is set) under
+``metrics:<name>`` so ``health_check`` can report them across processes. A
+cache outage never breaks the caller; metrics are simply lost.
+"""
+
+import logging
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "metrics:"
+TTL = 7 * 24 * 60 * 60
+
+
+def _incr(key: str, amount: int) -> None:
+    try:
+        cache.add(key, 0, TTL)
+        cache.incr(key, amount)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, amount, TTL)
+
+
+def incr(name: str, amount: int = 1) -> None:
+    """Increment counter ``name``."""
+    try:
+        _incr(PREFIX + name, amount)
+    except Exception:
+        logger.debug("metrics.incr_failed", extra={"metric": name})
+
+
+def observe(name: str, value_ms: float) -> None:
+    """Record one latency sample (milliseconds) for ``name``."""
+    try:
+        _incr(f"{PREFIX}{name}:count", 1)
+        # cache.incr only handles integers, so sums are kept in microseconds
+        _incr(f"{PREFIX}{name}:sum_us", int(value_ms * 1000))
+        max_key = f"{PREFIX}{name}:max_us"
+        if int(value_ms * 1000) > (cache.get(max_key) or 0):
+            cache.set(max_key, int(value_ms * 1000), TTL)
+    except Exception:
+        logger.debug("metrics.observe_failed", extra={"metric": name})
+
+
+def get(name: str) -> int:
+    try:
+        return int(cache.get(PREFIX + name) or 0)
+    except Exception:
+        return 0
+
+
+def summary(name: str) -> dict:
+    """``{"count", "avg_ms", "max_ms"}`` for a metric fed through ``observe``."""
+    try:
+        values = cache.get_many(
+            [f"{PREFIX}{name}:count", f"{PREFIX}{name}:sum_us", f"{PREFIX}{name}:max_us"]
+        )
+    except Exception:
+        values = {}
+    count = int(values.get(f"{PREFIX}{name}:count") or 0)
+    total_us = int(values.get(f"{PREFIX}{name}:sum_us") or 0)
+    return {
+        "count": count,
+        "avg_ms": round(total_us / count / 1000, 3) if count else 0.0,
+        "max_ms": round(int(values.get(f"{PREFIX}{name}:max_us") or 0) / 1000, 3),
+    }
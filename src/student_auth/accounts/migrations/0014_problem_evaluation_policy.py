@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-17 02:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0013_practicequestion_solution_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problem',
+            name='evaluation_policy',
+            field=models.CharField(choices=[('full', 'Run every test case'), ('stop_on_first_failure', 'Stop at the first failing case')], default='full', max_length=30),
+        ),
+    ]
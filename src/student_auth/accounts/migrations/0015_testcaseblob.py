@@ -0,0 +1,76 @@
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH = 1000
+
+
+def _digest(stdin, expected_output):
+    # Must match TestCaseBlob.digest_for
+    payload = json.dumps([stdin or "", expected_output or ""])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def backfill_blobs(apps, schema_editor):
+    Result = apps.get_model("accounts", "SubmissionTestCaseResult")
+    Blob = apps.get_model("accounts", "TestCaseBlob")
+
+    def flush(blobs, rows):
+        Blob.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+        Result.objects.bulk_update(rows, ["case"], batch_size=BATCH)
+        blobs.clear()
+        rows.clear()
+
+    blobs, rows = {}, []
+    queryset = Result.objects.filter(case__isnull=True).values_list(
+        "id", "stdin", "expected_output"
+    )
+    for pk, stdin, expected_output in queryset.iterator(chunk_size=BATCH):
+        digest = _digest(stdin, expected_output)
+        if digest not in blobs:
+            blobs[digest] = Blob(
+                digest=digest, stdin=stdin or "", expected_output=expected_output or ""
+            )
+        rows.append(Result(id=pk, case_id=digest))
+        if len(rows) >= BATCH:
+            flush(blobs, rows)
+    flush(blobs, rows)
+
+
+def restore_text(apps, schema_editor):
+    Result = apps.get_model("accounts", "SubmissionTestCaseResult")
+    rows = []
+    for row in Result.objects.select_related("case").exclude(case=None).iterator(chunk_size=BATCH):
+        row.stdin = row.case.stdin
+        row.expected_output = row.case.expected_output
+        rows.append(row)
+        if len(rows) >= BATCH:
+            Result.objects.bulk_update(rows, ["stdin", "expected_output"])
+            rows = []
+    Result.objects.bulk_update(rows, ["stdin", "expected_output"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0014_problem_evaluation_policy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TestCaseBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('stdin', models.TextField(blank=True, default='')),
+                ('expected_output', models.TextField(blank=True, default='')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='submissiontestcaseresult',
+            name='case',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='accounts.testcaseblob'),
+        ),
+        migrations.RunPython(backfill_blobs, restore_text),
+    ]
@@ -0,0 +1,22 @@
+# Separate from 0015 so Postgres does not alter the table in the transaction
+# that backfilled it.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0015_testcaseblob'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='submissiontestcaseresult',
+            name='expected_output',
+        ),
+        migrations.RemoveField(
+            model_name='submissiontestcaseresult',
+            name='stdin',
+        ),
+    ]
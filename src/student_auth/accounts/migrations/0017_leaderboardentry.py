@@ -0,0 +1,59 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_entries(apps, schema_editor):
+    # Same aggregation as accounts.standings.rebuild, on historical models
+    Contest = apps.get_model("accounts", "Contest")
+    UserSolution = apps.get_model("accounts", "UserSolution")
+    LeaderboardEntry = apps.get_model("accounts", "LeaderboardEntry")
+
+    for contest in Contest.objects.all():
+        stats = {}
+        solutions = UserSolution.objects.filter(
+            problem__contest=contest, is_solved=True, solved_at__isnull=False
+        ).values_list("student_id", "solved_at", "best_time_ms")
+        for student_id, solved_at, best_time_ms in solutions:
+            row = stats.setdefault(
+                student_id,
+                {"solved": 0, "total_time_s": 0.0, "total_best_time_ms": 0.0, "first_solve_at": None},
+            )
+            row["solved"] += 1
+            row["total_time_s"] += max(0.0, (solved_at - contest.start_at).total_seconds())
+            row["total_best_time_ms"] += float(best_time_ms or 0.0)
+            if row["first_solve_at"] is None or solved_at < row["first_solve_at"]:
+                row["first_solve_at"] = solved_at
+        LeaderboardEntry.objects.bulk_create(
+            [LeaderboardEntry(contest=contest, student_id=sid, **row) for sid, row in stats.items()],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0016_compact_submissiontestcaseresult'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('solved', models.PositiveIntegerField(default=0)),
+                ('total_best_time_ms', models.FloatField(default=0)),
+                ('total_time_s', models.FloatField(default=0)),
+                ('first_solve_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('contest', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='accounts.contest')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='accounts.student')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['contest', '-solved', 'total_best_time_ms', 'total_time_s', 'student'], name='leaderboard_rank_idx')],
+                'constraints': [models.UniqueConstraint(fields=('contest', 'student'), name='uniq_leaderboard_contest_student')],
+            },
+        ),
+        migrations.RunPython(backfill_entries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0017_leaderboardentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='problem',
+            name='checker',
+            field=models.CharField(choices=[('exact', 'Exact (ignoring surrounding whitespace)'), ('lines', 'Line by line (ignoring trailing whitespace)'), ('tokens', 'Whitespace-separated tokens'), ('float', 'Tokens, numbers within tolerance'), ('unordered', 'Tokens in any order'), ('special', 'Special judge')], default='exact', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='problem',
+            name='checker_tolerance',
+            field=models.FloatField(default=1e-06, help_text='Absolute or relative tolerance for the float checker'),
+        ),
+        migrations.AddField(
+            model_name='problem',
+            name='special_judge',
+            field=models.CharField(blank=True, default='', help_text='Dotted path of a callable (stdin, expected, output) -> bool', max_length=200),
+        ),
+    ]
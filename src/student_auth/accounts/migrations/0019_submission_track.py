@@ -0,0 +1,70 @@
+# Generated by Django 5.2.5 on 2026-10-17 03:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_tracks(apps, schema_editor):
+    # Same rule as accounts.models.track_for_name, on historical models.
+    # The Junior/Senior mirror rows only duplicate Submission rows, so the
+    # tables can go once every submission carries its contest and track.
+    Contest = apps.get_model("accounts", "Contest")
+    Problem = apps.get_model("accounts", "Problem")
+    Submission = apps.get_model("accounts", "Submission")
+
+    for contest in Contest.objects.all():
+        name = (contest.name or "").lower()
+        track = "junior" if "junior" in name else ("senior" if "senior" in name else "")
+        if track:
+            Contest.objects.filter(id=contest.id).update(track=track)
+
+    Submission.objects.update(
+        contest_id=Subquery(Problem.objects.filter(id=OuterRef("problem_id")).values("contest_id")[:1])
+    )
+    for contest_id, track in Contest.objects.exclude(track="").values_list("id", "track"):
+        Submission.objects.filter(contest_id=contest_id).update(track=track)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0018_problem_checker'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='contest',
+            name='track',
+            field=models.CharField(blank=True, choices=[('junior', 'Junior'), ('senior', 'Senior')], default='', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='contest',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='submissions', to='accounts.contest'),
+        ),
+        migrations.AddField(
+            model_name='submission',
+            name='track',
+            field=models.CharField(blank=True, choices=[('junior', 'Junior'), ('senior', 'Senior')], default='', max_length=10),
+        ),
+        migrations.RunPython(backfill_tracks, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['contest', 'student', 'created_at'], name='accounts_su_contest_030c7c_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['problem', 'status'], name='accounts_su_problem_4ee636_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='submission',
+            index=models.Index(fields=['track', 'created_at'], name='accounts_su_track_546e32_idx'),
+        ),
+        migrations.DeleteModel(
+            name='JuniorSubmission',
+        ),
+        migrations.DeleteModel(
+            name='SeniorSubmission',
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 from django.utils import timezone
 from django.contrib.auth import get_user_model
+import hashlib
+import json
 import os
 import uuid
 from django.db.models import JSONField
@@ -34,15 +36,43 @@ class Participant(models.Model):
 
 
 # ----------------- Contest Model -----------------
+def track_for_name(name) -> str:
+    """Track implied by a contest name ("SAGE Junior Contest" -> "junior")."""
+    lowered = (name or "").lower()
+    if "junior" in lowered:
+        return Contest.Track.JUNIOR
+    if "senior" in lowered:
+        return Contest.Track.SENIOR
+    return ""
+
+
 class Contest(models.Model):
+    class Track(models.TextChoices):
+        JUNIOR = "junior", "Junior"
+        SENIOR = "senior", "Senior"
+
     name = models.CharField(max_length=200)
     start_at = models.DateTimeField()
     duration_minutes = models.PositiveIntegerField(default=120)
     is_active = models.BooleanField(default=True)
+    # Copied onto every Submission; blank means "from the name" on save
+    track = models.CharField(max_length=10, choices=Track.choices, blank=True, default="")
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self.track:
+            self.track = track_for_name(self.name)
+        update_fields = kwargs.get("update_fields")
+        previous = None
+        if self.pk and (update_fields is None or "track" in update_fields):
+            previous = Contest.objects.filter(pk=self.pk).values_list("track", flat=True).first()
+        super().save(*args, **kwargs)
+        if previous is not None and previous != self.track:
+            # Submissions carry a copy of the track
+            self.submissions.update(track=self.track)
+
     @property
     def end_at(self):
         return self.start_at + timezone.timedelta(minutes=self.duration_minutes)
@@ -79,6 +109,10 @@ class ContestAttempt(models.Model):
 
 # ----------------- Problem Model -----------------
 class Problem(models.Model):
+    class EvaluationPolicy(models.TextChoices):
+        FULL = "full", "Run every test case"
+        STOP_ON_FIRST_FAILURE = "stop_on_first_failure", "Stop at the first failing case"
+
     contest = models.ForeignKey(
         Contest, on_delete=models.CASCADE, related_name="problems"
     )
@@ -92,6 +126,35 @@ class Problem(models.Model):
         default="Easy",
     )
     constraints = models.TextField(blank=True, null=True)
+    # stop_on_first_failure runs visible cases first and skips the rest of the
+    # suite once a case fails (no partial credit beyond that point).
+    evaluation_policy = models.CharField(
+        max_length=30,
+        choices=EvaluationPolicy.choices,
+        default=EvaluationPolicy.FULL,
+    )
+    # How outputs are compared with expected ones (see accounts.checkers)
+    checker = models.CharField(
+        max_length=20,
+        choices=[
+            ("exact", "Exact (ignoring surrounding whitespace)"),
+            ("lines", "Line by line (ignoring trailing whitespace)"),
+            ("tokens", "Whitespace-separated tokens"),
+            ("float", "Tokens, numbers within tolerance"),
+            ("unordered", "Tokens in any order"),
+            ("special", "Special judge"),
+        ],
+        default="exact",
+    )
+    checker_tolerance = models.FloatField(
+        default=1e-6, help_text="Absolute or relative tolerance for the float checker"
+    )
+    special_judge = models.CharField(
+        max_length=200,
+        blank=True,
+        default="",
+        help_text="Dotted path of a callable (stdin, expected, output) -> bool",
+    )
 
     # Function signature fields for stub generation
     function_name = models.CharField(
@@ -191,6 +254,41 @@ class UserSolution(models.Model):
         return f"{self.student.name} - {self.problem.title} ({status})"
 
 
+class LeaderboardEntry(models.Model):
+    """Materialized contest standing of one student, kept in step with their
+    ``UserSolution`` rows by ``accounts.standings``."""
+
+    contest = models.ForeignKey(
+        Contest, on_delete=models.CASCADE, related_name="leaderboard_entries"
+    )
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="leaderboard_entries"
+    )
+    solved = models.PositiveIntegerField(default=0)
+    # Sum of fastest AC times across solved problems (ms)
+    total_best_time_ms = models.FloatField(default=0)
+    # Sum of (solved_at - contest start) across solved problems (s)
+    total_time_s = models.FloatField(default=0)
+    first_solve_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["contest", "student"], name="uniq_leaderboard_contest_student"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["contest", "-solved", "total_best_time_ms", "total_time_s", "student"],
+                name="leaderboard_rank_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} @ {self.contest_id}: {self.solved} solved"
+
+
 # ----------------- Async Submissions -----------------
 class Submission(models.Model):
     class Status(models.TextChoices):
@@ -221,51 +319,32 @@ class Submission(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     judge0_tokens = JSONField(default=list, blank=True)
     judge0_raw = JSONField(default=dict, blank=True)
-
-    def __str__(self):
-        return f"Submission {self.id} - {self.status} ({self.score}/{self.max_score})"
-
-
-class JuniorSubmission(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    orig_submission = models.UUIDField(null=False, blank=False)
-    student = models.ForeignKey(
-        Student, on_delete=models.CASCADE, related_name="junior_submissions", null=True, blank=True
+    # Denormalized from problem.contest when the submission is created, so
+    # per-contest and per-track queries need no join
+    contest = models.ForeignKey(
+        Contest,
+        on_delete=models.SET_NULL,
+        related_name="submissions",
+        null=True,
+        blank=True,
     )
-    problem = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name="junior_submissions")
-    code = models.TextField()
-    language = models.CharField(max_length=20, default="python")
-    status = models.CharField(max_length=10, choices=Submission.Status.choices, default=Submission.Status.QUEUED)
-    score = models.FloatField(default=0)
-    max_score = models.FloatField(default=0)
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    judge0_tokens = JSONField(default=list, blank=True)
-    judge0_raw = JSONField(default=dict, blank=True)
-
-    def __str__(self):
-        return f"Junior {self.orig_submission} - {self.status} ({self.score}/{self.max_score})"
-
+    track = models.CharField(max_length=10, choices=Contest.Track.choices, blank=True, default="")
 
-class SeniorSubmission(models.Model):
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    orig_submission = models.UUIDField(null=False, blank=False)
-    student = models.ForeignKey(
-        Student, on_delete=models.CASCADE, related_name="senior_submissions", null=True, blank=True
-    )
-    problem = models.ForeignKey(Problem, on_delete=models.CASCADE, related_name="senior_submissions")
-    code = models.TextField()
-    language = models.CharField(max_length=20, default="python")
-    status = models.CharField(max_length=10, choices=Submission.Status.choices, default=Submission.Status.QUEUED)
-    score = models.FloatField(default=0)
-    max_score = models.FloatField(default=0)
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    judge0_tokens = JSONField(default=list, blank=True)
-    judge0_raw = JSONField(default=dict, blank=True)
+    class Meta:
+        indexes = [
+            models.Index(fields=["contest", "student", "created_at"]),
+            models.Index(fields=["problem", "status"]),
+            models.Index(fields=["track", "created_at"]),
+        ]
 
     def __str__(self):
-        return f"Senior {self.orig_submission} - {self.status} ({self.score}/{self.max_score})"
+        return f"Submission {self.id} - {self.status} ({self.score}/{self.max_score})"
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.contest_id is None and self.problem_id:
+            self.contest = self.problem.contest
+            self.track = self.contest.track if self.contest else ""
+        super().save(*args, **kwargs)
 
 
 # ----------------- Practice / MCQ Models -----------------
@@ -338,6 +417,32 @@ class PracticeOption(models.Model):
             self.question.options.exclude(id=self.id).update(is_correct=False)
 
 
+class TestCaseBlob(models.Model):
+    """One test case's input and expected output, stored once however many
+    result rows refer to it. The primary key is a hash of the content."""
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    stdin = models.TextField(blank=True, default="")
+    expected_output = models.TextField(blank=True, default="")
+
+    @staticmethod
+    def digest_for(stdin, expected_output) -> str:
+        payload = json.dumps([stdin or "", expected_output or ""])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def for_case(cls, stdin, expected_output):
+        """Unsaved blob for a case; ``results.save_results`` writes it if new."""
+        return cls(
+            digest=cls.digest_for(stdin, expected_output),
+            stdin=stdin or "",
+            expected_output=expected_output or "",
+        )
+
+    def __str__(self):
+        return self.digest[:12]
+
+
 class SubmissionTestCaseResult(models.Model):
     submission = models.ForeignKey(
         Submission, on_delete=models.CASCADE, related_name="results"
@@ -345,8 +450,13 @@ class SubmissionTestCaseResult(models.Model):
     index = models.PositiveIntegerField()
     group = models.CharField(max_length=50, default="default")
     weight = models.FloatField(default=1.0)
-    stdin = models.TextField(blank=True, null=True)
-    expected_output = models.TextField(blank=True, null=True)
+    case = models.ForeignKey(
+        TestCaseBlob,
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
     output = models.TextField(blank=True, null=True)
     passed = models.BooleanField(default=False)
     status = models.CharField(max_length=50, default="Pending")
@@ -363,3 +473,12 @@ class SubmissionTestCaseResult(models.Model):
 
     def __str__(self):
         return f"Result {self.submission_id}[{self.index}] - {'OK' if self.passed else 'WA'}"
+
+    # Read through to the shared blob; use select_related("case") when listing.
+    @property
+    def stdin(self):
+        return self.case.stdin if self.case_id else None
+
+    @property
+    def expected_output(self):
+        return self.case.expected_output if self.case_id else None
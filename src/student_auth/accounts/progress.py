@@ -0,0 +1,71 @@
+"""Live evaluation progress, kept in the cache instead of the database.
+
+Result rows are written once, when an evaluation finishes. Until then the
+worker records each finished case here, so ``get_submission_status`` can
+report ``progress`` (cases completed, running score, first failing case)
+while the submission is RUNNING, at the cost of a cache write per case
+rather than a database write.
+
+Updates for one submission come from a single writer: the polling worker, or
+callbacks serialized by the Submission row lock. The entry expires on its
+own after ``SUBMISSION_PROGRESS_TTL_S``.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "submission:progress:"
+
+
+def _key(submission_id) -> str:
+    return f"{CACHE_PREFIX}{submission_id}"
+
+
+def _ttl() -> int:
+    return int(getattr(settings, "SUBMISSION_PROGRESS_TTL_S", 600))
+
+
+def start(submission_id, tests) -> None:
+    """Reset progress for an evaluation of ``tests`` (case dicts)."""
+    _set(
+        submission_id,
+        {
+            "completed": 0,
+            "total": len(tests),
+            "score": 0.0,
+            "max_score": sum(float(test.get("weight", 1.0)) for test in tests),
+            "first_failed": None,
+        },
+    )
+
+
+def record(submission_id, index, weight, passed) -> None:
+    """Count case ``index`` as finished."""
+    data = get(submission_id)
+    if data is None:
+        return
+    data["completed"] += 1
+    if passed:
+        data["score"] += float(weight)
+    elif data["first_failed"] is None or index < data["first_failed"]:
+        data["first_failed"] = index
+    _set(submission_id, data)
+
+
+def get(submission_id):
+    """Progress dict, or ``None`` when nothing is being tracked."""
+    try:
+        return cache.get(_key(submission_id))
+    except Exception:
+        return None
+
+
+def _set(submission_id, data) -> None:
+    try:
+        cache.set(_key(submission_id), data, _ttl())
+    except Exception:
+        logger.debug("submission_progress.set_failed", extra={"submission_id": str(submission_id)})
@@ -0,0 +1,49 @@
+"""Celery queues and routing for evaluation work.
+
+Evaluations are split by what they block on, so a burst of one kind cannot
+hold up the others (no head-of-line blocking on a shared queue):
+
+- ``eval.python``   interpreted languages; short Judge0 round trips.
+- ``eval.compiled`` C, C++ and Java; every case pays a compile, so these run
+  much longer and get their own workers.
+- ``eval.fallback`` submissions enqueued while the Judge0 circuit breaker is
+  open; they will most likely run on the CPU-bound local executor.
+- ``maintenance``   beat and housekeeping tasks (the default queue).
+
+Within a queue, "run" requests (the student waiting on the sample cases)
+are sent with ``EVAL_PRIORITY_INTERACTIVE`` and jump ahead of full
+submissions at ``CELERY_TASK_DEFAULT_PRIORITY``. With the Redis broker a
+lower number is served first.
+
+``infra/compose/prod`` runs one worker service per queue.
+"""
+
+from django.conf import settings
+
+from . import judge0_health
+
+EVAL_PYTHON = "eval.python"
+EVAL_COMPILED = "eval.compiled"
+EVAL_FALLBACK = "eval.fallback"
+MAINTENANCE = "maintenance"
+
+# Languages Judge0 compiles per submission
+COMPILED_LANGUAGES = {"c", "cpp", "java"}
+
+
+def evaluation_queue(language: str) -> str:
+    ok, _ = judge0_health.is_available()
+    if not ok:
+        return EVAL_FALLBACK
+    return EVAL_COMPILED if language in COMPILED_LANGUAGES else EVAL_PYTHON
+
+
+def evaluation_priority(interactive: bool) -> int:
+    if interactive:
+        return int(getattr(settings, "EVAL_PRIORITY_INTERACTIVE", 0))
+    return int(getattr(settings, "CELERY_TASK_DEFAULT_PRIORITY", 5))
+
+
+def evaluation_options(language: str, interactive: bool = False) -> dict:
+    """``apply_async`` options for evaluating a submission in ``language``."""
+    return {"queue": evaluation_queue(language), "priority": evaluation_priority(interactive)}
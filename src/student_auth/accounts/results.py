@@ -0,0 +1,94 @@
+"""Persistence of per-case evaluation results.
+
+An evaluation writes all of its ``SubmissionTestCaseResult`` rows with a single
+upsert and updates the ``Submission`` in the same transaction. That is a
+handful of statements per submission instead of a SELECT plus an INSERT or
+UPDATE per case, and on SQLite it holds the write lock once and briefly
+rather than re-taking it for every case.
+
+Case input and expected output are not copied into each row: rows point at a
+content-addressed ``TestCaseBlob``, written once per distinct case.
+"""
+
+from django.db import transaction
+
+from .models import SubmissionTestCaseResult, TestCaseBlob
+
+# Everything but the (submission, index) key; an upsert overwrites all of it,
+# so a re-evaluation never keeps fields from an earlier run.
+UPDATE_FIELDS = [
+    "group",
+    "weight",
+    "case",
+    "output",
+    "passed",
+    "status",
+    "time_ms",
+    "memory_kb",
+    "judge0_raw",
+]
+
+
+def result_row(sub, index, test, **fields) -> SubmissionTestCaseResult:
+    """Unsaved row for case ``index``; ``test`` carries the case definition."""
+    return SubmissionTestCaseResult(
+        submission=sub,
+        index=index,
+        group=test.get("group", "default"),
+        weight=float(test.get("weight", 1.0)),
+        case=TestCaseBlob.for_case(test.get("stdin"), test.get("expected_output")),
+        **fields,
+    )
+
+
+def save_results(sub, rows, update_fields) -> None:
+    """Upsert ``rows`` (indexes ``0..len(rows)-1``) and save ``sub``, atomically.
+
+    Rows left over from an earlier run with more cases are removed.
+    """
+    with transaction.atomic():
+        # Writing first means SQLite takes the write lock at the start of the
+        # transaction instead of upgrading a read lock half-way through.
+        sub.results.filter(index__gte=len(rows)).delete()
+        if rows:
+            blobs = {row.case_id: row.case for row in rows if row.case_id}
+            TestCaseBlob.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+            SubmissionTestCaseResult.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=["submission", "index"],
+                update_fields=UPDATE_FIELDS,
+            )
+        if update_fields:
+            sub.save(update_fields=update_fields)
+
+
+# One character per case for compact status responses, in index order:
+# A passed, W wrong answer, T time limit, M memory limit, R runtime error,
+# C compilation error, P pending, S skipped, E anything else (internal error,
+# no result).
+_CODE_PREFIXES = (
+    ("Time Limit", "T"),
+    ("Memory", "M"),
+    ("Runtime", "R"),
+    ("Compilation", "C"),
+    ("Pending", "P"),
+    ("Skipped", "S"),
+    ("Accepted", "W"),  # ran fine, output differs
+    ("Wrong", "W"),
+)
+
+
+def case_code(status, passed) -> str:
+    if passed:
+        return "A"
+    status = status or ""
+    for prefix, code in _CODE_PREFIXES:
+        if status.startswith(prefix):
+            return code
+    return "E"
+
+
+def pack_case_codes(rows) -> str:
+    """``case_code`` of each ``(status, passed)`` pair, joined into one string."""
+    return "".join(case_code(status, passed) for status, passed in rows)
@@ -0,0 +1,388 @@
+"""Contest leaderboard standings.
+
+Standings are materialized in ``LeaderboardEntry``: one row per student and
+contest, refreshed whenever one of the student's ``UserSolution`` rows changes
+a ranking field (``STANDING_FIELDS``; accepted solves go through
+``_post_evaluation_update``). Counting an attempt does not refresh anything.
+A refresh only touches that student's solutions, and reads are an indexed
+``ORDER BY ... LIMIT`` over the entries, so neither grows with the number of
+solutions in the contest.
+
+Ranking key: problems solved (desc), total best time (asc), total solve time
+(asc); students with equal keys share a rank. Standings themselves are
+computed by the database (``aggregate``), never by looping over solutions.
+
+``iter_ranked`` walks a whole board from a server-side cursor (the CSV
+export). ``overall`` is the cross-contest board (solved count, then first
+solve).
+
+Every actual change to a board bumps its version counter in the shared cache
+(``versions``). The leaderboard API uses those counters for its ETags and
+response cache keys, so polling clients cost no queries until something
+actually changes.
+"""
+
+import logging
+import time
+from functools import partial
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DateTimeField,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Min,
+    Q,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from .models import Contest, LeaderboardEntry, Student, UserSolution
+
+logger = logging.getLogger(__name__)
+
+RANK_ORDER = ("-solved", "total_best_time_ms", "total_time_s", "student_id")
+# Students per per-problem lookup while streaming (keeps IN lists well under
+# SQLite's bound-parameter limit)
+PER_PROBLEM_BATCH = 500
+
+VERSION_PREFIX = "standings:version:"
+# Version scopes besides contest ids: the cross-contest board, and student
+# profiles (names and emails appear on every board)
+OVERALL = "overall"
+STUDENTS = "students"
+
+# The UserSolution fields standings are computed from
+STANDING_FIELDS = ("is_solved", "solved_at", "best_time_ms")
+
+
+def aggregate(contest):
+    """Standing fields of every student in ``contest``, computed by the
+    database in one ``GROUP BY student`` over solved ``UserSolution`` rows."""
+    since_start = ExpressionWrapper(
+        F("solved_at") - Value(contest.start_at, output_field=DateTimeField()),
+        output_field=DurationField(),
+    )
+    return (
+        UserSolution.objects.filter(
+            problem__contest=contest, is_solved=True, solved_at__isnull=False
+        )
+        .values("student_id")
+        .annotate(
+            solved=Count("id"),
+            total_best_time_ms=Coalesce(Sum("best_time_ms"), Value(0.0)),
+            # Solves stamped before the start count as zero, not negative
+            total_time=Sum(since_start, filter=Q(solved_at__gte=contest.start_at)),
+            first_solve_at=Min("solved_at"),
+        )
+        .order_by()
+    )
+
+
+def _entry_fields(row) -> dict:
+    return {
+        "solved": row["solved"],
+        "total_best_time_ms": float(row["total_best_time_ms"]),
+        "total_time_s": row["total_time"].total_seconds() if row["total_time"] else 0.0,
+        "first_solve_at": row["first_solve_at"],
+    }
+
+
+def refresh_entry(contest_id, student_id) -> None:
+    """Recompute one student's standing in one contest from their solutions;
+    the board's version is bumped only if the standing changed."""
+    with transaction.atomic():
+        # Serializes concurrent refreshes of the same standing
+        entry = (
+            LeaderboardEntry.objects.select_for_update()
+            .filter(contest_id=contest_id, student_id=student_id)
+            .first()
+        )
+        contest = Contest.objects.filter(id=contest_id).only("start_at").first()
+        rows = list(aggregate(contest).filter(student_id=student_id)) if contest else []
+        row = rows[0] if rows else None
+        if row is None:
+            if entry:
+                entry.delete()
+                changed(contest_id, OVERALL)
+            return
+        fields = _entry_fields(row)
+        if entry:
+            if all(getattr(entry, field) == value for field, value in fields.items()):
+                return
+            for field, value in fields.items():
+                setattr(entry, field, value)
+            entry.save()
+        else:
+            LeaderboardEntry.objects.update_or_create(
+                contest_id=contest_id, student_id=student_id, defaults=fields
+            )
+        changed(contest_id, OVERALL)
+
+
+def rebuild(contest) -> int:
+    """Recompute every standing of ``contest`` (e.g. after its start moved)."""
+    entries = [
+        LeaderboardEntry(contest=contest, student_id=row["student_id"], **_entry_fields(row))
+        for row in aggregate(contest)
+    ]
+    with transaction.atomic():
+        LeaderboardEntry.objects.filter(contest=contest).delete()
+        LeaderboardEntry.objects.bulk_create(entries, batch_size=1000)
+        changed(contest.id, OVERALL)
+    return len(entries)
+
+
+def _fresh_version() -> int:
+    # Seeded from the clock so a counter lost to eviction never restarts at a
+    # value an old ETag could still carry
+    return time.time_ns() // 1000
+
+
+def versions(*scopes) -> tuple:
+    """Current version of each scope (a contest id, ``OVERALL`` or ``STUDENTS``).
+
+    Only reads the cache. Returns ``None`` when the cache is unavailable, in
+    which case nothing should be cached or compared.
+    """
+    keys = [f"{VERSION_PREFIX}{scope}" for scope in scopes]
+    try:
+        found = cache.get_many(keys)
+        missing = [key for key in keys if key not in found]
+        for key in missing:
+            cache.add(key, _fresh_version(), None)
+        if missing:
+            found.update(cache.get_many(missing))
+        return tuple(found[key] for key in keys)
+    except Exception:
+        logger.debug("leaderboard.version_unavailable", extra={"scopes": list(scopes)})
+        return None
+
+
+def bump(*scopes) -> None:
+    for scope in scopes:
+        key = f"{VERSION_PREFIX}{scope}"
+        try:
+            try:
+                cache.incr(key)
+            except ValueError:
+                # Not set (or evicted): any new value invalidates old ETags
+                cache.set(key, _fresh_version(), None)
+        except Exception:
+            logger.warning("leaderboard.version_bump_failed", extra={"scope": scope})
+
+
+def changed(*scopes) -> None:
+    """Bump ``scopes`` once the current transaction commits (immediately in
+    autocommit), so no reader can cache pre-commit data under the new version."""
+    transaction.on_commit(partial(bump, *scopes))
+
+
+def _assign_ranks(pairs, first_rank, first_position):
+    """Competition ranking ("1, 2, 2, 4") over ordered ``(row, key)`` pairs.
+
+    A single pass that yields each row as it is ranked, so it also works over
+    a streaming cursor.
+    """
+    rank = first_rank
+    prev_key = None
+    for position, (row, key) in enumerate(pairs, start=first_position):
+        if position > first_position and key != prev_key:
+            rank = position
+        prev_key = key
+        row["rank"] = rank
+        yield row
+
+
+def _rank_key(entry) -> tuple:
+    return (entry.solved, entry.total_best_time_ms, entry.total_time_s)
+
+
+def _better_than(entry) -> Q:
+    return (
+        Q(solved__gt=entry.solved)
+        | Q(solved=entry.solved, total_best_time_ms__lt=entry.total_best_time_ms)
+        | Q(
+            solved=entry.solved,
+            total_best_time_ms=entry.total_best_time_ms,
+            total_time_s__lt=entry.total_time_s,
+        )
+    )
+
+
+def ranked(contest, offset: int = 0, limit: int = None) -> list:
+    """Ranked rows ``offset .. offset+limit`` of the contest leaderboard."""
+    entries = LeaderboardEntry.objects.filter(contest=contest).select_related("student").order_by(*RANK_ORDER)
+    page = list(entries[offset : offset + limit] if limit is not None else entries[offset:])
+    if not page:
+        return []
+
+    # A tie group can start on an earlier page: rank the first row by counting
+    # the entries strictly ahead of it.
+    first_rank = 1
+    if offset:
+        first_rank += LeaderboardEntry.objects.filter(contest=contest).filter(_better_than(page[0])).count()
+    return list(_assign_ranks(((_row(e), _rank_key(e)) for e in page), first_rank, offset + 1))
+
+
+def iter_ranked(contest, chunk_size: int = 2000, per_problem: bool = False):
+    """Yield every ranked row of the contest board from a server-side cursor.
+
+    With ``per_problem`` each row also gets ``problems``: ``{problem_id:
+    (solve_time_s, best_time_ms)}``, fetched for ``PER_PROBLEM_BATCH``
+    students at a time, so memory stays flat however large the contest.
+    """
+    entries = (
+        LeaderboardEntry.objects.filter(contest=contest)
+        .select_related("student")
+        .order_by(*RANK_ORDER)
+        .iterator(chunk_size=chunk_size)
+    )
+    rows = _assign_ranks(((_row(e), _rank_key(e)) for e in entries), 1, 1)
+    if not per_problem:
+        yield from rows
+        return
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= PER_PROBLEM_BATCH:
+            yield from _with_problems(contest, batch)
+            batch = []
+    if batch:
+        yield from _with_problems(contest, batch)
+
+
+def _with_problems(contest, rows) -> list:
+    by_student = {row["student_id"]: {} for row in rows}
+    solutions = UserSolution.objects.filter(
+        problem__contest=contest,
+        is_solved=True,
+        solved_at__isnull=False,
+        student_id__in=list(by_student),
+    ).values_list("student_id", "problem_id", "solved_at", "best_time_ms")
+    for student_id, problem_id, solved_at, best_time_ms in solutions:
+        solve_time_s = max(0.0, (solved_at - contest.start_at).total_seconds())
+        by_student[student_id][problem_id] = (round(solve_time_s, 3), best_time_ms)
+    for row in rows:
+        row["problems"] = by_student[row["student_id"]]
+    return rows
+
+
+def _row(entry) -> dict:
+    return {
+        "student_id": entry.student_id,
+        "name": entry.student.name,
+        "email": entry.student.email,
+        "solved": entry.solved,
+        "total_time_s": round(entry.total_time_s, 3),
+        "total_best_time_ms": round(entry.total_best_time_ms, 3),
+        "points": entry.solved,
+        "first_solve_at": entry.first_solve_at,
+    }
+
+
+def count(contest) -> int:
+    return LeaderboardEntry.objects.filter(contest=contest).count()
+
+
+def _overall_queryset():
+    solved = Q(solutions__is_solved=True)
+    return Student.objects.annotate(
+        solved_count=Count("solutions", filter=solved, distinct=True),
+        first_solve=Min("solutions__solved_at", filter=solved),
+    )
+
+
+def overall(offset: int = 0, limit: int = None) -> list:
+    """Ranked rows of the all-contest board; every student is listed."""
+    stats = (
+        _overall_queryset()
+        .order_by("-solved_count", "first_solve", "id")
+        .values("id", "name", "email", "solved_count", "first_solve")
+    )
+    page = list(stats[offset : offset + limit] if limit is not None else stats[offset:])
+    if not page:
+        return []
+
+    first = page[0]
+    first_rank = 1
+    if offset:
+        ahead = Q(solved_count__gt=first["solved_count"])
+        if first["first_solve"] is not None:
+            ahead |= Q(solved_count=first["solved_count"], first_solve__lt=first["first_solve"])
+        first_rank += _overall_queryset().filter(ahead).count()
+    pairs = (
+        (
+            {
+                "student_id": row["id"],
+                "name": row["name"],
+                "email": row["email"],
+                "solved": int(row["solved_count"] or 0),
+                "first_solve_at": row["first_solve"],
+                "points": int(row["solved_count"] or 0),
+            },
+            (row["solved_count"], row["first_solve"]),
+        )
+        for row in page
+    )
+    return list(_assign_ranks(pairs, first_rank, offset + 1))
+
+
+def _standing(solution):
+    # __dict__ so a deferred field is never fetched just to be remembered
+    return tuple(solution.__dict__.get(field) for field in STANDING_FIELDS)
+
+
+@receiver(post_init, sender=UserSolution, dispatch_uid="leaderboard_remember_standing")
+def _remember_standing(sender, instance, **kwargs):
+    # As loaded; a row not saved yet counts on no board
+    instance._saved_standing = _standing(instance) if instance.pk else (False, None, None)
+
+
+@receiver(post_save, sender=UserSolution, dispatch_uid="leaderboard_refresh_on_save")
+def _solution_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(STANDING_FIELDS):
+        return
+    standing = _standing(instance)
+    if standing == instance._saved_standing:
+        return  # e.g. run_code counting an attempt
+    instance._saved_standing = standing
+    _refresh_for_solution(instance)
+
+
+@receiver(post_delete, sender=UserSolution, dispatch_uid="leaderboard_refresh_on_delete")
+def _solution_deleted(sender, instance, **kwargs):
+    if instance.is_solved:
+        _refresh_for_solution(instance)
+
+
+def _refresh_for_solution(instance):
+    try:
+        contest_id = instance.problem.contest_id
+        refresh_entry(contest_id, instance.student_id)
+    except Exception:
+        # The leaderboard can be rebuilt; a failed refresh must not fail the save
+        logger.exception(
+            "leaderboard.refresh_failed",
+            extra={"student_id": instance.student_id, "problem_id": instance.problem_id},
+        )
+
+
+@receiver(post_save, sender=Student, dispatch_uid="leaderboard_version_on_student_save")
+@receiver(post_delete, sender=Student, dispatch_uid="leaderboard_version_on_student_delete")
+def _student_changed(sender, instance, **kwargs):
+    changed(STUDENTS)
+
+
+@receiver(post_save, sender=Contest, dispatch_uid="leaderboard_version_on_contest_save")
+@receiver(post_delete, sender=Contest, dispatch_uid="leaderboard_version_on_contest_delete")
+def _contest_changed(sender, instance, **kwargs):
+    # The contest name is part of the board response
+    changed(instance.id, OVERALL)
@@ -1,16 +1,27 @@
+import base64
 import logging
+from datetime import timedelta
 from celery import shared_task
 from django.conf import settings
+from django.core import signing
+from django.db import transaction
+from django.urls import reverse
 from django.utils import timezone
-from .models import Submission, SubmissionTestCaseResult, TestCase, UserSolution
+from .models import (
+    Problem,
+    Submission,
+    SubmissionTestCaseResult,
+    TestCase,
+    UserSolution,
+)
 from .wrapping import maybe_wrap_code
-import json
+from .judge0_client import get_client
+from .executor import LocalCodeExecutor
+from .results import result_row, save_results
+from . import checkers, events, judge0_health, memo, metrics, progress, testsuite
+from .queues import COMPILED_LANGUAGES, evaluation_options
 import requests
 import time
-import subprocess
-import tempfile
-import os
-import sys
 
 
 @shared_task
@@ -24,131 +35,455 @@ def add(x, y):
     return x + y
 
 
-def _judge0_headers():
-    token = getattr(settings, "JUDGE0_AUTH_TOKEN", "")
-    headers = {"Content-Type": "application/json"}
-    if token:
-        headers["X-Auth-Token"] = token
-    return headers
+def _check_judge0_connectivity():
+    """Return Judge0 availability from the shared circuit breaker.
 
+    This only reads cached state (see ``judge0_health``); it never probes Judge0.
+    """
+    return judge0_health.is_available()
 
-def _check_judge0_connectivity():
-    """Check if Judge0 service is accessible"""
-    try:
-        base_url = getattr(settings, "JUDGE0_URL", "http://localhost:2358").rstrip("/")
-        resp = requests.get(f"{base_url}/about", headers=_judge0_headers(), timeout=10)
-        resp.raise_for_status()
-        return True, None
-    except Exception as e:
-        return False, str(e)
+
+@shared_task
+def refresh_judge0_health():
+    """Beat task: actively probe Judge0 and refresh the shared breaker state."""
+    return judge0_health.probe()
 
 
 logger = logging.getLogger(__name__)
 
 
-class LocalCodeExecutor:
-    """Fallback local code executor for when Judge0 fails"""
+def _judge0_max_batch_size() -> int:
+    """Largest batch Judge0 accepts (its MAX_SUBMISSION_BATCH_SIZE, 20 by default)."""
+    try:
+        return max(1, int(getattr(settings, "JUDGE0_MAX_BATCH_SIZE", 20)))
+    except (TypeError, ValueError):
+        return 20
+
 
-    def __init__(self):
-        self.timeout = 5  # 5 second timeout
+def _create_judge0_submission(base_url, test_payload):
+    """Create a single Judge0 submission and return its token (or None)."""
+    create_resp = get_client(base_url).post(
+        "/submissions?base64_encoded=false&wait=false",
+        json=test_payload,
+    )
+    create_resp.raise_for_status()
+    return create_resp.json().get("token")
 
-    def execute_python_code(self, code, test_cases):
-        """Execute Python code locally with test cases"""
-        results = []
 
-        for i, test_case in enumerate(test_cases):
-            stdin_data = test_case.get("stdin", "")
-            expected_output = test_case.get("expected_output", "")
+def _create_judge0_batch(base_url, submissions_payload, submission_id=None):
+    """Create Judge0 submissions through the batch endpoint.
 
-            try:
-                # Create a temporary file for the code
-                with tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".py", delete=False
-                ) as f:
-                    f.write(code)
-                    temp_file = f.name
-
-                # Execute the code with stdin
-                process = subprocess.Popen(
-                    [sys.executable, temp_file],
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
+    Payloads are sent in chunks of ``JUDGE0_MAX_BATCH_SIZE``. The returned list is
+    aligned with ``submissions_payload``: ``tokens[i]`` is the token for test ``i``
+    or ``None`` if it could not be created. Items rejected by the batch endpoint
+    (or whole chunks whose request failed) are retried one request per case.
+    """
+    tokens = [None] * len(submissions_payload)
+    rejected = []
+    chunk_size = _judge0_max_batch_size()
+
+    for start in range(0, len(submissions_payload), chunk_size):
+        chunk = submissions_payload[start : start + chunk_size]
+        try:
+            resp = get_client(base_url).post(
+                "/submissions/batch?base64_encoded=false",
+                json={"submissions": chunk},
+            )
+            resp.raise_for_status()
+            items = resp.json()
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(
+                "judge0.create_batch.chunk_failed",
+                extra={
+                    "submission_id": submission_id,
+                    "chunk_start": start,
+                    "chunk_size": len(chunk),
+                    "error": str(e),
+                },
+            )
+            rejected.extend(range(start, start + len(chunk)))
+            continue
+
+        # Judge0 answers with one entry per submission, in request order: either
+        # {"token": ...} or a dict of validation errors for that item.
+        if not isinstance(items, list) or len(items) != len(chunk):
+            logger.warning(
+                "judge0.create_batch.unexpected_response",
+                extra={"submission_id": submission_id, "chunk_start": start},
+            )
+            rejected.extend(range(start, start + len(chunk)))
+            continue
+
+        for offset, item in enumerate(items):
+            token = item.get("token") if isinstance(item, dict) else None
+            if token:
+                tokens[start + offset] = token
+            else:
+                rejected.append(start + offset)
+                logger.warning(
+                    "judge0.create_batch.item_rejected",
+                    extra={
+                        "submission_id": submission_id,
+                        "test_index": start + offset,
+                        "response": item,
+                    },
                 )
 
+    for i in rejected:
+        test_payload = submissions_payload[i]
+        try:
+            token = _create_judge0_submission(base_url, test_payload)
+        except requests.RequestException as e:
+            error_response = None
+            if getattr(e, "response", None) is not None:
                 try:
-                    stdout, stderr = process.communicate(
-                        input=stdin_data, timeout=self.timeout
-                    )
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                    os.unlink(temp_file)
-                    results.append(
-                        {
-                            "index": i,
-                            "group": "visible",
-                            "weight": 1.0,
-                            "status": "Time Limit Exceeded",
-                            "passed": False,
-                            "time_ms": self.timeout * 1000,
-                            "memory_kb": 0,
-                            "output": "",
-                            "expected_output": expected_output,
-                            "stderr": "Time limit exceeded",
-                            "exit_code": -1,
-                        }
-                    )
-                    continue
+                    error_response = e.response.text
+                except Exception:
+                    error_response = "Could not parse response"
 
-                # Clean up
-                os.unlink(temp_file)
-
-                # Determine if the output matches
-                actual_output = stdout.strip()
-                expected_clean = expected_output.strip()
-                passed = actual_output == expected_clean
-
-                result = {
-                    "index": i,
-                    "group": "visible",
-                    "weight": 1.0,
-                    "status": "Accepted" if passed else "Wrong Answer",
-                    "passed": passed,
-                    "time_ms": 100,  # Placeholder
-                    "memory_kb": 1024,  # Placeholder
-                    "output": actual_output,
-                    "expected_output": expected_output,
-                    "stderr": stderr,
-                    "exit_code": process.returncode,
-                }
+            logger.error(
+                "judge0.create_individual.request_failed",
+                extra={
+                    "submission_id": submission_id,
+                    "test_index": i,
+                    "error": str(e),
+                    "status_code": getattr(getattr(e, "response", None), "status_code", None),
+                    "response_text": error_response,
+                    "payload": test_payload,
+                },
+            )
+            continue
 
-                if process.returncode != 0:
-                    result["status"] = "Runtime Error"
-                    result["passed"] = False
+        if token:
+            tokens[i] = token
+        else:
+            logger.error(
+                "judge0.create_individual.no_token",
+                extra={"submission_id": submission_id, "test_index": i},
+            )
 
-                results.append(result)
+    return tokens
+
+
+# Only what result processing needs; big fields like source_code/stdin are
+# never sent back.
+JUDGE0_POLL_FIELDS = "token,status,stdout,stderr,compile_output,time,memory"
 
-            except Exception as e:
-                if "temp_file" in locals():
-                    os.unlink(temp_file)
-                results.append(
-                    {
-                        "index": i,
-                        "group": "visible",
-                        "weight": 1.0,
-                        "status": "Internal Error",
-                        "passed": False,
-                        "time_ms": 0,
-                        "memory_kb": 0,
-                        "output": "",
-                        "expected_output": expected_output,
-                        "stderr": str(e),
-                        "exit_code": -1,
-                    }
-                )
 
-        return results
+def _poll_judge0_results(
+    base_url,
+    tokens,
+    submission_id=None,
+    expected_runtime_s=None,
+    timeout_s=None,
+    on_result=None,
+    stop_when=None,
+):
+    """Wait for Judge0 results with backoff, asking only for unfinished tokens.
+
+    ``tokens`` may contain ``None`` (cases that were never created); the
+    returned ``results`` list is aligned with it and holds ``None`` for cases
+    without a final result. The first wait is seeded with the problem's
+    expected runtime and grows by ``JUDGE0_POLL_BACKOFF`` while no new case
+    finishes, capped at ``JUDGE0_POLL_MAX_DELAY_S``. ``on_result(index, item)``
+    is called once per case as soon as it completes; polling ends early, leaving
+    the remaining cases ``None``, once ``stop_when(index, item)`` is true.
+
+    Returns ``(results, poll_metrics)``.
+    """
+    min_delay = float(getattr(settings, "JUDGE0_POLL_MIN_DELAY_S", 0.2))
+    max_delay = float(getattr(settings, "JUDGE0_POLL_MAX_DELAY_S", 3.0))
+    backoff = float(getattr(settings, "JUDGE0_POLL_BACKOFF", 1.5))
+    if timeout_s is None:
+        timeout_s = float(getattr(settings, "JUDGE0_POLL_TIMEOUT_S", 120))
+
+    results = [None] * len(tokens)
+    pending = {t: i for i, t in enumerate(tokens) if t}
+    chunk_size = _judge0_max_batch_size()
+    latencies = []
+    rounds = 0
+    stopped = False
+
+    delay = min(max(float(expected_runtime_s or 0), min_delay), max_delay)
+    start = time.monotonic()
+
+    while pending and not stopped:
+        if time.monotonic() - start > timeout_s:
+            logger.warning(
+                "judge0.poll.timeout",
+                extra={
+                    "submission_id": submission_id,
+                    "waited_s": round(time.monotonic() - start, 2),
+                    "completed_results": sum(1 for r in results if r is not None),
+                    "total_results": len(results),
+                },
+            )
+            break
+
+        time.sleep(delay)
+        rounds += 1
+        finished_this_round = 0
+        pending_tokens = list(pending)
+
+        for offset in range(0, len(pending_tokens), chunk_size):
+            if stopped:
+                break
+            chunk = pending_tokens[offset : offset + chunk_size]
+            t0 = time.perf_counter()
+            try:
+                poll = get_client(base_url).get(
+                    "/submissions/batch",
+                    params={
+                        "tokens": ",".join(chunk),
+                        "base64_encoded": "false",
+                        "fields": JUDGE0_POLL_FIELDS,
+                    },
+                )
+                poll.raise_for_status()
+                items = poll.json()
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(
+                    "judge0.poll.request_failed",
+                    extra={
+                        "submission_id": submission_id,
+                        "error": str(e),
+                        "elapsed_s": round(time.monotonic() - start, 2),
+                    },
+                )
+                continue
+            finally:
+                latency_ms = (time.perf_counter() - t0) * 1000
+                latencies.append(latency_ms)
+                metrics.observe("judge0.poll", latency_ms)
+
+            items = items.get("submissions", items) if isinstance(items, dict) else items
+            for pos, item in enumerate(items or []):
+                if not isinstance(item, dict):
+                    continue
+                token = item.get("token") or (chunk[pos] if pos < len(chunk) else None)
+                if token not in pending:
+                    continue
+                status_id = (item.get("status") or {}).get("id")
+                if status_id in (1, 2):  # In Queue / Processing
+                    continue
+                index = pending.pop(token)
+                results[index] = item
+                finished_this_round += 1
+                if on_result is not None:
+                    on_result(index, item)
+                if stop_when is not None and stop_when(index, item):
+                    stopped = True
+                    break
+
+        # Keep the cadence while cases are landing, back off while none are
+        if not finished_this_round:
+            delay = min(delay * backoff, max_delay)
+
+    poll_metrics = {
+        "rounds": rounds,
+        "requests": len(latencies),
+        "latency_ms_avg": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "latency_ms_max": round(max(latencies), 2) if latencies else 0.0,
+        "wait_s": round(time.monotonic() - start, 2),
+    }
+    logger.info(
+        "judge0.poll.done",
+        extra={"submission_id": submission_id, **poll_metrics, "pending": len(pending)},
+    )
+    return results, poll_metrics
+
+
+SKIPPED_STATUS = "Skipped"
+# Judge0 status ids
+JUDGE0_ACCEPTED = 3
+JUDGE0_WRONG_ANSWER = 4
+JUDGE0_COMPILATION_ERROR = 6
+
+
+def _evaluation_waves(tests, stop_early, compile_probe=False):
+    """Split test indexes into the batches to enqueue one after another.
+
+    Full evaluation sends everything at once. Short-circuit evaluation sends
+    the visible cases first (``tests`` is already ordered that way), then the
+    hidden ones one Judge0 batch at a time, so a failure leaves later waves
+    unsubmitted. With ``compile_probe`` the first case goes out alone, so a
+    compilation error is caught before the program is compiled N more times.
+    """
+    indexes = list(range(len(tests)))
+    waves = []
+    if compile_probe:
+        waves.append(indexes[:1])
+        indexes = indexes[1:]
+    if not stop_early:
+        return waves + [indexes] if indexes else waves
+    visible = [i for i in indexes if tests[i]["visible"]]
+    hidden = [i for i in indexes if not tests[i]["visible"]]
+    size = _judge0_max_batch_size()
+    if visible:
+        waves.append(visible)
+    waves += [hidden[o : o + size] for o in range(0, len(hidden), size)]
+    return waves
+
+
+def _wants_compile_probe(sub) -> bool:
+    """Whether the first case of a compiled submission should go out alone.
+
+    The probe costs a serial Judge0 round trip on every submission and only
+    saves anything when the code does not compile. ``JUDGE0_COMPILE_PROBE``:
+    "always", "never", or (default) "after_error", i.e. only when the
+    student's previous submission of the problem in this language failed to
+    compile.
+    """
+    mode = getattr(settings, "JUDGE0_COMPILE_PROBE", "after_error")
+    if mode == "always":
+        return True
+    if mode != "after_error" or not sub.student_id:
+        return False
+    previous = (
+        Submission.objects.filter(
+            student_id=sub.student_id,
+            problem_id=sub.problem_id,
+            language=sub.language,
+            created_at__lt=sub.created_at,
+        )
+        .order_by("-created_at")
+        .values("id")[:1]
+    )
+    return SubmissionTestCaseResult.objects.filter(
+        submission_id__in=previous, status="Compilation Error"
+    ).exists()
+
+
+def _enqueue_wave(base_url, submissions_payload, wave, tokens, submission_id):
+    created = _create_judge0_batch(
+        base_url, [submissions_payload[i] for i in wave], submission_id=submission_id
+    )
+    for i, token in zip(wave, created):
+        tokens[i] = token
+
+
+def _is_compile_error(item) -> bool:
+    return ((item or {}).get("status") or {}).get("id") == JUDGE0_COMPILATION_ERROR
+
+
+def _poll_in_waves(
+    base_url,
+    submissions_payload,
+    tests,
+    waves,
+    tokens,
+    submission_id,
+    expected_runtime_s,
+    stop_early=False,
+    on_result=None,
+    fields=None,
+):
+    """Enqueue and poll ``waves`` in order, stopping at the first failure.
+
+    A compilation error always ends evaluation and is recorded for every case.
+    With ``stop_early`` any failing case does too: Judge0 cannot cancel queued
+    work, so the unfinished cases of the current wave are abandoned and later
+    waves are never created. The first wave is already enqueued. ``fields``
+    (see ``_case_fields``) judges a finished case.
+
+    Returns ``(results, poll_metrics, skipped)``.
+    """
+    results = [None] * len(tests)
+    skipped = set()
+    totals = {"rounds": 0, "requests": 0, "wait_s": 0.0, "waves": 0}
+
+    if fields is None:
+        fields = _case_fields(tests, checkers.exact)
+
+    def failed(i, item):
+        return not fields(i, item)["passed"]
+
+    def should_stop(i, item):
+        return _is_compile_error(item) or (stop_early and failed(i, item))
+
+    for number, wave in enumerate(waves):
+        if number:
+            _enqueue_wave(base_url, submissions_payload, wave, tokens, submission_id)
+        wave_results, wave_metrics = _poll_judge0_results(
+            base_url,
+            [tokens[i] for i in wave],
+            submission_id=submission_id,
+            expected_runtime_s=expected_runtime_s,
+            stop_when=lambda pos, item: should_stop(wave[pos], item),
+            on_result=(lambda pos, item: on_result(wave[pos], item)) if on_result else None,
+        )
+        for i, item in zip(wave, wave_results):
+            results[i] = item
+        totals["waves"] += 1
+        for key in ("rounds", "requests", "wait_s"):
+            totals[key] += wave_metrics[key]
+
+        compile_error = next((item for item in wave_results if _is_compile_error(item)), None)
+        if compile_error is not None:
+            # The same source fails to compile for every case
+            results = [item if item is not None else compile_error for item in results]
+            totals["compile_error"] = True
+            break
+        if any(item is not None and should_stop(i, item) for i, item in zip(wave, wave_results)):
+            skipped |= {i for i in wave if tokens[i] and results[i] is None}
+            break
+        # A rejected or timed-out case fails the submission (ERROR) anyway
+        if any(item is None for item in wave_results):
+            break
+
+    if not totals.get("compile_error"):
+        skipped |= {i for wave in waves[totals["waves"] :] for i in wave}
+    totals["wait_s"] = round(totals["wait_s"], 2)
+    logger.info(
+        "judge0.waves.done",
+        extra={"submission_id": submission_id, **totals, "skipped": len(skipped)},
+    )
+    return results, totals, skipped
+
+
+def _case_fields(tests, check):
+    """``fields(index, item)``: ``_judge0_result_fields`` of a finished case,
+    computed once per case. Polling, progress and the final rows all need the
+    verdict, and the checker may be costly (large outputs) or a special judge
+    that should run only once."""
+    judged = {}
+
+    def fields(index, item):
+        if index not in judged:
+            judged[index] = _judge0_result_fields(tests[index], item, check)
+        return judged[index]
+
+    return fields
+
+
+def _judge0_result_fields(test, item, check=checkers.exact):
+    """Map one finished Judge0 submission onto ``SubmissionTestCaseResult`` fields.
+
+    ``test`` is the case (``stdin``/``expected_output``); ``item`` may be
+    ``None`` for a case that never produced a result. Only stdout is judged;
+    stderr or compiler output is shown in its place when stdout is empty.
+    Judge0 is not given the expected output, so for a program that ran to
+    completion the verdict is ``check``'s, as on the local path.
+    """
+    item = item or {}
+    status = item.get("status") or {}
+    status_desc = status.get("description", "Unknown")
+    stdout = item.get("stdout") or ""
+    out = (stdout or item.get("stderr") or item.get("compile_output") or "").strip()
+    time_ms = item.get("time") or 0
+    mem_kb = item.get("memory") or 0
+    passed = False
+    if status.get("id") in (JUDGE0_ACCEPTED, JUDGE0_WRONG_ANSWER):
+        passed = check(stdout, test.get("expected_output"), test.get("stdin") or "")
+        status_desc = "Accepted" if passed else "Wrong Answer"
+    return {
+        "output": out,
+        "passed": passed,
+        "status": status_desc,
+        "time_ms": float(time_ms) if time_ms else 0.0,
+        "memory_kb": int(mem_kb) if mem_kb else 0,
+        "judge0_raw": item,
+    }
 
 
 def _post_evaluation_update(sub: Submission) -> None:
@@ -159,38 +494,6 @@ def _post_evaluation_update(sub: Submission) -> None:
         # Only for logged-in students
         if not sub.student_id:
             return
-        # Update per-track shadow tables for easier evaluation exports
-        try:
-            cname = (sub.problem.contest.name or "").lower() if sub.problem and sub.problem.contest_id else ""
-        except Exception:
-            cname = ""
-        if "junior" in cname:
-            from .models import JuniorSubmission
-            try:
-                js = JuniorSubmission.objects.filter(orig_submission=sub.id).first()
-                if js:
-                    js.status = sub.status
-                    js.score = sub.score
-                    js.max_score = sub.max_score
-                    js.judge0_tokens = sub.judge0_tokens
-                    js.judge0_raw = sub.judge0_raw
-                    js.save(update_fields=["status", "score", "max_score", "judge0_tokens", "judge0_raw", "updated_at"])
-            except Exception:
-                logger.exception("mirror.junior.update_failed", extra={"submission_id": str(sub.id)})
-        elif "senior" in cname:
-            from .models import SeniorSubmission
-            try:
-                ss = SeniorSubmission.objects.filter(orig_submission=sub.id).first()
-                if ss:
-                    ss.status = sub.status
-                    ss.score = sub.score
-                    ss.max_score = sub.max_score
-                    ss.judge0_tokens = sub.judge0_tokens
-                    ss.judge0_raw = sub.judge0_raw
-                    ss.save(update_fields=["status", "score", "max_score", "judge0_tokens", "judge0_raw", "updated_at"])
-            except Exception:
-                logger.exception("mirror.senior.update_failed", extra={"submission_id": str(sub.id)})
-
         # Only count as solved when evaluation is DONE and perfect
         if (
             sub.status == Submission.Status.DONE
@@ -283,6 +586,7 @@ def evaluate_submission(self, submission_id: str):
         wrapped_code = maybe_wrap_code(sub.problem, sub.language, sub.code)
     except Exception:
         wrapped_code = sub.code
+    check = checkers.for_problem(sub.problem)
 
     # Check Judge0 connectivity before proceeding
     is_connected, connectivity_error = _check_judge0_connectivity()
@@ -312,31 +616,24 @@ def evaluate_submission(self, submission_id: str):
             tests = []
             file_errors = []
             for tc in testcases_qs:
-                if not tc.file or not tc.file.path.endswith(".json"):
-                    file_errors.append(
-                        f"TestCase {tc.id}: Invalid file path or extension"
-                    )
-                    continue
                 try:
-                    with open(tc.file.path, "r") as f:
-                        data = json.load(f)
-                        test_cases_in_file = data.get("test_cases", [])
-                        if not test_cases_in_file:
-                            file_errors.append(
-                                f"TestCase {tc.id}: No 'test_cases' array found in JSON"
-                            )
-                            continue
-                        for case in test_cases_in_file:
-                            tests.append(
-                                {
-                                    "stdin": case.get("stdin", ""),
-                                    "expected_output": case.get("expected_output", ""),
-                                    "group": case.get("group", "default"),
-                                    "weight": float(case.get("weight", 1.0)),
-                                }
-                            )
+                    test_cases_in_file = testsuite.cases(tc)
+                    if not test_cases_in_file:
+                        file_errors.append(
+                            f"TestCase {tc.id}: No 'test_cases' array found in JSON"
+                        )
+                        continue
+                    for case in test_cases_in_file:
+                        tests.append(
+                            {
+                                "stdin": case.get("stdin", ""),
+                                "expected_output": case.get("expected_output", ""),
+                                "group": case.get("group", "default"),
+                                "weight": float(case.get("weight", 1.0)),
+                            }
+                        )
                 except Exception as e:
-                    file_errors.append(f"TestCase {tc.id} ({tc.file.path}): {str(e)}")
+                    file_errors.append(f"TestCase {tc.id} ({tc.file.name}): {str(e)}")
 
             if not tests:
                 sub.status = Submission.Status.ERROR
@@ -349,34 +646,32 @@ def evaluate_submission(self, submission_id: str):
                 sub.save(update_fields=["status", "judge0_raw", "updated_at"])
                 return str(sub.id)
 
-            local_executor = LocalCodeExecutor()
+            local_executor = LocalCodeExecutor(checker=check)
             local_test_cases = [
                 {"stdin": t["stdin"], "expected_output": t["expected_output"]}
                 for t in tests
             ]
 
-            local_results = local_executor.execute_python_code(
-                wrapped_code, local_test_cases
+            local_results = local_executor.execute_code(
+                sub.language, wrapped_code, local_test_cases
             )
 
             total_weight = 0.0
             gained = 0.0
+            rows = []
             for i, result in enumerate(local_results):
-                SubmissionTestCaseResult.objects.update_or_create(
-                    submission=sub,
-                    index=i,
-                    defaults={
-                        "group": tests[i]["group"],
-                        "weight": tests[i]["weight"],
-                        "stdin": tests[i]["stdin"],
-                        "expected_output": tests[i]["expected_output"],
-                        "output": result.get("output", ""),
-                        "passed": result.get("passed", False),
-                        "status": result.get("status", "Unknown"),
-                        "time_ms": float(result.get("time_ms", 0)),
-                        "memory_kb": int(result.get("memory_kb", 0)),
-                        "judge0_raw": {"local_fallback": True},
-                    },
+                rows.append(
+                    result_row(
+                        sub,
+                        i,
+                        tests[i],
+                        output=result.get("output", ""),
+                        passed=result.get("passed", False),
+                        status=result.get("status", "Unknown"),
+                        time_ms=float(result.get("time_ms", 0)),
+                        memory_kb=int(result.get("memory_kb", 0)),
+                        judge0_raw={"local_fallback": True},
+                    )
                 )
                 total_weight += float(tests[i]["weight"])
                 if result.get("passed"):
@@ -391,14 +686,16 @@ def evaluate_submission(self, submission_id: str):
                 "connectivity_error": connectivity_error,
                 "timestamp": time.time(),
             }
-            sub.save(
+            save_results(
+                sub,
+                rows,
                 update_fields=[
                     "max_score",
                     "score",
                     "status",
                     "judge0_raw",
                     "updated_at",
-                ]
+                ],
             )
             logger.info(
                 "judge0.fallback.no_connectivity_success",
@@ -460,52 +757,56 @@ def evaluate_submission(self, submission_id: str):
 
         tests = []
         file_errors = []
+        # Seeds the first result poll; test files may carry the reference
+        # solution's runtime (baseline_time) or the time limit (tle_limit).
+        expected_runtime_s = None
 
         for tc in testcases_qs:
-            if not tc.file or not tc.file.path.endswith(".json"):
-                file_errors.append(f"TestCase {tc.id}: Invalid file path or extension")
-                continue
-
             try:
-                with open(tc.file.path, "r") as f:
-                    data = json.load(f)
-                    test_cases_in_file = data.get("test_cases", [])
-
-                    if not test_cases_in_file:
-                        file_errors.append(
-                            f"TestCase {tc.id}: No 'test_cases' array found in JSON"
-                        )
-                        continue
+                data = testsuite.load(tc)
+                test_cases_in_file = data.get("test_cases", [])
 
-                    for case in test_cases_in_file:
-                        tests.append(
-                            {
-                                "stdin": case.get("stdin", ""),
-                                "expected_output": case.get("expected_output", ""),
-                                "group": case.get("group", "default"),
-                                "weight": float(case.get("weight", 1.0)),
-                            }
-                        )
+                if not test_cases_in_file:
+                    file_errors.append(
+                        f"TestCase {tc.id}: No 'test_cases' array found in JSON"
+                    )
+                    continue
 
-                    logger.info(
-                        "judge0.testcase.loaded",
-                        extra={
-                            "submission_id": str(sub.id),
-                            "testcase_id": tc.id,
-                            "file_path": tc.file.path,
-                            "test_cases_loaded": len(test_cases_in_file),
-                        },
+                for case in test_cases_in_file:
+                    tests.append(
+                        {
+                            "stdin": case.get("stdin", ""),
+                            "expected_output": case.get("expected_output", ""),
+                            "group": case.get("group", "default"),
+                            "weight": float(case.get("weight", 1.0)),
+                            "visible": bool(case.get("is_visible", False)),
+                        }
                     )
 
+                metadata = data.get("metadata") or {}
+                runtime = metadata.get("baseline_time") or metadata.get("tle_limit")
+                if runtime:
+                    expected_runtime_s = max(expected_runtime_s or 0.0, float(runtime))
+
+                logger.info(
+                    "judge0.testcase.loaded",
+                    extra={
+                        "submission_id": str(sub.id),
+                        "testcase_id": tc.id,
+                        "file_path": tc.file.name,
+                        "test_cases_loaded": len(test_cases_in_file),
+                    },
+                )
+
             except Exception as e:
-                error_msg = f"TestCase {tc.id} ({tc.file.path}): {str(e)}"
+                error_msg = f"TestCase {tc.id} ({tc.file.name}): {str(e)}"
                 file_errors.append(error_msg)
                 logger.warning(
                     "judge0.testcase.parse_error",
                     extra={
                         "submission_id": str(sub.id),
                         "testcase_id": tc.id,
-                        "testcase_file": tc.file.path,
+                        "testcase_file": tc.file.name,
                         "error": str(e),
                     },
                 )
@@ -552,18 +853,31 @@ def evaluate_submission(self, submission_id: str):
             sub.save(update_fields=["status", "judge0_raw", "updated_at"])
             return str(sub.id)
 
+        stop_early = (
+            sub.problem.evaluation_policy
+            == Problem.EvaluationPolicy.STOP_ON_FIRST_FAILURE
+        )
+        if stop_early:
+            # Visible (sample) cases are the likeliest to fail; run them first
+            tests.sort(key=lambda t: not t["visible"])
+
+        # Byte-identical resubmissions reuse the earlier verdicts
+        memo_key = memo.key(wrapped_code, sub.language, sub.problem, testcases_qs)
+        cached = memo.get(memo_key)
+        cached_rows = memo.rows(cached, sub, tests) if cached else None
+        if cached_rows is not None:
+            return _finish_from_memo(sub, cached, cached_rows)
+
         submissions_payload = [
             {
                 "source_code": wrapped_code,
                 "language_id": lang_id,
                 "stdin": t["stdin"],
-                "expected_output": t["expected_output"],
             }
             for t in tests
         ]
 
         base_url = getattr(settings, "JUDGE0_URL", "http://localhost:2358").rstrip("/")
-        payload = {"submissions": submissions_payload}
 
         logger.info(
             "judge0.create_batch.start",
@@ -571,76 +885,39 @@ def evaluate_submission(self, submission_id: str):
                 "submission_id": str(sub.id),
                 "base_url": base_url,
                 "tests": len(submissions_payload),
+                "batch_size": _judge0_max_batch_size(),
                 "language": sub.language,
                 "payload_sample": (
-                    payload["submissions"][0] if payload["submissions"] else None
+                    submissions_payload[0] if submissions_payload else None
                 ),
             },
         )
 
-        # Create individual submissions instead of batch
-        logger.info(
-            "judge0.create_individual.start",
-            extra={
-                "submission_id": str(sub.id),
-                "base_url": base_url,
-                "tests": len(submissions_payload),
-                "language": sub.language,
-            },
+        # Callback mode: Judge0 reports each case to Django and this worker is
+        # released as soon as everything is enqueued. Short-circuit evaluation
+        # has to watch results as they land, so it always polls; callback mode
+        # in turn skips the compile probe below.
+        callback_base = "" if stop_early else _judge0_callback_base_url()
+        compile_probe = (
+            sub.language in COMPILED_LANGUAGES
+            and len(tests) > 1
+            and not callback_base
+            and _wants_compile_probe(sub)
         )
-
-        tokens = []
-        for i, test_payload in enumerate(submissions_payload):
-            try:
-                create_resp = requests.post(
-                    f"{base_url}/submissions?base64_encoded=false&wait=false",
-                    headers=_judge0_headers(),
-                    json=test_payload,
-                    timeout=30,
-                )
-                create_resp.raise_for_status()
-
-                create_data = create_resp.json()
-                token = create_data.get("token")
-                if token:
-                    tokens.append(token)
-                else:
-                    logger.error(
-                        "judge0.create_individual.no_token",
-                        extra={
-                            "submission_id": str(sub.id),
-                            "test_index": i,
-                            "response": create_data,
-                        },
-                    )
-
-            except requests.RequestException as e:
-                error_response = None
-                if hasattr(e, "response") and e.response is not None:
-                    try:
-                        error_response = e.response.text
-                    except Exception:
-                        error_response = "Could not parse response"
-
-                logger.error(
-                    "judge0.create_individual.request_failed",
-                    extra={
-                        "submission_id": str(sub.id),
-                        "test_index": i,
-                        "error": str(e),
-                        "status_code": (
-                            getattr(e.response, "status_code", None)
-                            if hasattr(e, "response")
-                            else None
-                        ),
-                        "response_text": error_response,
-                        "payload": test_payload,
-                    },
-                )
-                # Continue with other tests instead of failing completely
-                continue
-
-        if not tokens:
+        if callback_base:
+            _create_pending_results(sub, tests, memo_key)
+            for i, item in enumerate(submissions_payload):
+                item["callback_url"] = _judge0_callback_url(callback_base, sub.id, i)
+
+        # tokens[i] belongs to tests[i]; None marks a case Judge0 would not
+        # accept or (short-circuit mode) a case not enqueued yet.
+        waves = _evaluation_waves(tests, stop_early, compile_probe)
+        tokens = [None] * len(tests)
+        _enqueue_wave(base_url, submissions_payload, waves[0], tokens, str(sub.id))
+
+        if not any(tokens):
+            if callback_base:
+                sub.results.all().delete()
             logger.warning(
                 "judge0.fallback.local_execution",
                 extra={
@@ -651,7 +928,7 @@ def evaluate_submission(self, submission_id: str):
 
             # Use local executor as fallback
             try:
-                local_executor = LocalCodeExecutor()
+                local_executor = LocalCodeExecutor(checker=check)
 
                 # Convert test cases to local executor format
                 local_test_cases = []
@@ -661,24 +938,23 @@ def evaluate_submission(self, submission_id: str):
                     )
 
                 # Execute locally
-                local_results = local_executor.execute_python_code(
-                    wrapped_code, local_test_cases
+                local_results = local_executor.execute_code(
+                    sub.language, wrapped_code, local_test_cases
                 )
 
-                # Create SubmissionTestCaseResult objects
-                for result in local_results:
-                    SubmissionTestCaseResult.objects.create(
-                        submission=sub,
-                        index=result["index"],
-                        group=result["group"],
-                        weight=result["weight"],
+                rows = [
+                    result_row(
+                        sub,
+                        result["index"],
+                        tests[result["index"]],
                         status=result["status"],
                         passed=result["passed"],
                         time_ms=result["time_ms"],
                         memory_kb=result["memory_kb"],
                         output=result["output"],
-                        expected_output=result["expected_output"],
                     )
+                    for result in local_results
+                ]
 
                 # Calculate score
                 passed_tests = sum(1 for r in local_results if r["passed"])
@@ -697,14 +973,16 @@ def evaluate_submission(self, submission_id: str):
                     "results": local_results,
                     "timestamp": time.time(),
                 }
-                sub.save(
+                save_results(
+                    sub,
+                    rows,
                     update_fields=[
                         "status",
                         "score",
                         "max_score",
                         "judge0_raw",
                         "updated_at",
-                    ]
+                    ],
                 )
 
                 logger.info(
@@ -740,96 +1018,70 @@ def evaluate_submission(self, submission_id: str):
             "judge0.create_batch.ok",
             extra={
                 "submission_id": str(sub.id),
-                "token_count": len(tokens),
+                "token_count": sum(1 for t in tokens if t),
+                "rejected": sum(1 for i in waves[0] if not tokens[i]),
             },
         )
 
-        # Poll results in batches with improved timeout handling
-        results = [None] * len(tokens)
-        start = time.time()
-        poll_timeout = 120  # Increased to 2 minutes
+        if callback_base:
+            _await_judge0_callbacks(sub, tokens)
+            return str(sub.id)
 
-        while any(r is None for r in results):
-            try:
-                poll = requests.get(
-                    f"{base_url}/submissions/batch?tokens={','.join(tokens)}&base64_encoded=false",
-                    headers=_judge0_headers(),
-                    timeout=30,
-                )
-                poll.raise_for_status()
-            except requests.RequestException as e:
-                logger.warning(
-                    "judge0.poll.request_failed",
-                    extra={
-                        "submission_id": str(sub.id),
-                        "error": str(e),
-                        "elapsed_s": round(time.time() - start, 2),
-                    },
-                )
-                time.sleep(2)  # Brief pause before retry
-                continue
+        progress.start(sub.id, tests)
+        case_fields = _case_fields(tests, check)
 
-            poll_data = poll.json()
-            # poll_data might be {"submissions": [ ... ]}
-            items = poll_data.get("submissions", poll_data)
-            for i, item in enumerate(items):
-                if i >= len(results):  # Safety check
-                    continue
-                status_id = (item.get("status") or {}).get("id")
-                if status_id in (1, 2):  # In Queue / Processing
-                    continue
-                results[i] = item
+        def case_done(i, item):
+            fields = case_fields(i, item)
+            progress.record(sub.id, i, tests[i].get("weight", 1.0), fields["passed"])
+            events.case_done(sub.id, i, fields)
 
-            if time.time() - start > poll_timeout:
-                logger.warning(
-                    "judge0.poll.timeout",
-                    extra={
-                        "submission_id": str(sub.id),
-                        "waited_s": round(time.time() - start, 2),
-                        "completed_results": sum(1 for r in results if r is not None),
-                        "total_results": len(results),
-                    },
-                )
-                break
-            time.sleep(1)
+        start = time.time()
+        skipped = set()
+        if len(waves) > 1:
+            results, poll_metrics, skipped = _poll_in_waves(
+                base_url,
+                submissions_payload,
+                tests,
+                waves,
+                tokens,
+                submission_id=str(sub.id),
+                expected_runtime_s=expected_runtime_s,
+                stop_early=stop_early,
+                on_result=case_done,
+                fields=case_fields,
+            )
+            sub.judge0_tokens = tokens
+        else:
+            results, poll_metrics = _poll_judge0_results(
+                base_url,
+                tokens,
+                submission_id=str(sub.id),
+                expected_runtime_s=expected_runtime_s,
+                on_result=case_done,
+            )
 
-        # Persist per-test results
+        # Collect per-test results; they are written together with the
+        # Submission below (or replaced by the local fallback's).
         total_weight = 0.0
         gained = 0.0
         internal_error_count = 0
+        rows = []
 
         for i, (test, item) in enumerate(zip(tests, results)):
-            status = (item or {}).get("status", {})
-            status_desc = status.get("description", "Unknown")
-            stdout = (item or {}).get("stdout") or ""
-            stderr = (item or {}).get("stderr") or ""
-            out = (stdout or stderr or "").strip()
-            passed = out.strip() == str(test["expected_output"]).strip()
-            time_ms = (item or {}).get("time") or 0
-            mem_kb = (item or {}).get("memory") or 0
+            fields = dict(case_fields(i, item))
+            if i in skipped:
+                fields["status"] = SKIPPED_STATUS
+            if i in skipped or item is None:
+                # Never judged, whatever an empty stdout would have matched
+                fields["passed"] = False
 
             # Count internal errors for fallback detection
-            if status_desc == "Internal Error":
+            if fields["status"] == "Internal Error":
                 internal_error_count += 1
 
-            SubmissionTestCaseResult.objects.update_or_create(
-                submission=sub,
-                index=i,
-                defaults={
-                    "group": test["group"],
-                    "weight": test["weight"],
-                    "stdin": test["stdin"],
-                    "expected_output": test["expected_output"],
-                    "output": out,
-                    "passed": passed,
-                    "status": status_desc,
-                    "time_ms": float(time_ms) if time_ms else 0.0,
-                    "memory_kb": int(mem_kb) if mem_kb else 0,
-                    "judge0_raw": item or {},
-                },
-            )
+            rows.append(result_row(sub, i, test, **fields))
             total_weight += float(test["weight"])
-            if passed:
+            if fields["passed"]:
                 gained += float(test["weight"])
 
         # Check if all submissions failed with Internal Error - trigger local fallback
@@ -844,10 +1096,7 @@ def evaluate_submission(self, submission_id: str):
             )
 
             try:
-                # Clear existing failed results
-                sub.results.all().delete()
-
-                local_executor = LocalCodeExecutor()
+                local_executor = LocalCodeExecutor(checker=check)
 
                 # Convert test cases to local executor format
                 local_test_cases = []
@@ -857,34 +1106,33 @@ def evaluate_submission(self, submission_id: str):
                     )
 
                 # Execute locally
-                local_results = local_executor.execute_python_code(
-                    wrapped_code, local_test_cases
+                local_results = local_executor.execute_code(
+                    sub.language, wrapped_code, local_test_cases
                 )
 
-                # Create new SubmissionTestCaseResult objects
-                total_weight = 0.0
-                gained = 0.0
+                local_rows = []
+                local_weight = 0.0
+                local_gained = 0.0
                 for result in local_results:
-                    SubmissionTestCaseResult.objects.create(
-                        submission=sub,
-                        index=result["index"],
-                        group=result["group"],
-                        weight=result["weight"],
-                        stdin=local_test_cases[result["index"]]["stdin"],
-                        expected_output=result["expected_output"],
-                        output=result["output"],
-                        passed=result["passed"],
-                        status=result["status"],
-                        time_ms=result["time_ms"],
-                        memory_kb=result["memory_kb"],
+                    local_rows.append(
+                        result_row(
+                            sub,
+                            result["index"],
+                            tests[result["index"]],
+                            output=result["output"],
+                            passed=result["passed"],
+                            status=result["status"],
+                            time_ms=result["time_ms"],
+                            memory_kb=result["memory_kb"],
+                        )
                     )
-                    total_weight += float(result["weight"])
+                    local_weight += float(result["weight"])
                     if result["passed"]:
-                        gained += float(result["weight"])
+                        local_gained += float(result["weight"])
 
                 # Update submission with local execution results
-                sub.max_score = total_weight
-                sub.score = gained
+                sub.max_score = local_weight
+                sub.score = local_gained
                 sub.status = Submission.Status.DONE
                 sub.judge0_raw = {
                     "local_execution": True,
@@ -893,21 +1141,23 @@ def evaluate_submission(self, submission_id: str):
                     "results": local_results,
                     "timestamp": time.time(),
                 }
-                sub.save(
+                save_results(
+                    sub,
+                    local_rows,
                     update_fields=[
                         "max_score",
                         "score",
                         "status",
                         "judge0_raw",
                         "updated_at",
-                    ]
+                    ],
                 )
 
                 logger.info(
                     "judge0.fallback.internal_error_success",
                     extra={
                         "submission_id": str(sub.id),
-                        "score": f"{gained}/{total_weight}",
+                        "score": f"{local_gained}/{local_weight}",
                         "passed_tests": f"{sum(1 for r in local_results if r['passed'])}/{len(local_results)}",
                     },
                 )
@@ -924,13 +1174,27 @@ def evaluate_submission(self, submission_id: str):
         # Original Judge0 result processing
         sub.max_score = total_weight
         sub.score = gained
-        sub.status = (
-            Submission.Status.DONE if None not in results else Submission.Status.ERROR
-        )
-        sub.judge0_raw = {"duration_s": round(time.time() - start, 2)}
-        sub.save(
-            update_fields=["score", "max_score", "status", "judge0_raw", "updated_at"]
+        missing = [i for i, r in enumerate(results) if r is None and i not in skipped]
+        sub.status = Submission.Status.ERROR if missing else Submission.Status.DONE
+        sub.judge0_raw = {
+            "duration_s": round(time.time() - start, 2),
+            "poll": poll_metrics,
+        }
+        if stop_early:
+            sub.judge0_raw["skipped"] = len(skipped)
+        save_results(
+            sub,
+            rows,
+            update_fields=[
+                "score",
+                "max_score",
+                "status",
+                "judge0_tokens",
+                "judge0_raw",
+                "updated_at",
+            ],
         )
+        memo.store(memo_key, sub, rows)
         _post_evaluation_update(sub)
 
         logger.info(
@@ -967,3 +1231,247 @@ def evaluate_submission(self, submission_id: str):
 
         # Re-raise for potential retry
         raise
+
+
+def enqueue_evaluation(sub, interactive: bool = False):
+    """Queue ``evaluate_submission`` for ``sub`` on its language's queue.
+
+    ``interactive`` marks a "run" the student is waiting on; it is served
+    before full submissions already in the queue.
+    """
+    return evaluate_submission.apply_async(
+        args=[str(sub.id)], **evaluation_options(sub.language, interactive)
+    )
+
+
+# ----------------- Judge0 callback mode -----------------
+#
+# With JUDGE0_CALLBACK_BASE_URL set, evaluate_submission writes one "Pending"
+# result row per case, creates the Judge0 submissions with a signed
+# ``callback_url`` per case and returns. Judge0 PUTs each finished case to
+# ``judge0_callback`` (views), which fills in its row; the callback that
+# completes the last row finalizes the Submission. ``sweep_judge0_callbacks``
+# recovers submissions whose callbacks never arrived.
+
+PENDING_STATUS = "Pending"
+CALLBACK_SIGNER_SALT = "accounts.judge0_callback"
+
+
+def _judge0_callback_base_url() -> str:
+    return (getattr(settings, "JUDGE0_CALLBACK_BASE_URL", "") or "").rstrip("/")
+
+
+def judge0_callback_signature(submission_id, index) -> str:
+    return signing.Signer(salt=CALLBACK_SIGNER_SALT).signature(f"{submission_id}:{index}")
+
+
+def _judge0_callback_url(callback_base, submission_id, index) -> str:
+    path = reverse("judge0_callback", args=[submission_id, index])
+    return f"{callback_base}{path}?sig={judge0_callback_signature(submission_id, index)}"
+
+
+def _finish_from_memo(sub, entry, rows) -> str:
+    """Complete ``sub`` with the verdicts of an identical earlier evaluation."""
+    sub.score = entry["score"]
+    sub.max_score = entry["max_score"]
+    sub.status = Submission.Status.DONE
+    sub.judge0_raw = {"memo": True, "source_submission": entry["submission_id"]}
+    save_results(
+        sub,
+        rows,
+        update_fields=["score", "max_score", "status", "judge0_raw", "updated_at"],
+    )
+    logger.info(
+        "judge0.evaluate.memo_hit",
+        extra={
+            "submission_id": str(sub.id),
+            "source_submission": entry["submission_id"],
+            "score": sub.score,
+        },
+    )
+    _post_evaluation_update(sub)
+    return str(sub.id)
+
+
+def _create_pending_results(sub, tests, memo_key=None) -> None:
+    """Write a placeholder row per case before any callback can arrive."""
+    sub.judge0_raw = {"callback": True, "enqueued_at": time.time(), "memo_key": memo_key}
+    save_results(
+        sub,
+        [result_row(sub, i, test, status=PENDING_STATUS) for i, test in enumerate(tests)],
+        update_fields=["judge0_raw", "updated_at"],
+    )
+    progress.start(sub.id, tests)
+
+
+def _await_judge0_callbacks(sub, tokens) -> None:
+    """Close out cases Judge0 rejected; finalize if every callback already landed."""
+    rejected = [i for i, token in enumerate(tokens) if not token]
+    with transaction.atomic():
+        locked = Submission.objects.select_for_update().get(id=sub.id)
+        if rejected:
+            locked.results.filter(index__in=rejected, status=PENDING_STATUS).update(
+                status="Unknown"
+            )
+        done = _finalize_if_complete(locked)
+    if done:
+        _post_evaluation_update(locked)
+    logger.info(
+        "judge0.callback.awaiting",
+        extra={
+            "submission_id": str(sub.id),
+            "pending": len(tokens) - len(rejected),
+            "finalized": done,
+        },
+    )
+
+
+def _finalize_if_complete(sub) -> bool:
+    """Score ``sub`` from its rows once none is pending. Caller holds the row lock."""
+    if sub.status != Submission.Status.RUNNING:
+        return False
+    rows = list(sub.results.all())
+    if any(r.status == PENDING_STATUS for r in rows):
+        return False
+
+    enqueued_at = (sub.judge0_raw or {}).get("enqueued_at")
+    memo_key = (sub.judge0_raw or {}).get("memo_key")
+    sub.max_score = sum(float(r.weight) for r in rows)
+    sub.score = sum(float(r.weight) for r in rows if r.passed)
+    # Rows without a Judge0 answer (rejected or timed out) fail the evaluation,
+    # like missing results do in polling mode.
+    complete = all("status" in (r.judge0_raw or {}) for r in rows)
+    sub.status = Submission.Status.DONE if complete else Submission.Status.ERROR
+    sub.judge0_raw = {
+        "callback": True,
+        "duration_s": round(time.time() - enqueued_at, 2) if enqueued_at else None,
+    }
+    sub.save(update_fields=["score", "max_score", "status", "judge0_raw", "updated_at"])
+    memo.store(memo_key, sub, rows)
+    logger.info(
+        "judge0.evaluate.done",
+        extra={
+            "submission_id": str(sub.id),
+            "status": sub.status,
+            "score": sub.score,
+            "max_score": sub.max_score,
+            "duration_s": sub.judge0_raw.get("duration_s"),
+        },
+    )
+    return True
+
+
+def _decode_judge0_callback(payload: dict) -> dict:
+    """Judge0 always sends callback bodies base64-encoded."""
+    item = dict(payload or {})
+    for key in ("stdout", "stderr", "compile_output", "message"):
+        value = item.get(key)
+        if value:
+            try:
+                item[key] = base64.b64decode(value).decode("utf-8", errors="replace")
+            except (ValueError, TypeError):
+                pass  # already plain text
+    return item
+
+
+def record_judge0_result(submission_id, index, item) -> bool:
+    """Store one finished case; returns False for late or duplicate deliveries."""
+    if (item.get("status") or {}).get("id") in (1, 2):
+        return False
+    with transaction.atomic():
+        sub = Submission.objects.select_for_update().filter(id=submission_id).first()
+        if sub is None or sub.status != Submission.Status.RUNNING:
+            return False
+        row = (
+            sub.results.select_related("case")
+            .filter(index=index, status=PENDING_STATUS)
+            .first()
+        )
+        if row is None:
+            return False
+        test = {"stdin": row.stdin, "expected_output": row.expected_output}
+        fields = _judge0_result_fields(test, item, checkers.for_problem(sub.problem))
+        for field, value in fields.items():
+            setattr(row, field, value)
+        row.save()
+        progress.record(sub.id, index, row.weight, row.passed)
+        events.case_done(sub.id, index, fields)
+        done = _finalize_if_complete(sub)
+    if done:
+        _post_evaluation_update(sub)
+    return True
+
+
+def handle_judge0_callback(submission_id, index, payload) -> bool:
+    """Entry point for the callback view."""
+    metrics.incr("judge0.callback")
+    return record_judge0_result(submission_id, index, _decode_judge0_callback(payload))
+
+
+@shared_task
+def sweep_judge0_callbacks():
+    """Beat task: finish callback-mode submissions whose callbacks were lost.
+
+    Cases still pending after ``JUDGE0_CALLBACK_TIMEOUT_S`` are fetched from
+    Judge0 once; whatever is still unfinished is recorded as timed out.
+    """
+    timeout_s = float(getattr(settings, "JUDGE0_CALLBACK_TIMEOUT_S", 180))
+    cutoff = timezone.now() - timedelta(seconds=timeout_s)
+    stale = (
+        Submission.objects.filter(
+            status=Submission.Status.RUNNING,
+            updated_at__lt=cutoff,
+            results__status=PENDING_STATUS,
+        )
+        .distinct()
+        .values_list("id", flat=True)
+    )
+
+    swept = 0
+    for submission_id in list(stale):
+        sub = Submission.objects.get(id=submission_id)
+        tokens = sub.judge0_tokens or []
+        pending = {
+            tokens[i]: i
+            for i in sub.results.filter(status=PENDING_STATUS).values_list("index", flat=True)
+            if i < len(tokens) and tokens[i]
+        }
+        pending_tokens = list(pending)
+        chunk_size = _judge0_max_batch_size()
+        for offset in range(0, len(pending_tokens), chunk_size):
+            chunk = pending_tokens[offset : offset + chunk_size]
+            try:
+                resp = get_client().get(
+                    "/submissions/batch",
+                    params={
+                        "tokens": ",".join(chunk),
+                        "base64_encoded": "false",
+                        "fields": JUDGE0_POLL_FIELDS,
+                    },
+                )
+                resp.raise_for_status()
+                items = resp.json().get("submissions") or []
+            except (requests.RequestException, ValueError, AttributeError) as e:
+                logger.warning(
+                    "judge0.callback.sweep_fetch_failed",
+                    extra={"submission_id": str(submission_id), "error": str(e)},
+                )
+                continue
+            for item in items:
+                if isinstance(item, dict) and item.get("token") in pending:
+                    record_judge0_result(submission_id, pending[item["token"]], item)
+
+        with transaction.atomic():
+            locked = Submission.objects.select_for_update().get(id=submission_id)
+            locked.results.filter(status=PENDING_STATUS).update(
+                status="Callback Timeout"
+            )
+            done = _finalize_if_complete(locked)
+        if done:
+            _post_evaluation_update(locked)
+            swept += 1
+        logger.warning(
+            "judge0.callback.swept",
+            extra={"submission_id": str(submission_id), "finalized": done},
+        )
+    return swept
@@ -0,0 +1,82 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts import admission, metrics
+from accounts.models import Contest, ContestAttempt, Problem, Student, Submission
+
+
+@override_settings(
+    ADMISSION_MAX_IN_FLIGHT=2,
+    ADMISSION_STUDENT_RATE_PER_MIN=6,
+    ADMISSION_STUDENT_BURST=3,
+    ADMISSION_GLOBAL_RATE_PER_MIN=0,
+)
+@patch("accounts.views.enqueue_evaluation")
+class RunCodeAdmissionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        contest = Contest.objects.create(name="Admission Contest", start_at=timezone.now())
+        self.problem = Problem.objects.create(contest=contest, code="P1", title="Echo")
+        self.student = Student.objects.create(
+            name="Ada", email="ada@example.edu", password="x", mobile="1", college="C", passout_year=2026, branch="CS"
+        )
+        ContestAttempt.objects.create(student=self.student, contest=contest)
+        self.client = Client()
+        session = self.client.session
+        session["student_id"] = self.student.id
+        session.save()
+
+    def _run(self, code):
+        return self.client.post(reverse("run_code", args=[self.problem.id]), {"code": code, "action": "run"})
+
+    def test_identical_queued_submission_is_coalesced(self, enqueue):
+        first = self._run("print(1)").json()
+        second = self._run("print(1)").json()
+
+        self.assertEqual(second["submission_id"], first["submission_id"])
+        self.assertTrue(second["coalesced"])
+        self.assertEqual(Submission.objects.count(), 1)
+        self.assertEqual(enqueue.call_count, 1)
+        self.assertEqual(metrics.get("admission.coalesced"), 1)
+
+    def test_in_flight_limit_answers_429_with_retry_after(self, enqueue):
+        self._run("print(1)")
+        self._run("print(2)")
+        response = self._run("print(3)")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "2")
+        self.assertEqual(response.json()["reason"], admission.IN_FLIGHT)
+        self.assertEqual(Submission.objects.count(), 2)
+
+        # A finished submission frees its slot
+        Submission.objects.filter(code="print(1)").update(status=Submission.Status.DONE)
+        self.assertEqual(self._run("print(3)").status_code, 200)
+
+    def test_student_token_bucket(self, enqueue):
+        for n in range(3):
+            self.assertEqual(self._run(f"print({n})").status_code, 200)
+            Submission.objects.update(status=Submission.Status.DONE)
+
+        response = self._run("print(3)")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["reason"], admission.STUDENT_RATE)
+        # One token every 10 s
+        self.assertIn(response["Retry-After"], {"9", "10"})
+        self.assertEqual(admission.stats()["rejected_student_rate"], 1)
+
+    @override_settings(ADMISSION_GLOBAL_RATE_PER_MIN=60, ADMISSION_GLOBAL_BURST=1)
+    def test_global_bucket_applies_to_anonymous_api_submissions(self, enqueue):
+        url = reverse("create_submission")
+        body = {"problem_id": self.problem.id, "code": "print(1)"}
+
+        self.assertEqual(Client().post(url, body, content_type="application/json").status_code, 200)
+        response = Client().post(url, body, content_type="application/json")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.json()["reason"], admission.GLOBAL_RATE)
@@ -0,0 +1,98 @@
+from django.test import SimpleTestCase
+
+from accounts import checkers
+from accounts.executor import LocalCodeExecutor
+from accounts.models import Problem
+from accounts.tasks import _judge0_result_fields
+
+
+def sum_judge(stdin, expected, output):
+    """Accepts any two numbers that add up to the number on stdin."""
+    a, b = map(int, output.split())
+    return a + b == int(stdin)
+
+
+class CheckerTests(SimpleTestCase):
+    def test_exact_ignores_only_surrounding_whitespace(self):
+        self.assertTrue(checkers.exact("  1 2\n3\n\n", "1 2\n3"))
+        self.assertFalse(checkers.exact("1  2\n3", "1 2\n3"))
+        self.assertFalse(checkers.exact("1 2", "1 2 3"))
+
+    def test_exact_compares_across_windows(self):
+        big = "x" * (checkers.WINDOW * 3 + 7)
+        self.assertTrue(checkers.exact(big + "\n", big))
+        self.assertFalse(checkers.exact(big[:-1] + "y", big))
+
+    def test_lines_ignore_trailing_spaces_and_edge_blank_lines(self):
+        self.assertTrue(checkers.lines("\n1 2   \r\n3\n\n", "1 2\n3"))
+        self.assertFalse(checkers.lines("1 2\n\n3", "1 2\n3"))
+        self.assertFalse(checkers.lines("1 2", "1 2\n3"))
+
+    def test_tokens_ignore_layout(self):
+        self.assertTrue(checkers.tokens("1\n2  3", "1 2 3"))
+        self.assertFalse(checkers.tokens("1 2", "1 2 3"))
+
+    def test_floats_within_tolerance(self):
+        check = checkers.get_checker(checkers.FLOAT, 1e-3)
+        self.assertTrue(check("0.3334 x 1000.5", "0.3333 x 1000"))
+        self.assertFalse(check("0.34", "0.3333"))
+        self.assertFalse(check("0.3333 y", "0.3333 x"))
+        self.assertFalse(check("1", "1 2"))
+
+    def test_unordered(self):
+        self.assertTrue(checkers.unordered("3 1\n2 1", "1 1 2 3"))
+        self.assertFalse(checkers.unordered("1 2 3", "1 1 2 3"))
+
+    def test_special_judge(self):
+        check = checkers.get_checker(checkers.SPECIAL, special_judge=f"{__name__}.sum_judge")
+        self.assertTrue(check("2 3", "1 4", "5"))
+        self.assertFalse(check("2 2", "1 4", "5"))
+        # A judge that raises fails the case
+        self.assertFalse(check("oops", "1 4", "5"))
+
+    def test_problem_settings_pick_the_checker(self):
+        self.assertIs(checkers.for_problem(Problem()), checkers.exact)
+        self.assertIs(checkers.for_problem(Problem(checker="unordered")), checkers.unordered)
+        self.assertTrue(checkers.for_problem(Problem(checker="float", checker_tolerance=0.5))("1.4", "1"))
+
+
+class CheckerEvaluationTests(SimpleTestCase):
+    def test_stderr_is_shown_but_never_judged(self):
+        item = {"status": {"id": 4, "description": "Wrong Answer"}, "stdout": "", "stderr": "42"}
+
+        fields = _judge0_result_fields({"stdin": "", "expected_output": "42"}, item)
+
+        self.assertFalse(fields["passed"])
+        self.assertEqual(fields["output"], "42")
+
+    def test_judge0_result_uses_the_given_checker(self):
+        item = {"status": {"id": 3, "description": "Accepted"}, "stdout": "2\n1\n"}
+        test = {"stdin": "", "expected_output": "1 2"}
+
+        self.assertFalse(_judge0_result_fields(test, item)["passed"])
+        self.assertTrue(_judge0_result_fields(test, item, checkers.unordered)["passed"])
+
+    def test_judge0_status_follows_the_checker(self):
+        test = {"stdin": "", "expected_output": "1 2"}
+        ran = {"status": {"id": 4, "description": "Wrong Answer"}, "stdout": "2 1"}
+        timed_out = {"status": {"id": 5, "description": "Time Limit Exceeded"}, "stdout": "1 2"}
+
+        accepted = _judge0_result_fields(test, ran, checkers.unordered)
+        wrong = _judge0_result_fields(test, ran)
+
+        self.assertEqual((accepted["status"], accepted["passed"]), ("Accepted", True))
+        self.assertEqual((wrong["status"], wrong["passed"]), ("Wrong Answer", False))
+        self.assertEqual(
+            [_judge0_result_fields(test, timed_out)[k] for k in ("status", "passed")], ["Time Limit Exceeded", False]
+        )
+
+    def test_local_executor_uses_the_given_checker(self):
+        code = "print(*input().split(), sep='\\n')\n"
+        cases = [{"stdin": "1 2 3", "expected_output": "1 2 3"}]
+
+        exact = LocalCodeExecutor(backend="subprocess").execute_python_code(code, cases)
+        tokens = LocalCodeExecutor(backend="subprocess", checker=checkers.tokens).execute_python_code(code, cases)
+
+        self.assertEqual(exact[0]["status"], "Wrong Answer")
+        self.assertEqual(tokens[0]["status"], "Accepted")
+        self.assertEqual(tokens[0]["output"], "1\n2\n3")
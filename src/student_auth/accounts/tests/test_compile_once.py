@@ -0,0 +1,144 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+
+from accounts.executor import BuildCache, LocalCodeExecutor, toolchain_available
+from accounts.models import Contest, Problem, Student, Submission, TestCase as TCModel
+from accounts.tasks import evaluate_submission
+
+CPP_DOUBLE = '#include <iostream>\nint main(){long long a; std::cin >> a; std::cout << a * 2;}\n'
+
+
+class FakeCompiler:
+    """Judge0 stand-in for a compiled language: CE when the source says so."""
+
+    def __init__(self):
+        self.created = []
+        self.client = MagicMock()
+        self.client.post.side_effect = self.post
+        self.client.get.side_effect = self.get
+
+    def post(self, path, json=None, **kwargs):
+        first = len(self.created)
+        self.created += json["submissions"]
+        resp = MagicMock(status_code=201)
+        resp.json.return_value = [{"token": str(first + n)} for n in range(len(json["submissions"]))]
+        return resp
+
+    def get(self, path, params=None, **kwargs):
+        items = []
+        for token in params["tokens"].split(","):
+            sub = self.created[int(token)]
+            if "error" in sub["source_code"]:
+                items.append({"token": token, "status": {"id": 6, "description": "Compilation Error"}, "compile_output": "main.cpp:1: error"})
+            else:
+                items.append({"token": token, "status": {"id": 3, "description": "Accepted"}, "stdout": str(2 * int(sub["stdin"]))})
+        resp = MagicMock(status_code=200)
+        resp.json.return_value = {"submissions": items}
+        return resp
+
+
+@override_settings(JUDGE0_CALLBACK_BASE_URL="", JUDGE0_COMPILE_PROBE="always")
+@patch("accounts.tasks.time.sleep")
+@patch("accounts.tasks._check_judge0_connectivity", return_value=(True, None))
+class Judge0CompileProbeTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp(prefix="media_")
+        self.addCleanup(lambda: shutil.rmtree(media, ignore_errors=True))
+        settings_override = override_settings(MEDIA_ROOT=media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        contest = Contest.objects.create(name="C++ Contest", start_at=timezone.now() - timedelta(minutes=5))
+        self.problem = Problem.objects.create(contest=contest, code="P1", title="Double")
+        tc = TCModel.objects.create(problem=self.problem, language="cpp")
+        cases = [{"stdin": str(n), "expected_output": str(2 * n)} for n in range(5)]
+        tc.file.save("cases.json", ContentFile(json.dumps({"test_cases": cases})), save=True)
+
+        self.judge0 = FakeCompiler()
+        patcher = patch("accounts.tasks.get_client", return_value=self.judge0.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _evaluate(self, code, student=None):
+        sub = Submission.objects.create(student=student, problem=self.problem, code=code, language="cpp")
+        evaluate_submission.apply(args=[str(sub.id)])
+        sub.refresh_from_db()
+        return sub
+
+    def test_compilation_error_stops_after_the_probe(self, *_):
+        sub = self._evaluate("int main() { error }")
+
+        self.assertEqual(len(self.judge0.created), 1)
+        self.assertEqual(sub.status, Submission.Status.DONE)
+        self.assertEqual(set(sub.results.values_list("status", flat=True)), {"Compilation Error"})
+        self.assertEqual(sub.results.count(), 5)
+        self.assertEqual(sub.results.first().output, "main.cpp:1: error")
+        self.assertEqual(sub.score, 0)
+
+    def test_successful_probe_fans_out_the_rest(self, *_):
+        sub = self._evaluate(CPP_DOUBLE)
+
+        self.assertEqual(len(self.judge0.created), 5)
+        self.assertEqual(self.judge0.client.post.call_count, 2)
+        self.assertEqual((sub.status, sub.score), (Submission.Status.DONE, 5.0))
+
+    @override_settings(JUDGE0_COMPILE_PROBE="after_error")
+    def test_by_default_only_a_compile_error_earns_the_next_submission_a_probe(self, *_):
+        student = Student.objects.create(
+            name="Ada", email="ada@example.edu", password="x", mobile="1", college="C", passout_year=2026, branch="CS"
+        )
+
+        self._evaluate("int main() { error }", student)
+        self.assertEqual(self.judge0.client.post.call_count, 1)  # no probe: all 5 at once
+        self._evaluate(CPP_DOUBLE + "// fixed", student)
+        self.assertEqual(self.judge0.client.post.call_count, 3)  # probe, then the rest
+        self._evaluate(CPP_DOUBLE, student)
+        self.assertEqual(self.judge0.client.post.call_count, 4)
+
+
+@unittest.skipUnless(toolchain_available("cpp"), "g++ not installed")
+class BuildCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp(prefix="builds_")
+        self.addCleanup(lambda: shutil.rmtree(self.root, ignore_errors=True))
+
+    def test_compiles_once_per_source(self):
+        cache = BuildCache(root=self.root)
+        artifact, error, cached = cache.build("cpp", CPP_DOUBLE)
+        again = cache.build("cpp", CPP_DOUBLE)
+
+        self.assertEqual((error, cached), (None, False))
+        self.assertEqual(again, (artifact, None, True))
+
+    def test_compile_errors_are_cached_without_staging_paths(self):
+        cache = BuildCache(root=self.root)
+        _, error, _ = cache.build("cpp", "int main() { x }")
+        _, cached_error, cached = cache.build("cpp", "int main() { x }")
+
+        self.assertIn("main.cpp", error)
+        self.assertNotIn(".build-", error)
+        self.assertEqual((cached_error, cached), (error, True))
+
+    def test_prunes_least_recently_used_entries(self):
+        cache = BuildCache(root=self.root, max_entries=2)
+        for n in range(3):
+            cache.build("cpp", f"int main() {{ return {n}; }}")
+
+        self.assertEqual(len([d for d in os.listdir(self.root) if not d.startswith(".")]), 2)
+
+    def test_executor_runs_every_case_on_one_artifact(self):
+        with patch("accounts.executor.BuildCache", lambda: BuildCache(root=self.root)):
+            results = LocalCodeExecutor().execute_code(
+                "cpp", CPP_DOUBLE, [{"stdin": "2", "expected_output": "4"}, {"stdin": "3", "expected_output": "7"}]
+            )
+
+        self.assertEqual([r["status"] for r in results], ["Accepted", "Wrong Answer"])
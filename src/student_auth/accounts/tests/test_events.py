@@ -0,0 +1,112 @@
+import json
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts import events
+from accounts.models import Contest, ContestAttempt, Problem, Student, Submission
+
+
+class FakePubSub:
+    def __init__(self, messages):
+        self.messages = list(messages)
+        self.channels = []
+
+    async def subscribe(self, name):
+        self.channels.append(name)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=None):
+        if not self.messages:
+            return None
+        return {"type": "message", "data": json.dumps(self.messages.pop(0))}
+
+    async def aclose(self):
+        pass
+
+
+class FakeRedis:
+    def __init__(self, pubsub):
+        self._pubsub = pubsub
+
+    def pubsub(self):
+        return self._pubsub
+
+    async def aclose(self):
+        pass
+
+
+def parse(body):
+    """SSE body -> [(event, data)] for the non-comment frames with data."""
+    frames = []
+    for frame in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in frame.splitlines() if not line.startswith(":"))
+        if "data" in fields:
+            frames.append((fields.get("event"), json.loads(fields["data"])))
+    return frames
+
+
+class SubmissionEventsTests(TestCase):
+    def setUp(self):
+        contest = Contest.objects.create(name="Events", start_at=timezone.now())
+        self.problem = Problem.objects.create(contest=contest, code="E1", title="Echo")
+        self.sub = Submission.objects.create(problem=self.problem, code="print(1)", language="python")
+
+    async def _stream(self):
+        resp = await self.async_client.get(f"/api/submissions/{self.sub.id}/events/")
+        self.assertEqual(resp["Content-Type"], "text/event-stream")
+        return parse("".join([chunk.decode() async for chunk in resp.streaming_content]))
+
+    def test_status_changes_publish_after_commit(self):
+        with patch("accounts.events.publish") as publish:
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                self.sub.status = Submission.Status.RUNNING
+                self.sub.save(update_fields=["status", "updated_at"])
+                self.sub.save(update_fields=["judge0_tokens", "updated_at"])
+            publish.assert_not_called()
+
+            for callback in callbacks:
+                callback()
+
+        publish.assert_called_once_with(
+            self.sub.id, {"type": "status", "status": "RUNNING", "score": 0, "max_score": 0}
+        )
+
+    @override_settings(SUBMISSION_EVENTS_REDIS_URL="")
+    async def test_without_redis_the_stream_sends_the_state_and_closes(self):
+        frames = await self._stream()
+
+        self.assertEqual(frames, [("status", {"type": "status", "status": "QUEUED", "score": 0.0, "max_score": 0.0})])
+
+    @override_settings(SUBMISSION_EVENTS_REDIS_URL="redis://events.invalid:6379/0")
+    async def test_stream_relays_events_until_done(self):
+        pubsub = FakePubSub(
+            [
+                {"type": "status", "status": "RUNNING", "score": 0, "max_score": 0},
+                {"type": "case", "index": 0, "status": "Accepted", "passed": True},
+                {"type": "status", "status": "DONE", "score": 1, "max_score": 1},
+                {"type": "case", "index": 1, "status": "late", "passed": False},
+            ]
+        )
+        with patch("redis.asyncio.Redis.from_url", return_value=FakeRedis(pubsub)):
+            frames = await self._stream()
+
+        self.assertEqual(pubsub.channels, [events.channel(self.sub.id)])
+        self.assertEqual([name for name, _ in frames], ["status", "status", "case", "status"])
+        self.assertEqual(frames[-1][1]["status"], "DONE")
+
+    def test_problem_page_uses_the_stream_only_when_enabled(self):
+        student = Student.objects.create(
+            name="Ada", email="ada@example.edu", password="x", mobile="1", college="C", passout_year=2026, branch="CS"
+        )
+        ContestAttempt.objects.create(student=student, contest=self.problem.contest)
+        session = self.client.session
+        session["student_id"] = student.id
+        session.save()
+        url = reverse("problem_detail", args=[self.problem.id])
+
+        with override_settings(SUBMISSION_EVENTS_ENABLED=False):
+            self.assertContains(self.client.get(url), "const SUBMISSION_EVENTS = false;")
+        with override_settings(SUBMISSION_EVENTS_ENABLED=True):
+            self.assertContains(self.client.get(url), "const SUBMISSION_EVENTS = true;")
@@ -0,0 +1,103 @@
+import os
+import subprocess
+import sys
+import time
+import unittest
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from accounts.executor import LocalCodeExecutor, get_runner_pool, resource
+
+
+class LocalCodeExecutorTests(SimpleTestCase):
+    backend = "subprocess"
+
+    def executor(self, **kwargs):
+        return LocalCodeExecutor(backend=self.backend, **kwargs)
+
+    def test_results_keep_case_order_and_verdicts(self):
+        code = "n = int(input())\nprint(n * 2 if n != 3 else 0)\n"
+        cases = [{"stdin": str(n), "expected_output": str(n * 2)} for n in range(6)]
+
+        results = self.executor(max_workers=4).execute_python_code(code, cases)
+
+        self.assertEqual([r["index"] for r in results], list(range(6)))
+        self.assertEqual(
+            [r["status"] for r in results],
+            ["Accepted"] * 3 + ["Wrong Answer"] + ["Accepted"] * 2,
+        )
+        self.assertEqual(results[4]["output"], "8")
+
+    def test_runtime_error_and_timeout(self):
+        executor = self.executor(timeout=1)
+        crash = executor.execute_python_code("raise SystemExit(3)", [{"stdin": ""}])[0]
+        self.assertEqual((crash["status"], crash["exit_code"]), ("Runtime Error", 3))
+
+        started = time.monotonic()
+        hang = executor.execute_python_code("import time\ntime.sleep(30)", [{"stdin": ""}])[0]
+        self.assertEqual(hang["status"], "Time Limit Exceeded")
+        self.assertLess(time.monotonic() - started, 10)
+
+    @unittest.skipIf(resource is None or sys.platform == "win32", "needs POSIX rusage")
+    def test_measures_cpu_time_and_memory(self):
+        code = "x = bytearray(64 * 1024 * 1024)\nsum(range(2_000_000))\nprint('ok')\n"
+        result = self.executor().execute_python_code(code, [{"stdin": "", "expected_output": "ok"}])[0]
+
+        self.assertEqual(result["status"], "Accepted")
+        self.assertGreater(result["time_ms"], 10)
+        self.assertGreater(result["memory_kb"], 64 * 1024)
+
+    @unittest.skipIf(resource is None or sys.platform == "win32", "needs RLIMIT_AS")
+    def test_memory_limit_is_enforced(self):
+        code = "x = bytearray(512 * 1024 * 1024)\nprint('ok')\n"
+        result = self.executor(memory_limit_mb=128).execute_python_code(code, [{"stdin": ""}])[0]
+
+        self.assertEqual(result["status"], "Memory Limit Exceeded")
+
+
+@unittest.skipIf(resource is None or not hasattr(os, "fork"), "needs fork()")
+class WarmRunnerExecutorTests(LocalCodeExecutorTests):
+    backend = "warm"
+
+    def tearDown(self):
+        get_runner_pool(1).close()
+
+    def test_cases_do_not_share_interpreter_state(self):
+        code = "import math\nprint(hasattr(math, 'leak'))\nmath.leak = 1\n"
+        results = self.executor(max_workers=1).execute_python_code(
+            code, [{"stdin": "", "expected_output": "False"}] * 3
+        )
+
+        self.assertEqual([r["status"] for r in results], ["Accepted"] * 3)
+
+    def test_syntax_error_is_a_runtime_error(self):
+        result = self.executor().execute_python_code("def f(:\n", [{"stdin": ""}])[0]
+
+        self.assertEqual(result["status"], "Runtime Error")
+        self.assertIn("SyntaxError", result["stderr"])
+
+
+@unittest.skipIf(resource is None or sys.platform == "win32", "needs POSIX rusage")
+class SpawnTests(SimpleTestCase):
+    def test_children_are_spawned_without_preexec_fn(self):
+        with patch("accounts.executor.subprocess.Popen", wraps=subprocess.Popen) as popen:
+            result = LocalCodeExecutor(backend="subprocess").execute_python_code("print(1)", [{"stdin": ""}])[0]
+
+        self.assertEqual(result["output"], "1")
+        argv = popen.call_args.args[0]
+        self.assertEqual(argv[:2], ["/bin/sh", "-c"])
+        self.assertIn("ulimit -t", argv[2])
+        self.assertNotIn("preexec_fn", popen.call_args.kwargs)
+
+    def test_timer_tolerates_a_child_that_is_already_gone(self):
+        errors = []
+        with patch("accounts.executor.os.kill", side_effect=ProcessLookupError), patch(
+            "threading.excepthook", side_effect=errors.append
+        ):
+            result = LocalCodeExecutor(backend="subprocess", timeout=0.5).execute_python_code(
+                "import time\ntime.sleep(1.5)", [{"stdin": ""}]
+            )[0]
+
+        self.assertEqual(result["status"], "Time Limit Exceeded")
+        self.assertEqual(errors, [])
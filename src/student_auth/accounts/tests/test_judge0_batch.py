@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.test import SimpleTestCase, override_settings
+
+from accounts.tasks import _create_judge0_batch
+
+
+def _response(payload, status=201):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.json.return_value = payload
+    if status >= 400:
+        resp.raise_for_status.side_effect = requests.HTTPError(response=resp)
+    return resp
+
+
+@override_settings(JUDGE0_MAX_BATCH_SIZE=2)
+class CreateJudge0BatchTests(SimpleTestCase):
+    def _payloads(self, n):
+        return [{"source_code": "print(1)", "language_id": 71, "stdin": str(i)} for i in range(n)]
+
+    @patch("accounts.tasks.get_client")
+    def test_chunks_to_max_batch_size_and_keeps_order(self, get_client):
+        post = get_client.return_value.post
+        post.side_effect = [
+            _response([{"token": "t0"}, {"token": "t1"}]),
+            _response([{"token": "t2"}, {"token": "t3"}]),
+            _response([{"token": "t4"}]),
+        ]
+
+        tokens = _create_judge0_batch("http://judge0", self._payloads(5))
+
+        self.assertEqual(tokens, ["t0", "t1", "t2", "t3", "t4"])
+        self.assertEqual(post.call_count, 3)
+        for call in post.call_args_list:
+            self.assertIn("/submissions/batch", call.args[0])
+            self.assertLessEqual(len(call.kwargs["json"]["submissions"]), 2)
+            # The pooled client's (connect, read) default applies
+            self.assertNotIn("timeout", call.kwargs)
+
+    @patch("accounts.tasks.get_client")
+    def test_only_rejected_items_fall_back_to_single_creation(self, get_client):
+        post = get_client.return_value.post
+        post.side_effect = [
+            _response([{"token": "t0"}, {"language_id": ["can't be blank"]}]),
+            _response({"token": "single-1"}),
+        ]
+
+        tokens = _create_judge0_batch("http://judge0", self._payloads(2))
+
+        self.assertEqual(tokens, ["t0", "single-1"])
+        single_call = post.call_args_list[1]
+        self.assertNotIn("/batch", single_call.args[0])
+        self.assertEqual(single_call.kwargs["json"]["stdin"], "1")
+
+    @patch("accounts.tasks.get_client")
+    def test_failed_chunk_is_retried_per_case(self, get_client):
+        post = get_client.return_value.post
+        post.side_effect = [
+            requests.ConnectionError("boom"),
+            _response({"token": "a"}),
+            _response({}, status=422),
+        ]
+
+        tokens = _create_judge0_batch("http://judge0", self._payloads(2))
+
+        self.assertEqual(tokens, ["a", None])
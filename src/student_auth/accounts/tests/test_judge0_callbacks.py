@@ -0,0 +1,134 @@
+import base64
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.core.files.base import ContentFile
+from django.test import Client, TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import Contest, Problem, Submission, TestCase as TCModel
+from accounts.tasks import (
+    _judge0_callback_url,
+    evaluate_submission,
+    sweep_judge0_callbacks,
+)
+
+
+def _response(payload):
+    resp = MagicMock()
+    resp.status_code = 201
+    resp.json.return_value = payload
+    return resp
+
+
+def _b64(text):
+    return base64.b64encode(text.encode("utf-8")).decode("ascii")
+
+
+@override_settings(JUDGE0_CALLBACK_BASE_URL="http://web:8000")
+class Judge0CallbackModeTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp(prefix="media_")
+        self.addCleanup(lambda: shutil.rmtree(media, ignore_errors=True))
+        settings_override = override_settings(MEDIA_ROOT=media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        contest = Contest.objects.create(
+            name="Callback Contest",
+            start_at=timezone.now() - timedelta(minutes=5),
+            duration_minutes=60,
+            is_active=True,
+        )
+        self.problem = Problem.objects.create(
+            contest=contest, code="P1", title="Echo", description="echo"
+        )
+        tc = TCModel.objects.create(problem=self.problem, language="python")
+        cases = [
+            {"stdin": "1", "expected_output": "1", "weight": 1},
+            {"stdin": "2", "expected_output": "2", "weight": 2},
+        ]
+        tc.file.save("cases.json", ContentFile(json.dumps({"test_cases": cases})), save=True)
+        self.sub = Submission.objects.create(
+            problem=self.problem, code="print(input())", language="python"
+        )
+        self.client = Client()
+
+    @patch("accounts.tasks._check_judge0_connectivity", return_value=(True, None))
+    @patch("accounts.tasks.get_client")
+    def _enqueue(self, get_client, _health):
+        get_client.return_value.post.return_value = _response([{"token": "a"}, {"token": "b"}])
+        evaluate_submission.apply(args=[str(self.sub.id)])
+        return get_client.return_value
+
+    def _callback(self, index, stdout, sig=None):
+        url = _judge0_callback_url("", self.sub.id, index)
+        if sig is not None:
+            url = url.split("?")[0] + f"?sig={sig}"
+        body = {"status": {"id": 3, "description": "Accepted"}, "stdout": _b64(stdout), "time": "0.01", "memory": 900}
+        return self.client.put(url, data=json.dumps(body), content_type="application/json")
+
+    def test_enqueue_returns_without_polling(self):
+        client = self._enqueue()
+
+        client.get.assert_not_called()
+        payload = client.post.call_args.kwargs["json"]["submissions"]
+        self.assertTrue(payload[1]["callback_url"].startswith("http://web:8000/api/judge0/callback/"))
+        self.sub.refresh_from_db()
+        self.assertEqual(self.sub.status, Submission.Status.RUNNING)
+        self.assertEqual(self.sub.judge0_tokens, ["a", "b"])
+        self.assertEqual(list(self.sub.results.values_list("status", flat=True)), ["Pending", "Pending"])
+
+    def test_last_callback_finalizes_submission(self):
+        self._enqueue()
+
+        self.assertEqual(self._callback(0, "1\n").status_code, 200)
+        self.sub.refresh_from_db()
+        self.assertEqual(self.sub.status, Submission.Status.RUNNING)
+
+        self._callback(1, "wrong")
+        self.sub.refresh_from_db()
+        self.assertEqual(self.sub.status, Submission.Status.DONE)
+        self.assertEqual((self.sub.score, self.sub.max_score), (1.0, 3.0))
+        first = self.sub.results.get(index=0)
+        self.assertEqual((first.output, first.passed, first.memory_kb), ("1", True, 900))
+
+    def test_status_reports_progress_before_the_last_case(self):
+        self._enqueue()
+        self._callback(1, "wrong")
+
+        progress = self.client.get(f"/api/submissions/{self.sub.id}/").json()["progress"]
+        self.assertEqual(progress, {"completed": 1, "total": 2, "score": 0.0, "max_score": 3.0, "first_failed": 1})
+
+        self._callback(0, "1\n")
+        progress = self.client.get(f"/api/submissions/{self.sub.id}/").json()["progress"]
+        self.assertEqual((progress["completed"], progress["score"]), (2, 1.0))
+
+    def test_bad_signature_is_rejected(self):
+        self._enqueue()
+
+        self.assertEqual(self._callback(0, "1", sig="forged").status_code, 403)
+        self.assertEqual(self.sub.results.get(index=0).status, "Pending")
+
+    @override_settings(JUDGE0_CALLBACK_TIMEOUT_S=0)
+    @patch("accounts.tasks.get_client")
+    def test_sweeper_recovers_lost_callbacks(self, get_client):
+        self._enqueue()
+        self._callback(0, "1")
+        Submission.objects.filter(id=self.sub.id).update(
+            updated_at=timezone.now() - timedelta(minutes=5)
+        )
+        # Judge0 still has case 1 running: it is recorded as timed out
+        get_client.return_value.get.return_value = _response(
+            {"submissions": [{"token": "b", "status": {"id": 2, "description": "Processing"}}]}
+        )
+
+        self.assertEqual(sweep_judge0_callbacks(), 1)
+
+        self.sub.refresh_from_db()
+        self.assertEqual(self.sub.status, Submission.Status.ERROR)
+        self.assertEqual(self.sub.results.get(index=1).status, "Callback Timeout")
+        self.assertEqual(self.sub.score, 1.0)
@@ -0,0 +1,54 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.test import SimpleTestCase, override_settings
+
+from accounts.judge0_client import get_client, reset_clients
+
+
+class _AboutHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = b'{"version": "test"}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class Judge0ClientTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _AboutHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = "http://%s:%s" % self.server.server_address
+
+    def tearDown(self):
+        reset_clients()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_client_is_shared_per_base_url(self):
+        self.assertIs(get_client("http://a", ""), get_client("http://a/", ""))
+        self.assertIsNot(get_client("http://a", ""), get_client("http://b", ""))
+
+    @override_settings(JUDGE0_AUTH_TOKEN="secret")
+    def test_explicit_url_still_uses_the_configured_token_and_breaker(self):
+        client = get_client("http://a")
+
+        self.assertEqual(client.session.headers["X-Auth-Token"], "secret")
+        self.assertIsNotNone(client.on_response)
+
+    def test_connections_are_reused_across_requests(self):
+        client = get_client(self.url, "")
+        for _ in range(5):
+            client.get("/about").raise_for_status()
+
+        stats = client.stats()
+        self.assertEqual(stats["requests"], 5)
+        self.assertEqual(stats["connections_opened"], 1)
+        self.assertEqual(stats["connections_reused"], 4)
@@ -0,0 +1,52 @@
+from unittest.mock import MagicMock, patch
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from accounts import judge0_health
+from accounts.judge0_client import Judge0Client
+
+
+@override_settings(JUDGE0_BREAKER_FAILURE_THRESHOLD=2, JUDGE0_BREAKER_COOLDOWN_S=30)
+class Judge0CircuitBreakerTests(SimpleTestCase):
+    def setUp(self):
+        cache.delete(judge0_health.CACHE_KEY)
+        judge0_health._local.update(state=None, read_at=0.0)
+
+    def test_opens_after_consecutive_failures(self):
+        judge0_health.record_failure("refused")
+        self.assertEqual(judge0_health.is_available(), (True, None))
+
+        judge0_health.record_failure("refused")
+        ok, error = judge0_health.is_available()
+        self.assertFalse(ok)
+        self.assertEqual(error, "refused")
+
+    def test_half_open_after_cooldown_then_success_closes(self):
+        judge0_health.record_failure("down")
+        judge0_health.record_failure("down")
+
+        with patch("accounts.judge0_health.time.time", return_value=judge0_health.time.time() + 31):
+            self.assertEqual(judge0_health.get_state()["state"], "half_open")
+            self.assertTrue(judge0_health.is_available()[0])
+
+        judge0_health.record_success()
+        state = judge0_health.get_state()
+        self.assertEqual(state["state"], "closed")
+        self.assertEqual(state["failures"], 0)
+
+    def test_client_requests_update_state_passively(self):
+        client = Judge0Client("http://judge0.invalid")
+        client.on_response = judge0_health.record_response
+        client.session.request = MagicMock(side_effect=requests.ConnectionError("refused"))
+
+        for _ in range(2):
+            with self.assertRaises(requests.ConnectionError):
+                client.get("/about")
+
+        self.assertEqual(judge0_health.get_state()["state"], "open")
+
+        client.session.request = MagicMock(return_value=MagicMock(status_code=200))
+        client.get("/submissions/batch")
+        self.assertEqual(judge0_health.get_state()["state"], "closed")
@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+from accounts.tasks import JUDGE0_POLL_FIELDS, _poll_judge0_results
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    def monotonic(self):
+        return self.now
+
+
+class FakeJudge0:
+    """Batch GET endpoint where each token finishes at its own (fake) time."""
+
+    def __init__(self, clock, done_at):
+        self.clock = clock
+        self.done_at = done_at
+        self.requests = []
+
+    def get(self, path, params=None, timeout=None):
+        tokens = params["tokens"].split(",")
+        self.requests.append({"path": path, "tokens": tokens, "fields": params.get("fields")})
+        items = []
+        for token in tokens:
+            if self.clock.now >= self.done_at[token]:
+                items.append(
+                    {
+                        "token": token,
+                        "status": {"id": 3, "description": "Accepted"},
+                        "stdout": f"out-{token}",
+                        "time": "0.01",
+                        "memory": 100,
+                    }
+                )
+            else:
+                items.append({"token": token, "status": {"id": 2, "description": "Processing"}})
+        resp = MagicMock()
+        resp.json.return_value = {"submissions": items}
+        return resp
+
+
+@override_settings(
+    JUDGE0_POLL_MIN_DELAY_S=0.2,
+    JUDGE0_POLL_MAX_DELAY_S=2.0,
+    JUDGE0_POLL_BACKOFF=2.0,
+    JUDGE0_POLL_TIMEOUT_S=60,
+    JUDGE0_MAX_BATCH_SIZE=20,
+)
+class AdaptivePollingTests(SimpleTestCase):
+    def _poll(self, done_at, tokens, **kwargs):
+        clock = FakeClock()
+        judge0 = FakeJudge0(clock, done_at)
+        with patch("accounts.tasks.time.sleep", clock.sleep), patch(
+            "accounts.tasks.time.monotonic", clock.monotonic
+        ), patch("accounts.tasks.get_client", return_value=judge0):
+            results, poll_metrics = _poll_judge0_results("http://judge0", tokens, **kwargs)
+        return results, poll_metrics, judge0, clock
+
+    def test_only_pending_tokens_are_requested(self):
+        done_at = {"a": 0.1, "b": 1.0, "c": 5.0}
+        results, poll_metrics, judge0, _ = self._poll(done_at, ["a", "b", "c"])
+
+        self.assertEqual([r["stdout"] for r in results], ["out-a", "out-b", "out-c"])
+        # Once a token is final it is never asked for again
+        self.assertEqual(
+            [r["tokens"] for r in judge0.requests],
+            [["a", "b", "c"], ["b", "c"], ["b", "c"], ["b", "c"], ["c"], ["c"], ["c"]],
+        )
+        self.assertTrue(all(r["fields"] == JUDGE0_POLL_FIELDS for r in judge0.requests))
+        self.assertEqual(poll_metrics["requests"], len(judge0.requests))
+
+    def test_backoff_is_seeded_by_expected_runtime_and_capped(self):
+        _, _, _, clock = self._poll({"a": 10.0}, ["a"], expected_runtime_s=0.5)
+
+        self.assertEqual(clock.sleeps[:3], [0.5, 1.0, 2.0])
+        self.assertTrue(all(s <= 2.0 for s in clock.sleeps))
+
+    def test_missing_tokens_and_callback(self):
+        seen = []
+        results, _, judge0, _ = self._poll(
+            {"a": 0.0}, [None, "a"], on_result=lambda i, item: seen.append(i)
+        )
+
+        self.assertIsNone(results[0])
+        self.assertEqual(results[1]["stdout"], "out-a")
+        self.assertEqual(seen, [1])
+        self.assertEqual(len(judge0.requests), 1)
+
+    def test_gives_up_after_timeout(self):
+        results, _, _, _ = self._poll({"a": 1e9}, ["a"], timeout_s=5)
+
+        self.assertEqual(results, [None])
@@ -0,0 +1,243 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts import standings
+from accounts.models import Contest, LeaderboardEntry, Problem, Student, UserSolution
+from accounts.views import _leaderboard_cache_stats
+
+
+def make_student(n):
+    return Student.objects.create(
+        name=f"S{n}", email=f"s{n}@example.com", password="x", mobile="1", college="c", passout_year=2025, branch="CS"
+    )
+
+
+class StandingsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.start = timezone.now() - timedelta(hours=1)
+        self.contest = Contest.objects.create(name="LB", start_at=self.start, duration_minutes=180)
+        self.p1 = Problem.objects.create(contest=self.contest, code="A", title="A")
+        self.p2 = Problem.objects.create(contest=self.contest, code="B", title="B")
+
+    def _solve(self, student, problem, minutes, best_ms):
+        return UserSolution.objects.create(
+            student=student,
+            problem=problem,
+            is_solved=True,
+            solved_at=self.start + timedelta(minutes=minutes),
+            best_time_ms=best_ms,
+        )
+
+    def test_solutions_keep_the_entry_current(self):
+        s = make_student(1)
+        self._solve(s, self.p1, 10, 300.0)
+        us = self._solve(s, self.p2, 20, 200.0)
+
+        entry = LeaderboardEntry.objects.get(contest=self.contest, student=s)
+        self.assertEqual((entry.solved, entry.total_best_time_ms, entry.total_time_s), (2, 500.0, 1800.0))
+
+        us.best_time_ms = 50.0
+        us.save()
+        entry.refresh_from_db()
+        self.assertEqual(entry.total_best_time_ms, 350.0)
+
+        UserSolution.objects.filter(student=s).delete()
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+    def test_unsolved_attempts_do_not_create_entries(self):
+        UserSolution.objects.create(student=make_student(1), problem=self.p1, attempts=3)
+
+        self.assertFalse(LeaderboardEntry.objects.exists())
+
+    def test_only_ranking_fields_refresh_the_standing(self):
+        us = self._solve(make_student(1), self.p1, 10, 300.0)
+
+        with patch("accounts.standings.refresh_entry") as refresh:
+            us.attempts += 1
+            us.save(update_fields=["attempts"])
+            us.best_code = "print(1)"
+            us.save()
+            UserSolution.objects.get(pk=us.pk).save()
+            refresh.assert_not_called()
+
+            us.best_time_ms = 100.0
+            us.save()
+            refresh.assert_called_once_with(self.contest.id, us.student_id)
+
+    def test_ties_share_a_rank_across_pages(self):
+        students = [make_student(n) for n in range(4)]
+        self._solve(students[0], self.p1, 5, 100.0)
+        self._solve(students[0], self.p2, 6, 100.0)
+        for s in students[1:3]:
+            self._solve(s, self.p1, 10, 100.0)
+        self._solve(students[3], self.p1, 10, 900.0)
+
+        full = standings.ranked(self.contest)
+        page = standings.ranked(self.contest, offset=2, limit=2)
+
+        self.assertEqual([r["rank"] for r in full], [1, 2, 2, 4])
+        self.assertEqual(page, full[2:])
+
+    def test_reads_do_not_scan_solutions(self):
+        for n in range(20):
+            self._solve(make_student(n), self.p1, n, 100.0 + n)
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = standings.ranked(self.contest, offset=5, limit=5)
+
+        self.assertEqual([r["name"] for r in rows], ["S5", "S6", "S7", "S8", "S9"])
+        self.assertEqual(len(queries), 2)
+        self.assertNotIn("usersolution", " ".join(q["sql"] for q in queries.captured_queries).lower())
+
+    def test_rebuild_matches_incremental_updates(self):
+        for n in range(3):
+            self._solve(make_student(n), self.p1 if n else self.p2, n * 7, 10.0 * n)
+        before = standings.ranked(self.contest)
+
+        LeaderboardEntry.objects.all().delete()
+        self.assertEqual(standings.rebuild(self.contest), 3)
+
+        self.assertEqual(standings.ranked(self.contest), before)
+
+    def test_api_pages_with_total(self):
+        for n in range(3):
+            self._solve(make_student(n), self.p1, n, 100.0 + n)
+
+        resp = Client().get("/api/leaderboard/", {"contest_id": self.contest.id, "offset": 1, "limit": 1})
+
+        data = resp.json()
+        self.assertEqual((data["total"], len(data["leaderboard"])), (3, 1))
+        self.assertEqual((data["leaderboard"][0]["name"], data["leaderboard"][0]["rank"]), ("S1", 2))
+
+    def test_solves_before_the_start_add_no_time(self):
+        self._solve(make_student(1), self.p1, -30, 10.0)
+
+        self.assertEqual(standings.ranked(self.contest)[0]["total_time_s"], 0.0)
+
+    @override_settings(ADMIN_LEADERBOARD_PAGE_SIZE=2)
+    def test_admin_page_is_paginated(self):
+        for n in range(5):
+            self._solve(make_student(n), self.p1, n, 100.0 + n)
+        client = Client()
+        client.force_login(get_user_model().objects.create_user("staff", password="x", is_staff=True))
+
+        resp = client.get(f"/admin_dashboard/leaderboard/{self.contest.id}/", {"page": 3})
+
+        self.assertEqual([r["name"] for r in resp.context["rows"]], ["S4"])
+        self.assertEqual((resp.context["pages"], resp.context["next_page"]), (3, None))
+
+    def test_iter_ranked_matches_ranked_with_small_chunks(self):
+        for n in range(7):
+            self._solve(make_student(n), self.p1, n, 100.0 + n // 2)
+
+        rows = list(standings.iter_ranked(self.contest, chunk_size=2))
+
+        self.assertEqual(rows, standings.ranked(self.contest))
+
+    def test_csv_export_streams_per_problem_columns(self):
+        a, b = make_student(1), make_student(2)
+        self._solve(a, self.p1, 10, 300.0)
+        self._solve(a, self.p2, 20, 200.0)
+        self._solve(b, self.p2, 5, 900.0)
+        client = Client()
+        client.force_login(get_user_model().objects.create_user("staff", password="x", is_staff=True))
+
+        resp = client.get(f"/admin_dashboard/leaderboard/{self.contest.id}/csv/", {"per_problem": "1"})
+
+        self.assertTrue(resp.streaming)
+        lines = b"".join(resp.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0].split(",")[-4:], ["A Solve Time (s)", "A Best Time (ms)", "B Solve Time (s)", "B Best Time (ms)"])
+        self.assertEqual(lines[1].split(",")[-4:], ["600.0", "300.0", "1200.0", "200.0"])
+        self.assertEqual(lines[2].split(",")[-4:], ["", "", "300.0", "900.0"])
+
+
+class OverallStandingsTests(TestCase):
+    def test_pages_rank_ties_and_unsolved_students(self):
+        start = timezone.now() - timedelta(hours=1)
+        contest = Contest.objects.create(name="All", start_at=start)
+        problem = Problem.objects.create(contest=contest, code="A", title="A")
+        students = [make_student(n) for n in range(4)]
+        for s in students[:3]:
+            UserSolution.objects.create(student=s, problem=problem, is_solved=True, solved_at=start)
+
+        full = standings.overall()
+        page = standings.overall(offset=1, limit=3)
+
+        self.assertEqual([r["rank"] for r in full], [1, 1, 1, 4])
+        self.assertEqual(page, full[1:])
+
+
+class LeaderboardApiCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.start = timezone.now() - timedelta(hours=1)
+        self.contest = Contest.objects.create(name="Cached", start_at=self.start)
+        self.problem = Problem.objects.create(contest=self.contest, code="A", title="A")
+        self.client = Client()
+
+    def _solve(self, n):
+        with self.captureOnCommitCallbacks(execute=True):
+            UserSolution.objects.create(
+                student=make_student(n), problem=self.problem, is_solved=True, solved_at=self.start, best_time_ms=1.0
+            )
+
+    def _get(self, **headers):
+        return self.client.get("/api/leaderboard/", {"contest_id": self.contest.id}, headers=headers)
+
+    def test_unchanged_board_costs_no_queries(self):
+        self._solve(1)
+        first = self._get()
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self._get()
+            not_modified = self._get(if_none_match=first["ETag"])
+
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(cached.content, first.content)
+        self.assertEqual((not_modified.status_code, not_modified["ETag"]), (304, first["ETag"]))
+        self.assertEqual(_leaderboard_cache_stats()["hit_ratio"], round(2 / 3, 4))
+
+    def test_a_new_solve_changes_the_etag(self):
+        self._solve(1)
+        first = self._get()
+
+        self._solve(2)
+        second = self._get(if_none_match=first["ETag"])
+
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertEqual(len(second.json()["leaderboard"]), 2)
+
+    def test_an_unsolved_attempt_keeps_the_etag(self):
+        self._solve(1)
+        student = make_student(2)
+        first = self._get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            us = UserSolution.objects.create(student=student, problem=self.problem, attempts=1)
+            us.attempts += 1
+            us.save()
+            # Refreshes the standing, which does not move
+            us.best_time_ms = 5.0
+            us.save()
+
+        self.assertEqual(self._get(if_none_match=first["ETag"]).status_code, 304)
+
+    def test_profile_changes_reach_cached_boards(self):
+        self._solve(1)
+        self._get()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            student = Student.objects.get(email="s1@example.com")
+            student.name = "Renamed"
+            student.save()
+
+        self.assertEqual(self._get().json()["leaderboard"][0]["name"], "Renamed")
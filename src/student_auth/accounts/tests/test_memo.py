@@ -0,0 +1,128 @@
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts import memo
+from accounts.models import Contest, Problem, Submission, TestCase as TCModel
+from accounts.tasks import evaluate_submission
+
+
+class EchoJudge0:
+    """Echo program: every case's stdout is its stdin."""
+
+    def __init__(self):
+        self.created = []
+        self.status = {"id": 3, "description": "Accepted"}
+        self.client = MagicMock()
+        self.client.post.side_effect = self.post
+        self.client.get.side_effect = self.get
+
+    def post(self, path, json=None, **kwargs):
+        start = len(self.created)
+        self.created.extend(json["submissions"])
+        resp = MagicMock(status_code=201)
+        resp.json.return_value = [{"token": f"t{start + i}"} for i in range(len(json["submissions"]))]
+        return resp
+
+    def get(self, path, params=None, **kwargs):
+        items = [
+            {
+                "token": token,
+                "status": self.status,
+                "stdout": self.created[int(token[1:])]["stdin"],
+                "time": "0.01",
+            }
+            for token in params["tokens"].split(",")
+        ]
+        resp = MagicMock(status_code=200)
+        resp.json.return_value = {"submissions": items}
+        return resp
+
+
+@override_settings(JUDGE0_CALLBACK_BASE_URL="", EVAL_MEMO_ENABLED=True)
+@patch("accounts.tasks.time.sleep")
+@patch("accounts.tasks._check_judge0_connectivity", return_value=(True, None))
+class EvaluationMemoTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        media = tempfile.mkdtemp(prefix="media_")
+        self.addCleanup(lambda: shutil.rmtree(media, ignore_errors=True))
+        self.enterContext(override_settings(MEDIA_ROOT=media))
+
+        contest = Contest.objects.create(name="Memo Contest", start_at=timezone.now() - timedelta(minutes=5))
+        self.problem = Problem.objects.create(contest=contest, code="P1", title="Echo")
+        self.tc = TCModel.objects.create(problem=self.problem, language="python")
+        cases = [{"stdin": "a", "expected_output": "a"}, {"stdin": "b", "expected_output": "c"}]
+        self.tc.file.save("cases.json", ContentFile(json.dumps({"test_cases": cases})), save=True)
+
+        self.judge0 = EchoJudge0()
+        self.enterContext(patch("accounts.tasks.get_client", return_value=self.judge0.client))
+
+    def _evaluate(self, code="print(input())"):
+        sub = Submission.objects.create(problem=self.problem, code=code, language="python")
+        with self.captureOnCommitCallbacks(execute=True):
+            evaluate_submission.apply(args=[str(sub.id)])
+        sub.refresh_from_db()
+        return sub
+
+    def _verdicts(self, sub):
+        return list(sub.results.order_by("index").values_list("case__stdin", "status", "passed", "output"))
+
+    def test_identical_resubmission_copies_the_earlier_results(self, *_):
+        first = self._evaluate()
+        second = self._evaluate()
+
+        self.assertEqual(len(self.judge0.created), 2)
+        self.assertEqual(second.status, Submission.Status.DONE)
+        self.assertEqual((second.score, second.max_score), (first.score, first.max_score))
+        self.assertEqual(self._verdicts(second), self._verdicts(first))
+        self.assertEqual(second.judge0_raw, {"memo": True, "source_submission": str(first.id)})
+        self.assertEqual(memo.stats()["hits"], 1)
+        self.assertEqual(memo.stats()["misses"], 1)
+
+    def test_different_source_is_evaluated(self, *_):
+        self._evaluate()
+        self._evaluate(code="print(input()) ")
+
+        self.assertEqual(len(self.judge0.created), 4)
+
+    def test_test_case_or_problem_changes_invalidate(self, *_):
+        self._evaluate()
+        self.tc.save()
+        self._evaluate()
+        self.problem.checker = "tokens"
+        self.problem.save()
+        self._evaluate()
+
+        self.assertEqual(len(self.judge0.created), 6)
+
+    def test_transient_verdicts_are_not_memoized(self, *_):
+        self.judge0.status = {"id": 5, "description": "Time Limit Exceeded"}
+        self._evaluate()
+        self.judge0.status = {"id": 3, "description": "Accepted"}
+        retried = self._evaluate()
+
+        self.assertEqual(len(self.judge0.created), 4)
+        self.assertEqual(
+            list(retried.results.order_by("index").values_list("status", flat=True)), ["Accepted", "Wrong Answer"]
+        )
+        self._evaluate()
+        self.assertEqual(len(self.judge0.created), 4)
+
+    @override_settings(EVAL_MEMO_MAX_ENTRIES=2)
+    def test_oldest_entries_are_evicted(self, *_):
+        for n in range(3):
+            sub = SimpleNamespace(id=n, status=Submission.Status.DONE, score=1.0, max_score=1.0)
+            memo.store(f"evalmemo:k{n}", sub, [])
+
+        self.assertIsNone(cache.get("evalmemo:k0"))
+        self.assertIsNotNone(cache.get("evalmemo:k2"))
+        self.assertEqual(cache.get(memo.INDEX_KEY), ["evalmemo:k1", "evalmemo:k2"])
@@ -0,0 +1,34 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from accounts import queues
+
+
+@override_settings(CELERY_TASK_DEFAULT_PRIORITY=5, EVAL_PRIORITY_INTERACTIVE=0)
+class EvaluationRoutingTests(SimpleTestCase):
+    def _options(self, language, interactive=False, available=True):
+        with patch("accounts.queues.judge0_health.is_available", return_value=(available, None)):
+            return queues.evaluation_options(language, interactive)
+
+    def test_languages_are_split_by_compile_cost(self):
+        self.assertEqual(self._options("python")["queue"], queues.EVAL_PYTHON)
+        for language in ("c", "cpp", "java"):
+            self.assertEqual(self._options(language)["queue"], queues.EVAL_COMPILED)
+
+    def test_open_breaker_routes_to_the_fallback_queue(self):
+        self.assertEqual(self._options("cpp", available=False)["queue"], queues.EVAL_FALLBACK)
+
+    def test_runs_outrank_submissions(self):
+        self.assertLess(self._options("python", interactive=True)["priority"], self._options("python")["priority"])
+
+    def test_enqueue_passes_the_route_to_celery(self):
+        from accounts.tasks import enqueue_evaluation
+
+        sub = type("Sub", (), {"id": "abc", "language": "cpp"})()
+        with patch("accounts.tasks.evaluate_submission.apply_async") as apply_async, patch(
+            "accounts.queues.judge0_health.is_available", return_value=(True, None)
+        ):
+            enqueue_evaluation(sub, interactive=True)
+
+        apply_async.assert_called_once_with(args=["abc"], queue=queues.EVAL_COMPILED, priority=0)
@@ -0,0 +1,91 @@
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Contest, Problem, Submission, TestCaseBlob as CaseBlob
+from accounts.results import result_row, save_results
+
+
+class SaveResultsTests(TestCase):
+    def setUp(self):
+        contest = Contest.objects.create(name="Results Contest", start_at=timezone.now())
+        problem = Problem.objects.create(contest=contest, code="P1", title="Echo")
+        self.sub = Submission.objects.create(problem=problem, code="print(input())", language="python")
+
+    def _save(self, n, status):
+        tests = [{"stdin": str(i), "expected_output": str(i), "weight": 2} for i in range(n)]
+        rows = [result_row(self.sub, i, t, status=status, passed=status == "Accepted") for i, t in enumerate(tests)]
+        self.sub.status = Submission.Status.DONE
+        save_results(self.sub, rows, update_fields=["status", "updated_at"])
+
+    def test_writes_all_rows_and_the_submission_in_a_few_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self._save(100, "Accepted")
+
+        # savepoint, delete, upsert (SQLite splits it by parameter count), update
+        self.assertLessEqual(len(queries), 8)
+        self.assertEqual(self.sub.results.count(), 100)
+        self.sub.refresh_from_db()
+        self.assertEqual(self.sub.status, Submission.Status.DONE)
+
+    def test_re_evaluation_overwrites_rows_and_drops_extra_ones(self):
+        self._save(3, "Accepted")
+        first = self.sub.results.get(index=0)
+        first.judge0_raw = {"stale": True}
+        first.save()
+
+        self._save(2, "Wrong Answer")
+
+        rows = list(self.sub.results.order_by("index"))
+        self.assertEqual([(r.index, r.status, r.passed) for r in rows], [(0, "Wrong Answer", False), (1, "Wrong Answer", False)])
+        self.assertEqual((rows[0].id, rows[0].judge0_raw, rows[0].weight), (first.id, {}, 2.0))
+
+    def test_case_text_is_stored_once_across_submissions(self):
+        self._save(3, "Accepted")
+        other = Submission.objects.create(problem=self.sub.problem, code="print(1)", language="python")
+        save_results(other, [result_row(other, 0, {"stdin": "0", "expected_output": "0"})], update_fields=[])
+
+        self.assertEqual(CaseBlob.objects.count(), 3)
+        self.assertEqual(other.results.get().case_id, self.sub.results.get(index=0).case_id)
+        self.assertEqual(other.results.get().stdin, "0")
+
+    def test_status_endpoint_joins_expected_output(self):
+        self._save(2, "Accepted")
+
+        resp = Client().get(reverse("submission_status", args=[self.sub.id]))
+
+        self.assertEqual([r["expected"] for r in resp.json()["results"]], ["0", "1"])
+
+
+class SubmissionStatusFieldsTests(TestCase):
+    def setUp(self):
+        contest = Contest.objects.create(name="Status Contest", start_at=timezone.now())
+        problem = Problem.objects.create(contest=contest, code="P1", title="Echo")
+        self.sub = Submission.objects.create(problem=problem, code="print(input())", language="python")
+        outcomes = [("Accepted", True), ("Accepted", False), ("Time Limit Exceeded", False), ("Skipped", False)]
+        rows = [
+            result_row(self.sub, i, {"stdin": str(i), "expected_output": str(i)}, status=status, passed=passed, output="x" * 1000)
+            for i, (status, passed) in enumerate(outcomes)
+        ]
+        self.sub.status = Submission.Status.DONE
+        save_results(self.sub, rows, update_fields=["status", "updated_at"])
+        self.url = reverse("submission_status", args=[self.sub.id])
+
+    def test_empty_fields_returns_only_the_packed_codes(self):
+        with CaptureQueriesContext(connection) as queries:
+            data = Client().get(self.url, {"fields": ""}).json()
+
+        self.assertEqual(data["cases"], "AWTS")
+        self.assertNotIn("results", data)
+        self.assertEqual(len(queries), 2)
+
+    def test_failed_cases_since_an_index_with_chosen_fields(self):
+        data = Client().get(self.url, {"fields": "index,expected", "since_index": 2, "failed": "1"}).json()
+
+        self.assertEqual(data["results"], [{"index": 2, "expected": "2"}, {"index": 3, "expected": "3"}])
+        self.assertEqual(data["cases"], "AWTS")
+
+    def test_unknown_fields_are_rejected(self):
+        self.assertEqual(Client().get(self.url, {"fields": "index,judge0_raw"}).status_code, 400)
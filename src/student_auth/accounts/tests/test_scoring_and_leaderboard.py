@@ -4,6 +4,7 @@ import shutil
 import tempfile
 from datetime import timedelta
 
+from django.core.cache import cache
 from django.test import TestCase, override_settings, Client
 from django.core.files.base import ContentFile
 from django.utils import timezone
@@ -26,6 +27,8 @@ class ScoringAndLeaderboardTests(TestCase):
     def setUp(self):
         self.tmpdir = tempfile.mkdtemp(prefix="media_")
         self.addCleanup(lambda: shutil.rmtree(self.tmpdir, ignore_errors=True))
+        # Leaderboard responses are cached per standings version
+        cache.clear()
         self.client = Client()
 
     def _create_basic_contest_problem(self):
@@ -81,8 +84,10 @@ class ScoringAndLeaderboardTests(TestCase):
         us = UserSolution.objects.get(student=student, problem=problem)
         self.assertTrue(us.is_solved)
         self.assertIsNotNone(us.solved_at)
-        # Local executor returns 100ms per test => total 200ms
-        self.assertAlmostEqual(us.best_time_ms or 0.0, 200.0, places=3)
+        # best_time_ms is the measured CPU time summed over testcases
+        total_ms = sum(r.time_ms for r in sub.results.all())
+        self.assertGreater(total_ms, 0.0)
+        self.assertAlmostEqual(us.best_time_ms or 0.0, total_ms, places=3)
 
     @override_settings(MEDIA_ROOT="/tmp/test_media_fastest")
     @patch("accounts.tasks._check_judge0_connectivity", return_value=(False, "forced"))
@@ -104,9 +109,11 @@ class ScoringAndLeaderboardTests(TestCase):
         sub1 = Submission.objects.create(student=student, problem=problem, code=code_ok, language="python")
         evaluate_submission.apply(args=[str(sub1.id)])
         us = UserSolution.objects.get(student=student, problem=problem)
-        self.assertAlmostEqual(us.best_time_ms or 0.0, 200.0, places=3)
+        first_ms = sum(r.time_ms for r in sub1.results.all())
+        self.assertAlmostEqual(us.best_time_ms or 0.0, first_ms, places=3)
 
-        # Create a synthetic faster submission: 2 testcases, 50ms each => 100ms total
+        # Create a synthetic faster submission: 2 testcases, 0.5ms each => 1ms
+        # total, below any real interpreter run
         sub2 = Submission.objects.create(student=student, problem=problem, code=code_ok, language="python")
         # Mark as evaluated with full score
         sub2.status = Submission.Status.DONE
@@ -117,17 +124,17 @@ class ScoringAndLeaderboardTests(TestCase):
         from accounts.models import SubmissionTestCaseResult
 
         SubmissionTestCaseResult.objects.create(
-            submission=sub2, index=0, group="g", weight=1.0, passed=True, status="Accepted", time_ms=50.0
+            submission=sub2, index=0, group="g", weight=1.0, passed=True, status="Accepted", time_ms=0.5
         )
         SubmissionTestCaseResult.objects.create(
-            submission=sub2, index=1, group="g", weight=1.0, passed=True, status="Accepted", time_ms=50.0
+            submission=sub2, index=1, group="g", weight=1.0, passed=True, status="Accepted", time_ms=0.5
         )
 
         # Trigger post-evaluation updates
         _post_evaluation_update(sub2)
 
         us.refresh_from_db()
-        self.assertAlmostEqual(us.best_time_ms or 0.0, 100.0, places=3)
+        self.assertAlmostEqual(us.best_time_ms or 0.0, 1.0, places=3)
         self.assertEqual(us.best_submission_id, sub2.id)
 
     @override_settings(MEDIA_ROOT="/tmp/test_media_leaderboard")
@@ -0,0 +1,145 @@
+import json
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts import checkers
+from accounts.models import Contest, Problem, Submission, TestCase as TCModel
+from accounts.tasks import evaluate_submission
+
+
+class FakeJudge0:
+    """Echo program: prints its stdin, so a case fails when stdin != expected."""
+
+    def __init__(self):
+        self.created = []
+        self.client = MagicMock()
+        self.client.post.side_effect = self.post
+        self.client.get.side_effect = self.get
+
+    def post(self, path, json=None, **kwargs):
+        tokens = []
+        for item in json["submissions"]:
+            self.created.append(item)
+            tokens.append({"token": f"t{len(self.created) - 1}"})
+        resp = MagicMock(status_code=201)
+        resp.json.return_value = tokens
+        return resp
+
+    def get(self, path, params=None, **kwargs):
+        items = []
+        for token in params["tokens"].split(","):
+            stdin = self.created[int(token[1:])]["stdin"]
+            items.append({"token": token, "status": {"id": 3, "description": "Accepted"}, "stdout": stdin})
+        resp = MagicMock(status_code=200)
+        resp.json.return_value = {"submissions": items}
+        return resp
+
+
+@override_settings(JUDGE0_MAX_BATCH_SIZE=2, JUDGE0_CALLBACK_BASE_URL="")
+@patch("accounts.tasks.time.sleep")
+@patch("accounts.tasks._check_judge0_connectivity", return_value=(True, None))
+class ShortCircuitEvaluationTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp(prefix="media_")
+        self.addCleanup(lambda: shutil.rmtree(media, ignore_errors=True))
+        settings_override = override_settings(MEDIA_ROOT=media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        contest = Contest.objects.create(
+            name="Policy Contest", start_at=timezone.now() - timedelta(minutes=5)
+        )
+        self.problem = Problem.objects.create(
+            contest=contest,
+            code="P1",
+            title="Echo",
+            evaluation_policy=Problem.EvaluationPolicy.STOP_ON_FIRST_FAILURE,
+        )
+        self.judge0 = FakeJudge0()
+        patcher = patch("accounts.tasks.get_client", return_value=self.judge0.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _evaluate(self, cases):
+        tc = TCModel.objects.create(problem=self.problem, language="python")
+        tc.file.save("cases.json", ContentFile(json.dumps({"test_cases": cases})), save=True)
+        sub = Submission.objects.create(problem=self.problem, code="print(input())", language="python")
+        evaluate_submission.apply(args=[str(sub.id)])
+        sub.refresh_from_db()
+        return sub
+
+    def test_visible_failure_skips_hidden_cases_without_submitting_them(self, *_):
+        sub = self._evaluate(
+            [
+                {"stdin": "h1", "expected_output": "h1"},
+                {"stdin": "h2", "expected_output": "h2"},
+                {"stdin": "v1", "expected_output": "v1", "is_visible": True},
+                {"stdin": "v2", "expected_output": "nope", "is_visible": True},
+            ]
+        )
+
+        self.assertEqual([c["stdin"] for c in self.judge0.created], ["v1", "v2"])
+        statuses = list(sub.results.order_by("index").values_list("case__stdin", "status"))
+        self.assertEqual(
+            statuses, [("v1", "Accepted"), ("v2", "Wrong Answer"), ("h1", "Skipped"), ("h2", "Skipped")]
+        )
+        self.assertEqual(sub.status, Submission.Status.DONE)
+        self.assertEqual((sub.score, sub.max_score), (1.0, 4.0))
+        self.assertEqual(sub.judge0_raw["skipped"], 2)
+
+    def test_skipped_case_with_empty_expected_output_scores_nothing(self, *_):
+        sub = self._evaluate(
+            [
+                {"stdin": "v", "expected_output": "nope", "is_visible": True},
+                {"stdin": "", "expected_output": ""},
+            ]
+        )
+
+        skipped = sub.results.get(status="Skipped")
+        self.assertFalse(skipped.passed)
+        self.assertEqual((sub.score, sub.max_score), (0.0, 2.0))
+
+    def test_hidden_cases_run_in_waves_until_a_failure(self, *_):
+        sub = self._evaluate(
+            [{"stdin": "v", "expected_output": "v", "is_visible": True}]
+            + [{"stdin": f"h{i}", "expected_output": "bad" if i == 2 else f"h{i}"} for i in range(6)]
+        )
+
+        # visible wave, then hidden waves of 2; the wave holding h2 is the last
+        self.assertEqual(len(self.judge0.created), 5)
+        self.assertEqual(
+            list(sub.results.filter(status="Skipped").values_list("case__stdin", flat=True)),
+            ["h3", "h4", "h5"],
+        )
+        self.assertEqual(sub.score, 3.0)
+
+    def test_checker_runs_once_per_case(self, *_):
+        judged = []
+
+        def check(output, expected, stdin):
+            judged.append(stdin)
+            return checkers.exact(output, expected, stdin)
+
+        with patch("accounts.tasks.checkers.for_problem", return_value=check):
+            self.test_hidden_cases_run_in_waves_until_a_failure()
+
+        # Cases that never finished are not judged at all
+        self.assertEqual(sorted(judged), ["h0", "h1", "h2", "v"])
+
+    def test_full_policy_runs_everything(self, *_):
+        self.problem.evaluation_policy = Problem.EvaluationPolicy.FULL
+        self.problem.save()
+
+        sub = self._evaluate(
+            [{"stdin": str(i), "expected_output": "0"} for i in range(3)]
+        )
+
+        self.assertEqual(len(self.judge0.created), 3)
+        self.assertFalse(sub.results.filter(status="Skipped").exists())
+        self.assertEqual(sub.score, 1.0)
@@ -0,0 +1,93 @@
+import json
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts import testsuite
+from accounts.models import Contest, Problem, TestCase as TCModel
+
+
+class TestSuiteStoreTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp(prefix="media_")
+        self.addCleanup(lambda: shutil.rmtree(media, ignore_errors=True))
+        settings_override = override_settings(MEDIA_ROOT=media)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        testsuite.clear_local()
+        self.addCleanup(testsuite.clear_local)
+
+        contest = Contest.objects.create(name="Suite Contest", start_at=timezone.now())
+        self.problem = Problem.objects.create(contest=contest, code="P1", title="Echo")
+        self.tc = TCModel.objects.create(problem=self.problem, language="python")
+        self.tc.file.save("cases.json", ContentFile(self._document("1")), save=True)
+
+    def _document(self, *stdins, visible=False):
+        return json.dumps(
+            {"test_cases": [{"stdin": s, "expected_output": s, "is_visible": visible} for s in stdins]}
+        )
+
+    def test_file_is_parsed_once(self):
+        with patch("accounts.testsuite._parse", wraps=testsuite._parse) as parse:
+            for _ in range(3):
+                self.assertEqual(testsuite.cases(self.tc)[0]["stdin"], "1")
+
+        self.assertEqual(parse.call_count, 1)
+
+    def test_shared_tier_serves_a_cold_process(self):
+        testsuite.cases(self.tc)
+        testsuite.clear_local()
+
+        with patch("accounts.testsuite._parse") as parse:
+            self.assertEqual(testsuite.cases(self.tc)[0]["stdin"], "1")
+        parse.assert_not_called()
+
+    def test_file_rewritten_on_disk_is_reloaded(self):
+        testsuite.cases(self.tc)
+        with open(self.tc.file.path, "w") as f:
+            f.write(self._document("1", "2"))
+
+        self.assertEqual(len(testsuite.cases(self.tc)), 2)
+
+    def test_saving_testcase_invalidates_both_tiers(self):
+        testsuite.cases(self.tc)
+
+        self.tc.save()
+
+        self.assertNotIn(self.tc.id, testsuite._local)
+        self.assertIsNone(cache.get(testsuite.CACHE_PREFIX + str(self.tc.id)))
+
+    @override_settings(TESTSUITE_LOCAL_CACHE_SIZE=1)
+    def test_local_tier_evicts_least_recently_used(self):
+        other = TCModel.objects.create(problem=self.problem, language="cpp")
+        other.file.save("more.json", ContentFile(self._document("x")), save=True)
+
+        testsuite.cases(self.tc)
+        testsuite.cases(other)
+
+        self.assertEqual(list(testsuite._local), [other.id])
+
+    def test_broken_files_raise_and_are_skipped_by_visible_cases(self):
+        with open(self.tc.file.path, "w") as f:
+            f.write("{not json")
+        shown = TCModel.objects.create(problem=self.problem, language="cpp")
+        shown.file.save("shown.json", ContentFile(self._document("v", visible=True)), save=True)
+
+        with self.assertRaises(testsuite.TestSuiteError):
+            testsuite.load(self.tc)
+        self.assertEqual([c["stdin"] for c in testsuite.visible_cases(self.problem)], ["v"])
+
+    def test_visible_testcases_endpoint_uses_the_store(self):
+        with open(self.tc.file.path, "w") as f:
+            f.write(self._document("a", visible=True))
+
+        resp = Client().get(reverse("get_visible_testcases", args=[self.problem.id]))
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json()["visible_testcases"][0]["stdin"], "a")
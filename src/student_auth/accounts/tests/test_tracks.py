@@ -0,0 +1,75 @@
+import csv
+import importlib
+import io
+
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Contest, Problem, Student, Submission
+
+
+class SubmissionTrackTests(TestCase):
+    def setUp(self):
+        self.junior = Contest.objects.create(name="SAGE Junior Contest", start_at=timezone.now())
+        self.senior = Contest.objects.create(name="SAGE Senior Contest", start_at=timezone.now())
+        self.jp = Problem.objects.create(contest=self.junior, code="J1", title="Junior one")
+        self.sp = Problem.objects.create(contest=self.senior, code="S1", title="Senior one")
+        self.student = Student.objects.create(
+            name="Ada", email="ada@example.edu", password="x", mobile="1", college="C", passout_year=2026, branch="CS"
+        )
+
+    def test_contest_track_defaults_from_the_name(self):
+        self.assertEqual(self.junior.track, Contest.Track.JUNIOR)
+        self.assertEqual(self.senior.track, Contest.Track.SENIOR)
+        other = Contest.objects.create(name="Open Round", start_at=timezone.now())
+        self.assertEqual(other.track, "")
+        explicit = Contest.objects.create(name="Open Round", start_at=timezone.now(), track=Contest.Track.SENIOR)
+        self.assertEqual(explicit.track, Contest.Track.SENIOR)
+
+    def test_new_submissions_carry_contest_and_track(self):
+        sub = Submission.objects.create(student=self.student, problem=self.jp, code="x")
+
+        self.assertEqual(sub.contest_id, self.junior.id)
+        self.assertEqual(Submission.objects.filter(track=Contest.Track.JUNIOR).get(), sub)
+
+    def test_changing_a_contest_track_moves_its_submissions(self):
+        sub = Submission.objects.create(student=self.student, problem=self.jp, code="x")
+
+        self.junior.track = Contest.Track.SENIOR
+        self.junior.save()
+
+        sub.refresh_from_db()
+        self.assertEqual(sub.track, Contest.Track.SENIOR)
+        self.assertFalse(Submission.objects.filter(track=Contest.Track.JUNIOR).exists())
+
+    def test_migration_backfills_existing_submissions(self):
+        sub = Submission.objects.create(student=self.student, problem=self.sp, code="x")
+        Submission.objects.update(contest=None, track="")
+        Contest.objects.update(track="")
+
+        migration = importlib.import_module("accounts.migrations.0019_submission_track")
+        migration.backfill_tracks(apps, None)
+
+        sub.refresh_from_db()
+        self.assertEqual((sub.contest_id, sub.track), (self.senior.id, Contest.Track.SENIOR))
+
+    def test_track_export_streams_only_that_track(self):
+        mine = Submission.objects.create(student=self.student, problem=self.jp, code="x", status="DONE", score=2)
+        Submission.objects.create(student=self.student, problem=self.jp, code="y")
+        Submission.objects.create(student=self.student, problem=self.sp, code="z", status="DONE")
+        client = Client()
+        client.force_login(User.objects.create_user("staff", password="x", is_staff=True))
+
+        url = reverse("admin_track_submissions_csv", args=["junior"])
+        response = client.get(url, {"status": "done"})
+        rows = list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+        self.assertEqual(rows[0][:3], ["Submission ID", "Created At", "Student ID"])
+        self.assertEqual([r[0] for r in rows[1:]], [str(mine.id)])
+        self.assertEqual(rows[1][5:10], ["SAGE Junior Contest", "J1", "python", "DONE", "2.0"])
+        self.assertEqual(client.get(reverse("admin_track_submissions_csv", args=["middle"])).status_code, 404)
+        self.assertEqual(client.get(url, {"contest": "junior"}).status_code, 400)
+        self.assertEqual(Client().get(url).status_code, 302)
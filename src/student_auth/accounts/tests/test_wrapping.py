@@ -0,0 +1,122 @@
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, override_settings
+
+from accounts import wrapping
+from accounts.wrapping import maybe_wrap_code
+
+PY_TEMPLATE = '''import sys
+
+
+class Solution:
+    def solve(self, n):
+        pass
+
+# --- Input/Output Handling ---
+print(Solution().solve(int(sys.stdin.readline())))
+'''
+
+CPP_TEMPLATE = """#include <bits/stdc++.h>
+using namespace std;
+
+class Solution {
+public:
+    int solve(int n) { return 0; }
+};
+
+int main() { int n; cin >> n; cout << Solution().solve(n); }
+"""
+
+
+class MaybeWrapCodeTests(SimpleTestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media.name))
+        self.dir = os.path.join(media.name, "testcases", "Spring", "P1")
+        os.makedirs(self.dir)
+        self.problem = SimpleNamespace(contest=SimpleNamespace(name="Spring"), code="P1")
+
+    def _template(self, ext, text):
+        path = os.path.join(self.dir, f"solution.{ext}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def test_python_block_replaces_the_template_stub(self):
+        self._template("py", PY_TEMPLATE)
+        code = (
+            '"""class Solution in a docstring"""\n'
+            "class Solution:\n"
+            "    def solve(self, n):\n"
+            '        return r"\\1" + "\\n" * n\n'
+        )
+
+        wrapped = maybe_wrap_code(self.problem, "python", code)
+
+        stub = "class Solution:\n    def solve(self, n):\n        pass\n"
+        self.assertEqual(wrapped, PY_TEMPLATE.replace(stub, code.split("\n", 1)[1]))
+
+    def test_python_code_that_does_not_parse_is_still_wrapped(self):
+        self._template("py", PY_TEMPLATE)
+
+        wrapped = maybe_wrap_code(self.problem, "python", "class Solution:\n    def solve(self, n)\n")
+
+        self.assertIn("def solve(self, n)\n\n# --- Input/Output Handling ---", wrapped)
+
+    def test_cpp_brace_matching_skips_nested_types_strings_and_comments(self):
+        self._template("cpp", CPP_TEMPLATE)
+        code = (
+            "// class Solution { old };\n"
+            "class Solution {\n"
+            "    struct Node { int v; };\n"
+            "public:\n"
+            '    int solve(int n) { const char* s = "}};"; /* } */ return n * 1\'000; }\n'
+            "};\n"
+            "int main() {}\n"
+        )
+
+        wrapped = maybe_wrap_code(self.problem, "cpp", code)
+
+        self.assertEqual(wrapped.count("class Solution"), 1)
+        self.assertIn("struct Node { int v; };\npublic:", wrapped)
+        self.assertIn("return n * 1'000; }\n};\n\nint main() { int n;", wrapped)
+        self.assertNotIn("int main() {}", wrapped)
+
+    def test_missing_template_or_block_returns_the_code_unchanged(self):
+        self.assertEqual(maybe_wrap_code(self.problem, "python", "print(1)"), "print(1)")
+        self._template("py", PY_TEMPLATE)
+        self.assertEqual(maybe_wrap_code(self.problem, "python", "print(1)"), "print(1)")
+        self.assertEqual(maybe_wrap_code(self.problem, "java", "class Solution {}"), "class Solution {}")
+
+    def test_template_is_read_once_until_it_changes(self):
+        path = self._template("py", PY_TEMPLATE)
+        code = "class Solution:\n    pass\n"
+
+        with patch("accounts.wrapping.open", side_effect=open, create=True) as opened:
+            maybe_wrap_code(self.problem, "python", code)
+            maybe_wrap_code(self.problem, "python", code)
+            self.assertEqual(opened.call_count, 1)
+
+            self._template("py", PY_TEMPLATE.replace("import sys", "import sys, os"))
+            os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+            wrapped = maybe_wrap_code(self.problem, "python", code)
+
+        self.assertEqual(opened.call_count, 2)
+        self.assertTrue(wrapped.startswith("import sys, os"))
+
+    def test_adversarial_input_scans_linearly(self):
+        self._template("cpp", CPP_TEMPLATE)
+        code = "class Solution {" * 50_000 + "\n" + "class Solution " * 50_000
+
+        start = time.perf_counter()
+        wrapped = maybe_wrap_code(self.problem, "cpp", code)
+        span = wrapping.solution_span("x = (\n" + "class Solution:\n" * 50_000, "python")
+
+        self.assertEqual(wrapped, code)
+        self.assertEqual(span[0], 6)
+        self.assertLess(time.perf_counter() - start, 2)
@@ -0,0 +1,143 @@
+"""Parsed test-suite store.
+
+Every evaluation and problem page needs the cases from a ``TestCase`` JSON
+file. Parsing them on each request is wasted work at contest peak, when the
+same handful of files is read thousands of times a minute, so parsed suites
+are kept in two tiers:
+
+- an in-process LRU (``TESTSUITE_LOCAL_CACHE_SIZE`` entries);
+- the shared Django cache (Redis when ``DJANGO_CACHE_URL`` is set), so a fresh
+  worker does not have to hit the disk either.
+
+Entries are stamped with the file path, mtime and size: a file replaced on
+disk is simply a miss. Saving or deleting a ``TestCase`` (and
+``reindex_testcases``) drops its entries explicitly.
+
+Callers get the parsed document back and must not mutate it.
+"""
+
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import TestCase
+
+CACHE_PREFIX = "testsuite:"
+
+_lock = threading.Lock()
+_local = OrderedDict()  # testcase id -> (stamp, document)
+
+
+class TestSuiteError(Exception):
+    """A test-case file is missing, unreadable or not a JSON test suite."""
+
+
+def _local_size() -> int:
+    return int(getattr(settings, "TESTSUITE_LOCAL_CACHE_SIZE", 256))
+
+
+def _shared_ttl() -> int:
+    return int(getattr(settings, "TESTSUITE_CACHE_TTL_S", 6 * 60 * 60))
+
+
+def file_stamp(tc) -> tuple:
+    """``(path, mtime_ns, size)`` of ``tc.file``; raises ``TestSuiteError``."""
+    if not tc.file or not tc.file.name.endswith(".json"):
+        raise TestSuiteError("Invalid file path or extension")
+    path = tc.file.path
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        raise TestSuiteError(str(e)) from e
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def _parse(path: str) -> dict:
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise TestSuiteError(str(e)) from e
+    if not isinstance(data, dict):
+        raise TestSuiteError("Top-level JSON value is not an object")
+    return data
+
+
+def _remember(testcase_id, stamp, data) -> None:
+    with _lock:
+        _local[testcase_id] = (stamp, data)
+        _local.move_to_end(testcase_id)
+        while len(_local) > _local_size():
+            _local.popitem(last=False)
+
+
+def load(tc) -> dict:
+    """Parsed JSON document of ``tc.file``; raises ``TestSuiteError``."""
+    stamp = file_stamp(tc)
+
+    with _lock:
+        hit = _local.get(tc.id)
+        if hit and hit[0] == stamp:
+            _local.move_to_end(tc.id)
+            return hit[1]
+
+    try:
+        shared = cache.get(CACHE_PREFIX + str(tc.id))
+    except Exception:
+        shared = None  # a cache outage only costs a re-parse
+    if shared and tuple(shared["stamp"]) == stamp:
+        data = shared["data"]
+    else:
+        data = _parse(stamp[0])
+        try:
+            cache.set(CACHE_PREFIX + str(tc.id), {"stamp": stamp, "data": data}, _shared_ttl())
+        except Exception:
+            pass
+
+    _remember(tc.id, stamp, data)
+    return data
+
+
+def cases(tc) -> list:
+    """The ``test_cases`` array of ``tc``'s file (possibly empty)."""
+    return load(tc).get("test_cases") or []
+
+
+def visible_cases(problem) -> list:
+    """Cases marked ``is_visible`` across all of a problem's test-case files.
+
+    Unreadable files are skipped, as the problem pages always did.
+    """
+    visible = []
+    for tc in problem.testcases.all():
+        try:
+            visible.extend(case for case in cases(tc) if case.get("is_visible", False))
+        except TestSuiteError:
+            continue
+    return visible
+
+
+def invalidate(testcase_id) -> None:
+    with _lock:
+        _local.pop(testcase_id, None)
+    try:
+        cache.delete(CACHE_PREFIX + str(testcase_id))
+    except Exception:
+        pass
+
+
+def clear_local() -> None:
+    with _lock:
+        _local.clear()
+
+
+@receiver(post_save, sender=TestCase, dispatch_uid="testsuite_invalidate_on_save")
+@receiver(post_delete, sender=TestCase, dispatch_uid="testsuite_invalidate_on_delete")
+def _invalidate_testcase(sender, instance, **kwargs):
+    invalidate(instance.id)
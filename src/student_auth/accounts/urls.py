@@ -34,6 +34,11 @@ urlpatterns = [
         views.admin_leaderboard_csv,
         name="admin_leaderboard_csv",
     ),
+    path(
+        "admin_dashboard/tracks/<str:track>/submissions/csv/",
+        views.admin_track_submissions_csv,
+        name="admin_track_submissions_csv",
+    ),
     # Problem pages
     path("problems/", views.start, name="problems"),
     path("problems/<int:id>/", views.start, name="problem_detail"),
@@ -55,6 +60,16 @@ urlpatterns = [
         views.get_submission_status,
         name="submission_status",
     ),
+    path(
+        "api/submissions/<uuid:submission_id>/events/",
+        views.submission_events,
+        name="submission_events",
+    ),
+    path(
+        "api/judge0/callback/<uuid:submission_id>/<int:index>/",
+        views.judge0_callback,
+        name="judge0_callback",
+    ),
     # Problem APIs
     path(
         "api/problems/",
@@ -1,11 +1,13 @@
+import hashlib
 import json
 from django.shortcuts import render, redirect, get_object_or_404
 from django.http import Http404
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponseBadRequest
+from django.http import JsonResponse, HttpResponse, HttpResponseBadRequest, HttpResponseNotModified
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
 from django.views.decorators.csrf import csrf_exempt
 from django.db import transaction
-from django.db.models import Count, Min, Q
 from django.contrib.admin.views.decorators import staff_member_required
 from functools import wraps
 from django.core.mail import send_mail
@@ -20,9 +22,8 @@ from .models import (
     Problem,
     UserSolution,
     Submission,
+    SubmissionTestCaseResult,
     ContestAttempt,
-    JuniorSubmission,
-    SeniorSubmission,
     PracticeCategory,
     PracticeSubtopic,
     PracticeQuestion,
@@ -30,8 +31,10 @@ from .models import (
 )
 from .forms import ContestForm, ProblemForm, TestCaseFormSet
 from .utils import PasswordResetToken
-from .tasks import evaluate_submission
+from .results import pack_case_codes
+from .tasks import enqueue_evaluation
 from .stub_generator import generate_starter_code
+from . import admission, memo, metrics, progress, standings, testsuite
 
 # --------------------- Authentication Decorator ---------------------
 
@@ -500,150 +503,40 @@ def partial_evaluate(request):
 @staff_member_required
 def admin_leaderboard(request, contest_id: int):
     contest = get_object_or_404(Contest, id=contest_id)
-    # Aggregate per-student stats for this contest, mirroring the API logic
-    qs = (
-        UserSolution.objects.filter(is_solved=True, problem__contest=contest)
-        .select_related("student", "problem__contest")
-        .only("student_id", "solved_at", "problem_id", "best_time_ms")
-    )
-    agg = {}
-    for sol in qs:
-        if not sol.solved_at:
-            continue
-        sid = sol.student_id
-        if sid not in agg:
-            agg[sid] = {
-                "student": sol.student,
-                "solved": 0,
-                "total_time_s": 0.0,
-                "total_best_time_ms": 0.0,
-                "first_solve": None,
-                "points": 0,
-            }
-        agg[sid]["solved"] += 1
-        delta = (sol.solved_at - contest.start_at).total_seconds() if contest.start_at and sol.solved_at else 0
-        if delta < 0:
-            delta = 0
-        agg[sid]["total_time_s"] += float(delta)
-        if sol.best_time_ms:
-            agg[sid]["total_best_time_ms"] += float(sol.best_time_ms or 0.0)
-        if not agg[sid]["first_solve"] or sol.solved_at < agg[sid]["first_solve"]:
-            agg[sid]["first_solve"] = sol.solved_at
-        agg[sid]["points"] += 1
-
-    rows = [
-        {
-            "student_id": sid,
-            "name": data["student"].name,
-            "email": data["student"].email,
-            "solved": data["solved"],
-            "total_time_s": round(data["total_time_s"], 3),
-            "total_best_time_ms": round(data["total_best_time_ms"], 3),
-            "points": data["points"],
-            "first_solve_at": data["first_solve"],
-        }
-        for sid, data in agg.items()
-    ]
-    rows.sort(
-        key=lambda r: (
-            -r["solved"],
-            r["total_best_time_ms"],
-            r["total_time_s"],
-            r["student_id"],
-        )
-    )
-
-    # Assign ranks with ties
-    rank = 0
-    prev_key = None
-    for r in rows:
-        key = (r["solved"], r["total_best_time_ms"], r["total_time_s"])
-        if key != prev_key:
-            rank = rows.index(r) + 1
-            prev_key = key
-        r["rank"] = rank
-
+    page_size = int(getattr(settings, "ADMIN_LEADERBOARD_PAGE_SIZE", 100))
+    total = standings.count(contest)
+    pages = max(1, -(-total // page_size))
+    try:
+        page = min(max(1, int(request.GET.get("page") or 1)), pages)
+    except ValueError:
+        page = 1
+    rows = standings.ranked(contest, offset=(page - 1) * page_size, limit=page_size)
     return render(
         request,
         "accounts/leaderboard_admin.html",
-        {"contest": contest, "rows": rows},
+        {
+            "contest": contest,
+            "rows": rows,
+            "page": page,
+            "pages": pages,
+            "total": total,
+            "previous_page": page - 1 if page > 1 else None,
+            "next_page": page + 1 if page < pages else None,
+        },
     )
 
 
 @staff_member_required
 def admin_leaderboard_csv(request, contest_id: int):
-    contest = get_object_or_404(Contest, id=contest_id)
-    # Reuse computation by calling the HTML view logic in a minimal way
-    # (duplicate small block to avoid coupling to response rendering)
-    qs = (
-        UserSolution.objects.filter(is_solved=True, problem__contest=contest)
-        .select_related("student", "problem__contest")
-        .only("student_id", "solved_at", "problem_id", "best_time_ms")
-    )
-    agg = {}
-    for sol in qs:
-        if not sol.solved_at:
-            continue
-        sid = sol.student_id
-        if sid not in agg:
-            agg[sid] = {
-                "student": sol.student,
-                "solved": 0,
-                "total_time_s": 0.0,
-                "total_best_time_ms": 0.0,
-                "first_solve": None,
-                "points": 0,
-            }
-        agg[sid]["solved"] += 1
-        delta = (sol.solved_at - contest.start_at).total_seconds() if contest.start_at and sol.solved_at else 0
-        if delta < 0:
-            delta = 0
-        agg[sid]["total_time_s"] += float(delta)
-        if sol.best_time_ms:
-            agg[sid]["total_best_time_ms"] += float(sol.best_time_ms or 0.0)
-        if not agg[sid]["first_solve"] or sol.solved_at < agg[sid]["first_solve"]:
-            agg[sid]["first_solve"] = sol.solved_at
-        agg[sid]["points"] += 1
-
-    rows = [
-        {
-            "student_id": sid,
-            "name": data["student"].name,
-            "email": data["student"].email,
-            "solved": data["solved"],
-            "total_time_s": round(data["total_time_s"], 3),
-            "total_best_time_ms": round(data["total_best_time_ms"], 3),
-            "points": data["points"],
-            "first_solve_at": data["first_solve"],
-        }
-        for sid, data in agg.items()
-    ]
-    rows.sort(
-        key=lambda r: (
-            -r["solved"],
-            r["total_best_time_ms"],
-            r["total_time_s"],
-            r["student_id"],
-        )
-    )
+    """Stream the contest board as CSV, straight from a database cursor.
 
-    # Assign ranks with ties
-    rank = 0
-    prev_key = None
-    for r in rows:
-        key = (r["solved"], r["total_best_time_ms"], r["total_time_s"])
-        if key != prev_key:
-            rank = rows.index(r) + 1
-            prev_key = key
-        r["rank"] = rank
-
-    import csv
-    from django.http import HttpResponse
+    ``?per_problem=1`` adds solve time and best time columns for every problem.
+    """
+    contest = get_object_or_404(Contest, id=contest_id)
+    per_problem = request.GET.get("per_problem") in ("1", "true", "yes")
+    problems = list(contest.problems.order_by("id").values_list("id", "code")) if per_problem else []
 
-    response = HttpResponse(content_type="text/csv")
-    response["Content-Disposition"] = f"attachment; filename=leaderboard_{contest.id}.csv"
-    writer = csv.writer(response)
-    writer.writerow([
+    header = [
         "Rank",
         "Student ID",
         "Name",
@@ -653,20 +546,105 @@ def admin_leaderboard_csv(request, contest_id: int):
         "Total Best Time (ms)",
         "Total Time (s)",
         "First Solve At",
-    ])
-    for r in rows:
-        writer.writerow([
-            r.get("rank"),
-            r.get("student_id"),
-            r.get("name"),
-            r.get("email"),
-            r.get("solved"),
-            r.get("points"),
-            r.get("total_best_time_ms"),
-            r.get("total_time_s"),
-            r.get("first_solve_at").isoformat() if r.get("first_solve_at") else "",
-        ])
+    ]
+    for _, code in problems:
+        header += [f"{code} Solve Time (s)", f"{code} Best Time (ms)"]
+
+    def rows():
+        chunk_size = int(getattr(settings, "LEADERBOARD_CSV_CHUNK_SIZE", 2000))
+        for r in standings.iter_ranked(contest, chunk_size=chunk_size, per_problem=per_problem):
+            row = [
+                r.get("rank"),
+                r.get("student_id"),
+                r.get("name"),
+                r.get("email"),
+                r.get("solved"),
+                r.get("points"),
+                r.get("total_best_time_ms"),
+                r.get("total_time_s"),
+                r.get("first_solve_at").isoformat() if r.get("first_solve_at") else "",
+            ]
+            for problem_id, _ in problems:
+                row += r["problems"].get(problem_id, ("", ""))
+            yield row
+
+    return _csv_response(header, rows(), f"leaderboard_{contest.id}.csv")
+
 
+@staff_member_required
+def admin_track_submissions_csv(request, track: str):
+    """Stream every submission of a track (junior/senior) as CSV, oldest first.
+
+    ``?contest=<id>`` and ``?status=DONE`` narrow it down.
+    """
+    if track not in Contest.Track.values:
+        raise Http404("Unknown track")
+    qs = Submission.objects.filter(track=track)
+    if request.GET.get("contest"):
+        try:
+            qs = qs.filter(contest_id=int(request.GET["contest"]))
+        except ValueError:
+            return HttpResponseBadRequest("contest must be an integer")
+    if request.GET.get("status"):
+        qs = qs.filter(status=request.GET["status"].upper())
+
+    header = [
+        "Submission ID",
+        "Created At",
+        "Student ID",
+        "Name",
+        "Email",
+        "Contest",
+        "Problem",
+        "Language",
+        "Status",
+        "Score",
+        "Max Score",
+    ]
+    columns = (
+        "id",
+        "created_at",
+        "student_id",
+        "student__name",
+        "student__email",
+        "contest__name",
+        "problem__code",
+        "language",
+        "status",
+        "score",
+        "max_score",
+    )
+
+    def rows():
+        chunk_size = int(getattr(settings, "LEADERBOARD_CSV_CHUNK_SIZE", 2000))
+        for values in qs.order_by("created_at").values_list(*columns).iterator(chunk_size=chunk_size):
+            row = list(values)
+            row[1] = row[1].isoformat()
+            yield row
+
+    return _csv_response(header, rows(), f"{track}_submissions.csv")
+
+
+class _Echo:
+    """csv.writer target that hands each formatted line straight back."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_response(header, rows, filename):
+    """Stream ``header`` then ``rows`` as a CSV attachment, a line at a time."""
+    import csv
+    from django.http import StreamingHttpResponse
+
+    def lines():
+        writer = csv.writer(_Echo())
+        yield writer.writerow(header)
+        for row in rows:
+            yield writer.writerow(row)
+
+    response = StreamingHttpResponse(lines(), content_type="text/csv")
+    response["Content-Disposition"] = f"attachment; filename={filename}"
     return response
 
 
@@ -706,16 +684,7 @@ def start(request, id=None):
     if id:
         problem = get_object_or_404(Problem, id=id)
         # Fetch visible test cases
-        for tc in problem.testcases.all():
-            if tc.file and tc.file.path.endswith(".json"):
-                with open(tc.file.path, "r") as f:
-                    try:
-                        data = json.load(f)
-                        for case in data.get("test_cases", []):
-                            if case.get("is_visible", False):
-                                visible_testcases.append(case)
-                    except Exception as e:
-                        print("Error reading testcase JSON:", e)
+        visible_testcases = testsuite.visible_cases(problem)
 
     return render(
         request,
@@ -727,6 +696,7 @@ def start(request, id=None):
             "contest_end_at": attempt.end_at,
             "contest_locked": attempt.is_locked or attempt.is_over,
             "student_id": student.id,
+            "submission_events": getattr(settings, "SUBMISSION_EVENTS_ENABLED", False),
         },
     )
 
@@ -763,16 +733,7 @@ def start_junior(request, id=None):
 
     if id:
         problem = get_object_or_404(Problem, id=id, contest=contest)
-        for tc in problem.testcases.all():
-            if tc.file and tc.file.path.endswith(".json"):
-                with open(tc.file.path, "r") as f:
-                    try:
-                        data = json.load(f)
-                        for case in data.get("test_cases", []):
-                            if case.get("is_visible", False):
-                                visible_testcases.append(case)
-                    except Exception as e:
-                        print("Error reading testcase JSON:", e)
+        visible_testcases = testsuite.visible_cases(problem)
 
     return render(
         request,
@@ -784,6 +745,7 @@ def start_junior(request, id=None):
             "contest_end_at": attempt.end_at,
             "contest_locked": attempt.is_locked or attempt.is_over,
             "student_id": student.id,
+            "submission_events": getattr(settings, "SUBMISSION_EVENTS_ENABLED", False),
         },
     )
 
@@ -820,16 +782,7 @@ def start_senior(request, id=None):
 
     if id and contest:
         problem = get_object_or_404(Problem, id=id, contest=contest)
-        for tc in problem.testcases.all():
-            if tc.file and tc.file.path.endswith(".json"):
-                with open(tc.file.path, "r") as f:
-                    try:
-                        data = json.load(f)
-                        for case in data.get("test_cases", []):
-                            if case.get("is_visible", False):
-                                visible_testcases.append(case)
-                    except Exception as e:
-                        print("Error reading testcase JSON:", e)
+        visible_testcases = testsuite.visible_cases(problem)
 
     return render(
         request,
@@ -841,6 +794,7 @@ def start_senior(request, id=None):
             "contest_end_at": attempt.end_at,
             "contest_locked": attempt.is_locked or attempt.is_over,
             "student_id": student.id,
+            "submission_events": getattr(settings, "SUBMISSION_EVENTS_ENABLED", False),
         },
     )
 
@@ -873,51 +827,26 @@ def run_code(request, problem_id):
         if not code:
             return JsonResponse({"error": "code is required"}, status=400)
 
+        admitted = _admit(student, problem, code, language)
+        if admitted is not None:
+            return admitted
+
         # Track attempts
         us, created = UserSolution.objects.get_or_create(
             student=student, problem=problem, defaults={"attempts": 1}
         )
         if not created:
             us.attempts += 1
-            us.save()
+            us.save(update_fields=["attempts"])
 
         # Create async submission
         sub = Submission.objects.create(
             student=student, problem=problem, code=code, language=language
         )
 
-        # Mirror into per-track table when applicable (based on problem's contest name)
-        cname = (problem.contest.name or "").lower() if problem.contest_id else ""
-        if "junior" in cname:
-            JuniorSubmission.objects.create(
-                orig_submission=sub.id,
-                student=student,
-                problem=problem,
-                code=code,
-                language=language,
-                status=sub.status,
-                score=0,
-                max_score=0,
-                judge0_tokens=[],
-                judge0_raw={},
-            )
-        elif "senior" in cname:
-            SeniorSubmission.objects.create(
-                orig_submission=sub.id,
-                student=student,
-                problem=problem,
-                code=code,
-                language=language,
-                status=sub.status,
-                score=0,
-                max_score=0,
-                judge0_tokens=[],
-                judge0_raw={},
-            )
-
         # Try to queue the task with proper error handling
         try:
-            evaluate_submission.delay(str(sub.id))
+            enqueue_evaluation(sub, interactive=request.POST.get("action") == "run")
         except Exception as e:
             # If Celery is not available, set submission to error state
             sub.status = Submission.Status.ERROR
@@ -970,22 +899,14 @@ def get_visible_testcases(request, problem_id):
     problem = get_object_or_404(Problem, id=problem_id)
     visible_cases = []
 
-    for tc in problem.testcases.all():
-        if tc.file and tc.file.path.endswith(".json"):
-            with open(tc.file.path, "r") as f:
-                try:
-                    data = json.load(f)
-                    for case in data.get("test_cases", []):
-                        if case.get("is_visible", False):
-                            visible_cases.append(
-                                {
-                                    "test_case_no": case.get("test_case_no"),
-                                    "stdin": case.get("stdin"),
-                                    "expected_output": case.get("expected_output"),
-                                }
-                            )
-                except Exception as e:
-                    print("Error reading testcase JSON:", e)
+    for case in testsuite.visible_cases(problem):
+        visible_cases.append(
+            {
+                "test_case_no": case.get("test_case_no"),
+                "stdin": case.get("stdin"),
+                "expected_output": case.get("expected_output"),
+            }
+        )
 
     return JsonResponse({"visible_testcases": visible_cases})
 
@@ -1052,13 +973,16 @@ def create_submission(request):
         problem = get_object_or_404(Problem, id=problem_id)
         student_id = request.session.get("student_id")
         student = Student.objects.filter(id=student_id).first()
+        admitted = _admit(student, problem, code, language)
+        if admitted is not None:
+            return admitted
         sub = Submission.objects.create(
             student=student, problem=problem, code=code, language=language
         )
 
         # Try to queue the task with proper error handling
         try:
-            evaluate_submission.delay(str(sub.id))
+            enqueue_evaluation(sub, interactive=data.get("action") == "run")
         except Exception as e:
             # If Celery is not available, set submission to error state
             sub.status = Submission.Status.ERROR
@@ -1084,12 +1008,81 @@ def create_submission(request):
         )
 
 
+def _admit(student, problem, code, language):
+    """Response for a submission that must not be created (coalesced into a
+    queued one, or rejected with 429), or ``None`` to go ahead."""
+    decision = admission.admit(student, problem, code, language)
+    if decision.coalesced is not None:
+        sub = decision.coalesced
+        return JsonResponse({"submission_id": str(sub.id), "status": sub.status, "coalesced": True})
+    if decision.allowed:
+        return None
+    response = JsonResponse(
+        {
+            "error": "Too many submissions. Please wait a moment and try again.",
+            "reason": decision.reason,
+            "retry_after": decision.retry_after,
+        },
+        status=429,
+    )
+    response["Retry-After"] = str(decision.retry_after)
+    return response
+
+
+# Per-case fields of get_submission_status, and the column each is read from
+RESULT_FIELDS = {
+    "index": "index",
+    "group": "group",
+    "weight": "weight",
+    "status": "status",
+    "passed": "passed",
+    "time_ms": "time_ms",
+    "memory_kb": "memory_kb",
+    "output": "output",
+    "expected": "case__expected_output",
+}
+
+
 def get_submission_status(request, submission_id):
-    sub = get_object_or_404(Submission, id=submission_id)
+    """Status of a submission, with its per-case results.
+
+    Every response has ``cases``: one status code per case, packed into a
+    string (see ``accounts.results.case_code``). Detailed ``results`` can be
+    narrowed so polls stay small:
+
+    - ``?fields=index,status,output`` picks per-case fields; ``?fields=`` (empty)
+      leaves ``results`` out, which is all a client needs while it waits;
+    - ``?since_index=N`` returns only cases from index ``N`` on;
+    - ``?failed=1`` returns only cases that did not pass.
+
+    Reads go through ``values()``; no model instances are built.
+    """
+    if "fields" in request.GET:
+        fields = [f.strip() for f in request.GET["fields"].split(",") if f.strip()]
+        unknown = [f for f in fields if f not in RESULT_FIELDS]
+        if unknown:
+            return HttpResponseBadRequest(f"Unknown fields: {', '.join(unknown)}")
+    else:
+        fields = list(RESULT_FIELDS)
+    try:
+        since_index = max(0, int(request.GET.get("since_index") or 0))
+    except ValueError:
+        return HttpResponseBadRequest("since_index must be an integer")
+    failed_only = request.GET.get("failed") in ("1", "true", "yes")
+
+    sub = (
+        Submission.objects.filter(id=submission_id)
+        .values("id", "status", "score", "max_score")
+        .first()
+    )
+    if sub is None:
+        raise Http404("Submission not found")
 
     # Check for task errors and provide detailed error information
-    if sub.status == Submission.Status.ERROR and sub.judge0_raw:
-        error_info = sub.judge0_raw
+    error_info = None
+    if sub["status"] == Submission.Status.ERROR:
+        error_info = Submission.objects.filter(id=submission_id).values_list("judge0_raw", flat=True).first()
+    if error_info:
         error_msg = error_info.get("error", "Unknown error occurred")
 
         # Enhanced error handling with specific details
@@ -1099,10 +1092,10 @@ def get_submission_status(request, submission_id):
         ):
             return JsonResponse(
                 {
-                    "id": str(sub.id),
-                    "status": sub.status,
-                    "score": sub.score or 0,
-                    "max_score": sub.max_score or 0,
+                    "id": str(sub["id"]),
+                    "status": sub["status"],
+                    "score": sub["score"] or 0,
+                    "max_score": sub["max_score"] or 0,
                     "results": [],
                     "error": "No test cases available for this problem",
                     "error_details": error_info.get("details", ""),
@@ -1113,10 +1106,10 @@ def get_submission_status(request, submission_id):
             file_errors = error_info.get("file_errors", [])
             return JsonResponse(
                 {
-                    "id": str(sub.id),
-                    "status": sub.status,
-                    "score": sub.score or 0,
-                    "max_score": sub.max_score or 0,
+                    "id": str(sub["id"]),
+                    "status": sub["status"],
+                    "score": sub["score"] or 0,
+                    "max_score": sub["max_score"] or 0,
                     "results": [],
                     "error": "Test case loading failed",
                     "error_details": f"Found test case records but couldn't load valid test cases. Errors: {'; '.join(file_errors)}",
@@ -1126,10 +1119,10 @@ def get_submission_status(request, submission_id):
         else:
             return JsonResponse(
                 {
-                    "id": str(sub.id),
-                    "status": sub.status,
-                    "score": sub.score or 0,
-                    "max_score": sub.max_score or 0,
+                    "id": str(sub["id"]),
+                    "status": sub["status"],
+                    "score": sub["score"] or 0,
+                    "max_score": sub["max_score"] or 0,
                     "results": [],
                     "error": error_msg,
                     "error_details": error_info.get("details", ""),
@@ -1137,32 +1130,75 @@ def get_submission_status(request, submission_id):
                 }
             )
 
-    results = [
-        {
-            "index": r.index,
-            "group": r.group,
-            "weight": r.weight,
-            "status": r.status,
-            "passed": r.passed,
-            "time_ms": r.time_ms,
-            "memory_kb": r.memory_kb,
-            "output": r.output or "",
-            "expected": r.expected_output or "",
-        }
-        for r in sub.results.order_by("index")
-    ]
+    rows = SubmissionTestCaseResult.objects.filter(submission_id=submission_id).order_by("index")
+    filtered = since_index > 0 or failed_only
+    columns = {"index", "status", "passed"}
+    if fields and not filtered:
+        # One query serves both the packed codes and the details
+        columns |= {RESULT_FIELDS[f] for f in fields}
+    values = list(rows.values(*columns))
+    cases = pack_case_codes((r["status"], r["passed"]) for r in values)
+
+    response = {
+        "id": str(sub["id"]),
+        "status": sub["status"],
+        "score": sub["score"],
+        "max_score": sub["max_score"],
+        "cases": cases,
+    }
+    if fields:
+        if filtered:
+            detail = rows.filter(index__gte=since_index)
+            if failed_only:
+                detail = detail.filter(passed=False)
+            values = detail.values(*{RESULT_FIELDS[f] for f in fields})
+        results = []
+        for r in values:
+            item = {f: r[RESULT_FIELDS[f]] for f in fields}
+            for text in ("output", "expected"):
+                if text in item:
+                    item[text] = item[text] or ""
+            results.append(item)
+        response["results"] = results
+    response["solved"] = sub["status"] == Submission.Status.DONE and sub["score"] == sub["max_score"]
+    response["progress"] = progress.get(submission_id)
+    return JsonResponse(response)
+
+
+async def submission_events(request, submission_id):
+    """Server-Sent Events stream of a submission's progress (see ``accounts.events``)."""
+    from django.http import StreamingHttpResponse
+    from . import events
+
+    sub = await Submission.objects.filter(id=submission_id).only("id").afirst()
+    if sub is None:
+        raise Http404("Submission not found")
+    response = StreamingHttpResponse(events.stream(sub), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Stop nginx from buffering the stream
+    response["X-Accel-Buffering"] = "no"
+    return response
 
-    return JsonResponse(
-        {
-            "id": str(sub.id),
-            "status": sub.status,
-            "score": sub.score,
-            "max_score": sub.max_score,
-            "results": results,
-            "solved": sub.status == Submission.Status.DONE
-            and sub.score == sub.max_score,
-        }
-    )
+
+@csrf_exempt
+def judge0_callback(request, submission_id, index):
+    """Receive one finished case from Judge0 (callback mode)."""
+    if request.method not in ("PUT", "POST"):
+        return JsonResponse({"error": "PUT required"}, status=405)
+
+    from django.utils.crypto import constant_time_compare
+    from .tasks import handle_judge0_callback, judge0_callback_signature
+
+    expected = judge0_callback_signature(submission_id, index)
+    if not constant_time_compare(request.GET.get("sig", ""), expected):
+        return JsonResponse({"error": "Invalid signature"}, status=403)
+    try:
+        payload = json.loads(request.body.decode("utf-8") or "{}")
+    except ValueError:
+        return JsonResponse({"error": "Invalid JSON"}, status=400)
+
+    handle_judge0_callback(submission_id, index, payload)
+    return JsonResponse({"ok": True})
 
 
 @csrf_exempt
@@ -1175,7 +1211,9 @@ def health_check(request):
         with connection.cursor() as cursor:
             cursor.execute("SELECT 1")
 
-        # Check Judge0 connectivity
+        # Judge0 availability comes from the shared circuit breaker state that
+        # workers route on; it is refreshed in the background, not probed here.
+        from . import judge0_health, metrics
         from .tasks import _check_judge0_connectivity
 
         judge0_ok, judge0_error = _check_judge0_connectivity()
@@ -1226,6 +1264,16 @@ def health_check(request):
 
         if not judge0_ok:
             status["judge0_error"] = judge0_error
+
+        from .judge0_client import pool_stats
+
+        status["judge0_breaker"] = judge0_health.get_state()
+        status["judge0_pool"] = pool_stats()
+        status["judge0_poll"] = metrics.summary("judge0.poll")
+        status["judge0_callbacks"] = metrics.get("judge0.callback")
+        status["leaderboard_cache"] = _leaderboard_cache_stats()
+        status["evaluation_memo"] = memo.stats()
+        status["admission"] = admission.stats()
         if not celery_ok:
             status["celery_error"] = celery_error
 
@@ -1248,22 +1296,14 @@ def get_problem_detail(request, problem_id):
 
         # Get visible test cases
         visible_testcases = []
-        for tc in problem.testcases.all():
-            if tc.file and tc.file.path.endswith(".json"):
-                try:
-                    with open(tc.file.path, "r") as f:
-                        data = json.load(f)
-                        for case in data.get("test_cases", []):
-                            if case.get("is_visible", False):
-                                visible_testcases.append(
-                                    {
-                                        "test_case_no": case.get("test_case_no"),
-                                        "stdin": case.get("stdin"),
-                                        "expected_output": case.get("expected_output"),
-                                    }
-                                )
-                except Exception as e:
-                    print(f"Error reading testcase JSON: {e}")
+        for case in testsuite.visible_cases(problem):
+            visible_testcases.append(
+                {
+                    "test_case_no": case.get("test_case_no"),
+                    "stdin": case.get("stdin"),
+                    "expected_output": case.get("expected_output"),
+                }
+            )
 
         # Check if student has solved this problem
         is_solved = False
@@ -1365,123 +1405,63 @@ def get_starter_code(request, problem_id):
 def leaderboard(request):
     """Return leaderboard.
     Sort by problems solved (desc) and time taken (asc).
-    If a contest_id is provided, compute total time as the sum of (solve_time - contest.start_at)
-    across solved problems. Otherwise, use earliest solve time as a tie-breaker.
+    If a contest_id is provided, read the contest's materialized standings (see
+    ``accounts.standings``). Otherwise, use earliest solve time as a tie-breaker.
+    ``offset``/``limit`` select a page and add ``total`` to the response.
+
+    Responses carry an ETag derived from the standings version counters and
+    are cached under it: a matching ``If-None-Match`` gets a 304, and an
+    unchanged board is served from the cache, both without a query.
     """
     try:
         contest_id = request.GET.get("contest_id")
+        offset = max(0, int(request.GET.get("offset") or 0))
+        limit = request.GET.get("limit")
+        limit = max(1, int(limit)) if limit else None
 
         if contest_id:
-            contest = get_object_or_404(Contest, id=contest_id)
-            # Gather solved solutions in this contest
-            qs = (
-                UserSolution.objects.filter(is_solved=True, problem__contest=contest)
-                .select_related("student", "problem__contest")
-                .only("student_id", "solved_at", "problem_id")
-            )
-            agg = {}
-            for sol in qs:
-                if not sol.solved_at:
-                    continue
-                sid = sol.student_id
-                if sid not in agg:
-                    agg[sid] = {
-                        "student": sol.student,
-                        "solved": 0,
-                        # Sum of time deltas from contest start (seconds) for solved problems
-                        "total_time_s": 0.0,
-                        # Sum of fastest AC times across problems (milliseconds)
-                        "total_best_time_ms": 0.0,
-                        "first_solve": None,
-                        # simple points: 1 per solved; can be extended later
-                        "points": 0,
-                    }
-                agg[sid]["solved"] += 1
-                delta = (sol.solved_at - contest.start_at).total_seconds()
-                if delta < 0:
-                    delta = 0
-                agg[sid]["total_time_s"] += float(delta)
-                if sol.best_time_ms:
-                    agg[sid]["total_best_time_ms"] += float(sol.best_time_ms or 0.0)
-                if not agg[sid]["first_solve"] or sol.solved_at < agg[sid]["first_solve"]:
-                    agg[sid]["first_solve"] = sol.solved_at
-                agg[sid]["points"] += 1
-
-            # Build list and sort: solved desc, total_time asc, id asc
-            rows = [
-                {
-                    "student_id": sid,
-                    "name": data["student"].name,
-                    "email": data["student"].email,
-                    "solved": data["solved"],
-                    "total_time_s": round(data["total_time_s"], 3),
-                    "total_best_time_ms": round(data["total_best_time_ms"], 3),
-                    "points": data["points"],
-                    "first_solve_at": data["first_solve"].isoformat()
-                    if data["first_solve"]
-                    else None,
-                }
-                for sid, data in agg.items()
-            ]
+            contest_id = int(contest_id)
+            scopes = (contest_id, standings.STUDENTS)
+        else:
+            scopes = (standings.OVERALL, standings.STUDENTS)
+        version = standings.versions(*scopes)
+
+        etag = cache_key = None
+        if version is not None:
+            cache_key = "leaderboard:" + ":".join(str(v) for v in (*scopes, *version, offset, limit))
+            etag = '"%s"' % hashlib.sha1(cache_key.encode()).hexdigest()[:20]
+            if etag in _if_none_match(request):
+                metrics.incr("leaderboard.not_modified")
+                return _leaderboard_response(HttpResponseNotModified(), etag)
+            body = _cache_get(cache_key)
+            if body is not None:
+                metrics.incr("leaderboard.cache_hit")
+                return _leaderboard_response(HttpResponse(body, content_type="application/json"), etag)
+        metrics.incr("leaderboard.cache_miss")
 
-            # Sort by problems solved desc, then by total best time asc (fastest), then by total solve time asc, then id
-            rows.sort(
-                key=lambda r: (
-                    -r["solved"],
-                    r["total_best_time_ms"],
-                    r["total_time_s"],
-                    r["student_id"],
-                )
-            )
+        if contest_id:
+            contest = get_object_or_404(Contest, id=contest_id)
+            rows = standings.ranked(contest, offset=offset, limit=limit)
+            for r in rows:
+                r["first_solve_at"] = r["first_solve_at"].isoformat() if r["first_solve_at"] else None
 
-            # Assign ranks with ties sharing the same rank key
-            leaderboard = []
-            rank = 0
-            prev_key = None
+            response = {"leaderboard": rows, "contest": contest.name}
+            if limit is not None:
+                response["total"] = standings.count(contest)
+        else:
+            # No contest provided: aggregate across all
+            rows = standings.overall(offset=offset, limit=limit)
             for r in rows:
-                key = (r["solved"], r["total_best_time_ms"], r["total_time_s"])
-                if key != prev_key:
-                    rank = len(leaderboard) + 1
-                    prev_key = key
-                r["rank"] = rank
-                leaderboard.append(r)
-
-            return JsonResponse({"leaderboard": leaderboard, "contest": contest.name})
-
-        # No contest provided: aggregate across all
-        students_qs = Student.objects.all()
-        stats = (
-            students_qs.annotate(
-                solved_count=Count("solutions", filter=Q(solutions__is_solved=True), distinct=True),
-                first_solve=Min("solutions__solved_at", filter=Q(solutions__is_solved=True)),
-            )
-            .order_by("-solved_count", "first_solve", "id")
-            .values("id", "name", "email", "solved_count", "first_solve")
-        )
+                r["first_solve_at"] = r["first_solve_at"].isoformat() if r["first_solve_at"] else None
 
-        leaderboard = []
-        rank = 0
-        prev_key = None
-        for row in stats:
-            key = (row["solved_count"], row["first_solve"])
-            if key != prev_key:
-                rank = len(leaderboard) + 1
-                prev_key = key
-            leaderboard.append(
-                {
-                    "rank": rank,
-                    "student_id": row["id"],
-                    "name": row["name"],
-                    "email": row["email"],
-                    "solved": int(row["solved_count"] or 0),
-                    "first_solve_at": row["first_solve"].isoformat()
-                    if row["first_solve"]
-                    else None,
-                    "points": int(row["solved_count"] or 0),
-                }
-            )
+            response = {"leaderboard": rows}
+            if limit is not None:
+                response["total"] = Student.objects.count()
 
-        return JsonResponse({"leaderboard": leaderboard})
+        body = json.dumps(response, cls=DjangoJSONEncoder)
+        if cache_key:
+            _cache_set(cache_key, body, int(getattr(settings, "LEADERBOARD_CACHE_TTL_S", 300)))
+        return _leaderboard_response(HttpResponse(body, content_type="application/json"), etag)
     except Exception as e:
         return JsonResponse(
             {
@@ -1490,3 +1470,44 @@ def leaderboard(request):
             },
             status=500,
         )
+
+
+def _if_none_match(request) -> set:
+    header = request.headers.get("If-None-Match", "")
+    return {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+
+
+def _leaderboard_response(response, etag):
+    if etag:
+        response["ETag"] = etag
+        # Browsers keep the body but revalidate every poll, sending If-None-Match
+        response["Cache-Control"] = "no-cache"
+    return response
+
+
+def _cache_get(key):
+    try:
+        return cache.get(key)
+    except Exception:
+        return None
+
+
+def _cache_set(key, value, timeout) -> None:
+    try:
+        cache.set(key, value, timeout)
+    except Exception:
+        pass  # served uncached until the cache is back
+
+
+def _leaderboard_cache_stats() -> dict:
+    """Hit ratio of the leaderboard API: 304s and cached bodies over all requests."""
+    hits = metrics.get("leaderboard.cache_hit")
+    not_modified = metrics.get("leaderboard.not_modified")
+    misses = metrics.get("leaderboard.cache_miss")
+    total = hits + not_modified + misses
+    return {
+        "hits": hits,
+        "not_modified": not_modified,
+        "misses": misses,
+        "hit_ratio": round((hits + not_modified) / total, 4) if total else 0.0,
+    }
@@ -1,7 +1,47 @@
+"""Inject a student's ``Solution`` class into the problem's solution template.
+
+Templates live at ``MEDIA_ROOT/testcases/<contest>/<problem>/solution.<ext>``.
+Each is read and split once into ``prefix + placeholder + suffix`` (the
+placeholder being the template's own ``Solution`` block) and kept in a
+per-process registry keyed by path; a change of mtime or size reloads it. A
+submission then costs one ``stat`` and a concatenation.
+
+The ``Solution`` block is found with linear scanners rather than regexes
+over the whole text:
+
+- Python: the top-level ``class Solution`` statement from ``ast`` (a line
+  scan when the code does not parse), up to the template's
+  ``# --- Input/Output Handling ---`` marker or the end of the code;
+- C++: ``class Solution {`` to its matching ``};`` with a brace matcher that
+  skips comments and string/char literals, so nested types and braces in
+  strings don't end the class early.
+
+When a template or block cannot be found, the code is returned unchanged.
+"""
+
+import ast
 import os
 import re
+from typing import NamedTuple
+
 from django.conf import settings
 
+IO_MARKER = "\n# --- Input/Output Handling ---"
+
+# Only ever matched at a known position, never searched for
+_PY_CLASS = re.compile(r"class\s+Solution\b")
+_CPP_CLASS = re.compile(r"class\s+Solution\s*\{")
+
+
+class Template(NamedTuple):
+    prefix: str
+    placeholder: str
+    suffix: str
+
+
+# path -> ((mtime_ns, size), Template or None when it has no Solution block)
+_templates = {}
+
 
 def _template_path(problem, language: str) -> str | None:
     ext = "py" if language == "python" else ("cpp" if language == "cpp" else None)
@@ -14,35 +54,144 @@ def _template_path(problem, language: str) -> str | None:
         str(getattr(problem.contest, "name", "") or "").strip(),
         str(problem.code).strip(),
     )
-    path = os.path.join(base, f"solution.{ext}")
-    return path if os.path.exists(path) else None
+    return os.path.join(base, f"solution.{ext}")
 
 
-def _wrap_python(user_code: str, template: str) -> str:
-    # Try to find user's class Solution ... block
-    m = re.search(r"class\s+Solution\b.*?(?=\n# --- Input/Output Handling ---|\Z)", user_code, re.DOTALL)
-    if not m:
-        # Safe fallback: do not alter behavior if we cannot identify a Solution block
-        return user_code
-    user_block = m.group(0)
-    # Replace the template's Solution block with user's
-    wrapped, n = re.subn(
-        r"class\s+Solution\b.*?(?=\n# --- Input/Output Handling ---|\Z)",
-        user_block,
-        template,
-        flags=re.DOTALL,
-    )
-    # If replacement didn't happen, keep original user code to avoid breaking
-    return wrapped if n > 0 else user_code
+def load_template(path: str, language: str) -> Template | None:
+    """The split template at ``path``, read again only when the file changes."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        _templates.pop(path, None)
+        return None
+    version = (st.st_mtime_ns, st.st_size)
+    cached = _templates.get(path)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+    except (OSError, ValueError):
+        return None
+    span = solution_span(text, language)
+    template = None
+    if span is not None:
+        start, end = span
+        template = Template(text[:start], text[start:end], text[end:])
+    _templates[path] = (version, template)
+    return template
 
 
-def _wrap_cpp(user_code: str, template: str) -> str:
-    m = re.search(r"class\s+Solution\s*\{.*?\};", user_code, re.DOTALL)
-    if not m:
-        return user_code
-    user_block = m.group(0)
-    wrapped, n = re.subn(r"class\s+Solution\s*\{.*?\};", user_block, template, flags=re.DOTALL)
-    return wrapped if n > 0 else user_code
+def _line_start(code: str, lineno: int) -> int | None:
+    offset = 0
+    for _ in range(lineno - 1):
+        offset = code.find("\n", offset) + 1
+        if not offset:
+            return None
+    return offset
+
+
+def _python_class_start(code: str) -> int | None:
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        tree = None
+    if tree is not None:
+        node = next(
+            (n for n in tree.body if isinstance(n, ast.ClassDef) and n.name == "Solution"),
+            None,
+        )
+        if node is None:
+            return None
+        offset = _line_start(code, node.lineno)
+        if offset is not None and _PY_CLASS.match(code, offset):
+            return offset
+    # Unparseable code (or odd line endings): first line starting the class
+    offset = 0
+    while offset != -1:
+        if _PY_CLASS.match(code, offset):
+            return offset
+        offset = code.find("\n", offset)
+        if offset != -1:
+            offset += 1
+    return None
+
+
+def _python_solution_span(code: str):
+    start = _python_class_start(code)
+    if start is None:
+        return None
+    end = code.find(IO_MARKER, start)
+    return start, len(code) if end == -1 else end
+
+
+def _is_ident(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def _cpp_code(code: str):
+    """Yield ``(index, char)`` for C++ source outside comments and literals."""
+    i, n = 0, len(code)
+    while i < n:
+        c = code[i]
+        if c == "/" and code.startswith("//", i):
+            i = code.find("\n", i)
+            i = n if i == -1 else i
+            continue
+        if c == "/" and code.startswith("/*", i):
+            end = code.find("*/", i + 2)
+            i = n if end == -1 else end + 2
+            continue
+        if c == '"' and i and code[i - 1] == "R":
+            # Raw string R"delim( ... )delim"
+            paren = code.find("(", i + 1)
+            if paren != -1:
+                end = code.find(")" + code[i + 1 : paren] + '"', paren)
+                i = n if end == -1 else end + paren - i + 1
+                continue
+        if c == '"' or (c == "'" and not (i and _is_ident(code[i - 1]))):
+            # A ' after a digit is a digit separator (1'000), not a literal
+            i += 1
+            while i < n and code[i] != c and code[i] != "\n":
+                i += 2 if code[i] == "\\" else 1
+            i += 1
+            continue
+        yield i, c
+        i += 1
+
+
+def _cpp_solution_span(code: str):
+    chars = _cpp_code(code)
+    for i, c in chars:
+        if c != "c" or (i and _is_ident(code[i - 1])):
+            continue
+        head = _CPP_CLASS.match(code, i)
+        if not head:
+            continue
+        depth = 0
+        for j, c in chars:
+            if j < head.end() - 1:
+                continue
+            if c == "{":
+                depth += 1
+            elif c == "}":
+                depth -= 1
+                if depth == 0:
+                    semi = j + 1
+                    while semi < len(code) and code[semi].isspace():
+                        semi += 1
+                    return (i, semi + 1) if code[semi : semi + 1] == ";" else None
+        return None
+    return None
+
+
+def solution_span(code: str, language: str):
+    """``(start, end)`` of the ``Solution`` block in ``code``, or ``None``."""
+    if language == "python":
+        return _python_solution_span(code)
+    if language == "cpp":
+        return _cpp_solution_span(code)
+    return None
 
 
 def maybe_wrap_code(problem, language: str, user_code: str) -> str:
@@ -53,14 +202,12 @@ def maybe_wrap_code(problem, language: str, user_code: str) -> str:
     path = _template_path(problem, language)
     if not path:
         return user_code
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            template = f.read()
-    except Exception:
+    template = load_template(path, language)
+    if template is None:
         return user_code
-
-    if language == "python":
-        return _wrap_python(user_code, template)
-    if language == "cpp":
-        return _wrap_cpp(user_code, template)
-    return user_code
+    span = solution_span(user_code, language)
+    if span is None:
+        # Safe fallback: do not alter behavior if we cannot identify a Solution block
+        return user_code
+    start, end = span
+    return template.prefix + user_code[start:end] + template.suffix
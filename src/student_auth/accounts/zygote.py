@@ -0,0 +1,178 @@
+"""Warm Python runner ("zygote") for the local executor.
+
+Started once as ``python zygote.py`` and kept alive by ``executor.RunnerPool``.
+It reads one JSON request per line on stdin::
+
+    {"source": "/tmp/.../main.py", "timeout": 5, "memory_mb": 256,
+     "cases": [{"stdin": ".../0.in", "stdout": ".../0.out", "stderr": ".../0.err"}, ...]}
+
+compiles the source once, then forks a child per case. Each child starts from
+the same pristine interpreter state (``sys.modules`` as imported at warm-up,
+never touched by user code) with the case files on fds 0-2 and
+``RLIMIT_AS``/``RLIMIT_CPU`` applied, so the per-case cost is a ``fork()``
+instead of an interpreter start.
+
+With ``"argv": [...]`` instead of ``"source"`` (compiled programs) each child
+``exec``s that command. Forking from this small process rather than from a
+large worker keeps the children's peak-RSS accounting meaningful.
+
+The answer is one JSON line on stdout::
+
+    {"results": [{"exit_code": 0, "time_ms": 1.2, "memory_kb": 9000, "timed_out": false}, ...]}
+
+This file must stay importable without Django or the project on ``sys.path``.
+"""
+
+import builtins
+import json
+import os
+import resource
+import signal
+import sys
+import traceback
+import types
+
+# Modules contest solutions commonly import; loading them here means children
+# inherit them already initialised.
+WARM_MODULES = (
+    "bisect",
+    "collections",
+    "functools",
+    "heapq",
+    "itertools",
+    "math",
+    "re",
+    "string",
+)
+
+_current_child = {"pid": None}
+
+
+def _on_alarm(signum, frame):
+    pid = _current_child["pid"]
+    if pid:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+
+def _child(code, source, case, timeout, memory_mb, argv=None):
+    """Runs in the forked child; never returns."""
+    exit_code = 0
+    try:
+        signal.signal(signal.SIGALRM, signal.SIG_DFL)
+        if memory_mb:
+            memory = memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        cpu = int(timeout) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu))
+
+        for fd, path, flags in (
+            (0, case["stdin"], os.O_RDONLY),
+            (1, case["stdout"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
+            (2, case["stderr"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC),
+        ):
+            opened = os.open(path, flags, 0o600)
+            os.dup2(opened, fd)
+            os.close(opened)
+        if argv:
+            os.execvp(argv[0], argv)
+
+        sys.stdin = sys.__stdin__ = open(0, "r", encoding="utf-8", closefd=False)
+        sys.stdout = sys.__stdout__ = open(1, "w", encoding="utf-8", closefd=False)
+        sys.stderr = sys.__stderr__ = open(2, "w", encoding="utf-8", closefd=False)
+        sys.argv = [source]
+        sys.path[0] = os.path.dirname(source)
+
+        # A fresh __main__ so dataclasses, pickle etc. resolve user definitions
+        main_module = types.ModuleType("__main__")
+        main_module.__file__ = source
+        main_module.__builtins__ = builtins
+        sys.modules["__main__"] = main_module
+        exec(code, main_module.__dict__)
+    except SystemExit as e:
+        if e.code is None:
+            exit_code = 0
+        elif isinstance(e.code, int):
+            exit_code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            exit_code = 1
+    except BaseException:
+        traceback.print_exc()
+        exit_code = 1
+    try:
+        sys.stdout.flush()
+        sys.stderr.flush()
+    except BaseException:
+        exit_code = exit_code or 1
+    os._exit(exit_code & 0xFF)
+
+
+def _run_case(code, source, case, timeout, memory_mb, argv=None):
+    pid = os.fork()
+    if pid == 0:
+        _child(code, source, case, timeout, memory_mb, argv)
+
+    _current_child["pid"] = pid
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        _, status, usage = os.wait4(pid, 0)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        _current_child["pid"] = None
+
+    exit_code = os.waitstatus_to_exitcode(status)
+    cpu_s = usage.ru_utime + usage.ru_stime
+    return {
+        "exit_code": exit_code,
+        "time_ms": round(cpu_s * 1000, 3),
+        "memory_kb": int(usage.ru_maxrss / 1024) if sys.platform == "darwin" else int(usage.ru_maxrss),
+        # SIGKILL only comes from the alarm handler (RLIMIT_CPU sends SIGXCPU)
+        "timed_out": exit_code == -signal.SIGKILL,
+    }
+
+
+def _compile_error(source, case, message):
+    with open(case["stderr"], "w", encoding="utf-8") as f:
+        f.write(message)
+    open(case["stdout"], "w").close()
+    return {"exit_code": 1, "time_ms": 0.0, "memory_kb": 0, "timed_out": False}
+
+
+def handle(request):
+    timeout = float(request.get("timeout", 5))
+    memory_mb = int(request.get("memory_mb") or 0)
+    if request.get("argv"):
+        argv = request["argv"]
+        return [_run_case(None, None, case, timeout, memory_mb, argv) for case in request["cases"]]
+
+    source = request["source"]
+    try:
+        with open(source, encoding="utf-8") as f:
+            code = compile(f.read(), source, "exec")
+    except (SyntaxError, ValueError) as e:
+        message = "".join(traceback.format_exception_only(type(e), e))
+        return [_compile_error(source, case, message) for case in request["cases"]]
+    return [_run_case(code, source, case, timeout, memory_mb) for case in request["cases"]]
+
+
+def main():
+    for name in WARM_MODULES:
+        __import__(name)
+    signal.signal(signal.SIGALRM, _on_alarm)
+
+    protocol_in = sys.stdin.buffer
+    protocol_out = sys.stdout.buffer
+    for line in protocol_in:
+        try:
+            response = {"results": handle(json.loads(line))}
+        except Exception as e:
+            response = {"error": f"{type(e).__name__}: {e}"}
+        protocol_out.write(json.dumps(response).encode("utf-8") + b"\n")
+        protocol_out.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,115 +2,7 @@
 """
 Local code execution fallback for development when Judge0 fails
 """
-import subprocess
-import tempfile
-import os
-import sys
-
-
-class LocalCodeExecutor:
-    def __init__(self):
-        self.timeout = 5  # 5 second timeout
-
-    def execute_python_code(self, code, test_cases):
-        """
-        Execute Python code locally with test cases
-        """
-        results = []
-
-        for i, test_case in enumerate(test_cases):
-            stdin_data = test_case.get("stdin", "")
-            expected_output = test_case.get("expected_output", "")
-
-            try:
-                # Create a temporary file for the code
-                with tempfile.NamedTemporaryFile(
-                    mode="w", suffix=".py", delete=False
-                ) as f:
-                    f.write(code)
-                    temp_file = f.name
-
-                # Execute the code with stdin
-                process = subprocess.Popen(
-                    [sys.executable, temp_file],
-                    stdin=subprocess.PIPE,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                )
-
-                try:
-                    stdout, stderr = process.communicate(
-                        input=stdin_data, timeout=self.timeout
-                    )
-                except subprocess.TimeoutExpired:
-                    process.kill()
-                    os.unlink(temp_file)
-                    results.append(
-                        {
-                            "index": i,
-                            "group": "visible",
-                            "weight": 1.0,
-                            "status": "Time Limit Exceeded",
-                            "passed": False,
-                            "time_ms": self.timeout * 1000,
-                            "memory_kb": 0,
-                            "output": "",
-                            "expected_output": expected_output,
-                            "stderr": "Time limit exceeded",
-                            "exit_code": -1,
-                        }
-                    )
-                    continue
-
-                # Clean up
-                os.unlink(temp_file)
-
-                # Determine if the output matches
-                actual_output = stdout.strip()
-                expected_clean = expected_output.strip()
-                passed = actual_output == expected_clean
-
-                result = {
-                    "index": i,
-                    "group": "visible",
-                    "weight": 1.0,
-                    "status": "Accepted" if passed else "Wrong Answer",
-                    "passed": passed,
-                    "time_ms": 100,  # Placeholder
-                    "memory_kb": 1024,  # Placeholder
-                    "output": actual_output,
-                    "expected_output": expected_output,
-                    "stderr": stderr,
-                    "exit_code": process.returncode,
-                }
-
-                if process.returncode != 0:
-                    result["status"] = "Runtime Error"
-                    result["passed"] = False
-
-                results.append(result)
-
-            except Exception as e:
-                if "temp_file" in locals():
-                    os.unlink(temp_file)
-                results.append(
-                    {
-                        "index": i,
-                        "group": "visible",
-                        "weight": 1.0,
-                        "status": "Internal Error",
-                        "passed": False,
-                        "time_ms": 0,
-                        "memory_kb": 0,
-                        "output": "",
-                        "expected_output": expected_output,
-                        "stderr": str(e),
-                        "exit_code": -1,
-                    }
-                )
-
-        return results
+from accounts.executor import LocalCodeExecutor
 
 
 def test_local_executor():
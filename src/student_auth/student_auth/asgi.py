@@ -2,6 +2,9 @@
 ASGI config for student_auth project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it (e.g. ``uvicorn student_auth.asgi:application``) for the submission
+event streams: under ASGI each open stream is a coroutine waiting on Redis
+pub/sub rather than a blocked worker thread.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
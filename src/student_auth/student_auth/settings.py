@@ -8,6 +8,7 @@ Hardened for development by moving secrets and DB config to environment variable
 
 from pathlib import Path
 import os
+from kombu import Queue
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -161,6 +162,90 @@ LOGIN_REDIRECT_URL = "/accounts/admin-dashboard/"
 # Judge0 API configuration (env-driven)
 JUDGE0_URL = os.getenv("JUDGE0_URL", "http://localhost:2358")
 JUDGE0_AUTH_TOKEN = os.getenv("JUDGE0_AUTH_TOKEN", "")
+# Upper bound for one /submissions/batch request; keep in sync with Judge0's
+# MAX_SUBMISSION_BATCH_SIZE (20 by default).
+JUDGE0_MAX_BATCH_SIZE = int(os.getenv("JUDGE0_MAX_BATCH_SIZE", "20"))
+# Keep-alive connections per worker process in the shared Judge0 session pool
+JUDGE0_POOL_MAXSIZE = int(os.getenv("JUDGE0_POOL_MAXSIZE", "10"))
+# Circuit breaker: consecutive failures before routing to the local executor,
+# and how long to wait before letting traffic try Judge0 again.
+JUDGE0_BREAKER_FAILURE_THRESHOLD = int(os.getenv("JUDGE0_BREAKER_FAILURE_THRESHOLD", "3"))
+JUDGE0_BREAKER_COOLDOWN_S = float(os.getenv("JUDGE0_BREAKER_COOLDOWN_S", "30"))
+JUDGE0_HEALTH_REFRESH_S = float(os.getenv("JUDGE0_HEALTH_REFRESH_S", "10"))
+# Result polling: first wait is the problem's expected runtime clamped to
+# [MIN, MAX]; it grows by BACKOFF while no case finishes.
+JUDGE0_POLL_MIN_DELAY_S = float(os.getenv("JUDGE0_POLL_MIN_DELAY_S", "0.2"))
+JUDGE0_POLL_MAX_DELAY_S = float(os.getenv("JUDGE0_POLL_MAX_DELAY_S", "3.0"))
+JUDGE0_POLL_BACKOFF = float(os.getenv("JUDGE0_POLL_BACKOFF", "1.5"))
+JUDGE0_POLL_TIMEOUT_S = float(os.getenv("JUDGE0_POLL_TIMEOUT_S", "120"))
+# Callback mode: when set, Judge0 PUTs finished cases to
+# <JUDGE0_CALLBACK_BASE_URL>/api/judge0/callback/... instead of being polled, so
+# it must be an address Judge0 can reach (e.g. http://web:8000). Cases still
+# pending after JUDGE0_CALLBACK_TIMEOUT_S are recovered by the sweeper.
+JUDGE0_CALLBACK_BASE_URL = os.getenv("JUDGE0_CALLBACK_BASE_URL", "")
+JUDGE0_CALLBACK_TIMEOUT_S = float(os.getenv("JUDGE0_CALLBACK_TIMEOUT_S", "180"))
+# Send the first case of a C/C++/Java submission alone to catch a compilation
+# error before fanning out: "always", "never", or "after_error" (only when the
+# student's previous submission of the problem failed to compile). It adds a
+# serial Judge0 round trip to every submission it applies to.
+JUDGE0_COMPILE_PROBE = os.getenv("JUDGE0_COMPILE_PROBE", "after_error")
+
+# Local fallback executor: per-case wall/CPU limit, address-space limit, and
+# how many cases run at once (defaults to the CPU count).
+LOCAL_EXECUTOR_TIMEOUT_S = float(os.getenv("LOCAL_EXECUTOR_TIMEOUT_S", "5"))
+LOCAL_EXECUTOR_MEMORY_MB = int(os.getenv("LOCAL_EXECUTOR_MEMORY_MB", "256"))
+LOCAL_EXECUTOR_MAX_WORKERS = int(os.getenv("LOCAL_EXECUTOR_MAX_WORKERS", "0")) or None
+# "warm": fork cases from pre-started interpreters; "subprocess": a fresh
+# interpreter per case.
+LOCAL_EXECUTOR_BACKEND = os.getenv("LOCAL_EXECUTOR_BACKEND", "warm")
+# Compiled C/C++/Java artifacts, keyed by source hash and shared by all
+# workers on a host (defaults to a directory under the system temp dir).
+LOCAL_EXECUTOR_BUILD_CACHE_DIR = os.getenv("LOCAL_EXECUTOR_BUILD_CACHE_DIR", "")
+LOCAL_EXECUTOR_BUILD_CACHE_SIZE = int(os.getenv("LOCAL_EXECUTOR_BUILD_CACHE_SIZE", "200"))
+
+# Parsed test-case files (accounts.testsuite): entries kept per process, and
+# how long the shared-cache copy lives.
+TESTSUITE_LOCAL_CACHE_SIZE = int(os.getenv("TESTSUITE_LOCAL_CACHE_SIZE", "256"))
+TESTSUITE_CACHE_TTL_S = int(os.getenv("TESTSUITE_CACHE_TTL_S", str(6 * 60 * 60)))
+
+# Leaderboard API bodies are cached per standings version; the TTL only bounds
+# how long superseded versions linger.
+LEADERBOARD_CACHE_TTL_S = int(os.getenv("LEADERBOARD_CACHE_TTL_S", "300"))
+
+# Evaluations memoized by source hash (accounts.memo): entry lifetime, how many
+# are kept, and the largest result worth storing.
+EVAL_MEMO_ENABLED = os.getenv("EVAL_MEMO_ENABLED", "1") == "1"
+EVAL_MEMO_TTL_S = int(os.getenv("EVAL_MEMO_TTL_S", "3600"))
+EVAL_MEMO_MAX_ENTRIES = int(os.getenv("EVAL_MEMO_MAX_ENTRIES", "1000"))
+EVAL_MEMO_MAX_BYTES = int(os.getenv("EVAL_MEMO_MAX_BYTES", str(256 * 1024)))
+
+# Admission control for new submissions (accounts.admission): queued/running
+# submissions per student and problem (0 = unlimited) and how long one counts,
+# then token buckets per student and site-wide (a rate of 0 disables one).
+ADMISSION_MAX_IN_FLIGHT = int(os.getenv("ADMISSION_MAX_IN_FLIGHT", "2"))
+ADMISSION_IN_FLIGHT_WINDOW_S = int(os.getenv("ADMISSION_IN_FLIGHT_WINDOW_S", "300"))
+ADMISSION_IN_FLIGHT_RETRY_S = int(os.getenv("ADMISSION_IN_FLIGHT_RETRY_S", "2"))
+ADMISSION_STUDENT_RATE_PER_MIN = float(os.getenv("ADMISSION_STUDENT_RATE_PER_MIN", "20"))
+ADMISSION_STUDENT_BURST = float(os.getenv("ADMISSION_STUDENT_BURST", "5"))
+ADMISSION_GLOBAL_RATE_PER_MIN = float(os.getenv("ADMISSION_GLOBAL_RATE_PER_MIN", "1200"))
+ADMISSION_GLOBAL_BURST = float(os.getenv("ADMISSION_GLOBAL_BURST", "200"))
+
+# Shared cache (Judge0 health state, ...). Point DJANGO_CACHE_URL at Redis in
+# multi-process deployments; the in-memory default is per process.
+_cache_url = os.getenv("DJANGO_CACHE_URL", "")
+if _cache_url:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": _cache_url,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
 
 MEDIA_URL = "/media/"
 # Allow override so Apache deployments can serve /var/www/DDA_Contest/media
@@ -176,6 +261,24 @@ EMAIL_BACKEND = os.getenv(
 CELERY_BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = os.getenv("CELERY_RESULT_BACKEND", "redis://localhost:6379/1")
 
+# Whether the browser waits on the submission event stream instead of polling.
+# Only for ASGI deployments (student_auth.asgi): under WSGI each stream is
+# buffered until it closes and holds a worker thread meanwhile.
+SUBMISSION_EVENTS_ENABLED = os.getenv("SUBMISSION_EVENTS_ENABLED", "0") == "1"
+# Submission progress events (accounts.events): Redis pub/sub, the broker by
+# default. Empty disables them; clients then fall back to polling.
+SUBMISSION_EVENTS_REDIS_URL = os.getenv(
+    "SUBMISSION_EVENTS_REDIS_URL",
+    CELERY_BROKER_URL if CELERY_BROKER_URL.startswith(("redis://", "rediss://")) else "",
+)
+# EventSource reconnect delay, keepalive comment interval, and the longest a
+# single stream stays open.
+SUBMISSION_EVENTS_RETRY_MS = int(os.getenv("SUBMISSION_EVENTS_RETRY_MS", "3000"))
+SUBMISSION_EVENTS_KEEPALIVE_S = float(os.getenv("SUBMISSION_EVENTS_KEEPALIVE_S", "15"))
+SUBMISSION_EVENTS_MAX_S = float(os.getenv("SUBMISSION_EVENTS_MAX_S", "300"))
+# How long live evaluation progress (accounts.progress) stays in the cache.
+SUBMISSION_PROGRESS_TTL_S = int(os.getenv("SUBMISSION_PROGRESS_TTL_S", "600"))
+
 # Run tasks eagerly by default when using SQLite in DEBUG to avoid cross-process
 # writes that commonly trigger SQLite 'disk I/O error' during local dev.
 _eager_env = os.getenv("CELERY_TASK_ALWAYS_EAGER")
@@ -205,6 +308,41 @@ CELERY_WORKER_PREFETCH_MULTIPLIER = int(
     os.getenv("CELERY_WORKER_PREFETCH_MULTIPLIER", "1")
 )
 
+# Queues (see accounts.queues). A worker started without -Q consumes all of
+# them, as in dev; production runs one worker service per queue.
+CELERY_TASK_QUEUES = (
+    Queue("eval.python"),
+    Queue("eval.compiled"),
+    Queue("eval.fallback"),
+    Queue("maintenance"),
+)
+CELERY_TASK_DEFAULT_QUEUE = "maintenance"
+CELERY_TASK_ROUTES = {
+    # Overridden per submission by accounts.tasks.enqueue_evaluation
+    "accounts.tasks.evaluate_submission": {"queue": "eval.python"},
+}
+# Priorities on the Redis broker: 0-9, lower is served first. Messages
+# without one would land in the top bucket, so give them a default; "run"
+# requests use EVAL_PRIORITY_INTERACTIVE.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "priority_steps": list(range(10)),
+    "sep": ":",
+    "queue_order_strategy": "priority",
+}
+CELERY_TASK_DEFAULT_PRIORITY = int(os.getenv("CELERY_TASK_DEFAULT_PRIORITY", "5"))
+EVAL_PRIORITY_INTERACTIVE = int(os.getenv("EVAL_PRIORITY_INTERACTIVE", "0"))
+
+CELERY_BEAT_SCHEDULE = {
+    "refresh-judge0-health": {
+        "task": "accounts.tasks.refresh_judge0_health",
+        "schedule": JUDGE0_HEALTH_REFRESH_S,
+    },
+    "sweep-judge0-callbacks": {
+        "task": "accounts.tasks.sweep_judge0_callbacks",
+        "schedule": 60.0,
+    },
+}
+
 # CORS
 CORS_ALLOWED_ORIGINS = [
     o
@@ -67,6 +67,14 @@ import time
 import re
 from typing import Dict, Optional
 
+try:
+    from accounts import checkers
+    from accounts.judge0_client import get_client
+except ImportError:  # run as a standalone script from this directory
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+    from accounts import checkers
+    from accounts.judge0_client import get_client
+
 
 class Config:
     """
@@ -370,13 +378,15 @@ class SubmissionWrapper:
         """
         try:
             # === JUDGE0 API SUBMISSION ===
-            response = requests.post(
-                f"{Config.JUDGE0_URL}/submissions?base64_encoded=false&wait=true",
+            response = get_client(Config.JUDGE0_URL).post(
+                "/submissions?base64_encoded=false&wait=true",
                 json={
                     "source_code": source_code,
                     "language_id": language_id,
                     "stdin": test_input,
                 },
+                # wait=true holds the request open until the run finishes
+                timeout=(5, 120),
             )
             response.raise_for_status()
             result = response.json()
@@ -571,6 +581,7 @@ class SubmissionWrapper:
             mle_limit = metadata.get("mle_limit", 64000)
             baseline_time = metadata.get("baseline_time", 0.0)
             baseline_memory = metadata.get("baseline_memory", 0)
+            check = checkers.from_metadata(metadata)
 
             # === RESULT INITIALIZATION ===
             # Initialize results structure compatible with admin test case format
@@ -629,11 +640,10 @@ class SubmissionWrapper:
                 )
 
                 # === CORRECTNESS EVALUATION ===
-                # Compare actual output with expected output
+                # Compare actual output with expected output using the suite's checker
                 actual_output = execution_result.get("stdout", "").strip()
-                is_correct = (
-                    execution_result["status"] == "AC"
-                    and actual_output == expected_output
+                is_correct = execution_result["status"] == "AC" and check(
+                    actual_output, expected_output, test_input
                 )
 
                 # === PERFORMANCE MEASUREMENT ===
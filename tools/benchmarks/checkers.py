@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""Judging a large answer: the old ``strip() ==`` comparison vs ``accounts.checkers``.
+
+Builds a ``--mb`` MB expected output (``--lines`` numbers per line) and a
+matching program output with a trailing newline, then times each checker on
+the matching output and on one that differs near the end (the worst case
+for an early exit). Peak traced memory is the extra allocation per call:
+the old comparison copies the output when stripping it.
+
+Usage (from the repo root):
+    python tools/benchmarks/checkers.py [--mb 10] [--repeat 5]
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import django
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(repo_root, "src", "student_auth"))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_auth.settings")
+django.setup()
+
+from accounts import checkers  # noqa: E402
+
+
+def strip_equals(output, expected, stdin=""):
+    return output.strip() == str(expected).strip()
+
+
+def _texts(mb, per_line):
+    lines, size, n = [], 0, 0
+    while size < mb * 1024 * 1024:
+        line = " ".join(str(n + i) for i in range(per_line))
+        lines.append(line)
+        size += len(line) + 1
+        n += per_line
+    expected = "\n".join(lines)
+    # Late difference: the second-to-last character changes
+    wrong = expected[:-2] + ("0" if expected[-2] != "0" else "1") + expected[-1]
+    return expected + "\n", wrong + "\n", expected
+
+
+def _measure(check, output, expected, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        verdict = check(output, expected)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    check(output, expected)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return verdict, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--mb", type=float, default=10)
+    parser.add_argument("--lines", type=int, default=10, help="numbers per line")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    output, wrong, expected = _texts(args.mb, args.lines)
+    candidates = {
+        "strip ==": strip_equals,
+        "exact": checkers.exact,
+        "lines": checkers.lines,
+        "tokens": checkers.tokens,
+        "float": checkers.get_checker(checkers.FLOAT),
+        "unordered": checkers.unordered,
+    }
+
+    print(f"{len(output) / 1024 / 1024:.1f} MB output, best of {args.repeat}\n")
+    print(f"{'checker':<10} {'match ms':>9} {'diff ms':>9} {'peak MB':>8}")
+    for name, check in candidates.items():
+        ok, match_s, peak = _measure(check, output, expected, args.repeat)
+        bad, diff_s, _ = _measure(check, wrong, expected, args.repeat)
+        assert ok and not bad, name
+        print(f"{name:<10} {match_s * 1000:>9.1f} {diff_s * 1000:>9.1f} {peak / 1024 / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Executor CPU per C++ submission: compile per case vs compile once.
+
+"Per case" mirrors what Judge0 does when every test case carries the full
+source (compile + run N times); "once" compiles through the local BuildCache
+and runs every case on the same binary. CPU is the sum of user+sys time of
+all child processes (compiler and program runs).
+
+Usage (from the repo root):
+    python tools/benchmarks/cpp_compile_once.py [--cases 5 20 50]
+"""
+
+import argparse
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(repo_root, "src", "student_auth"))
+
+from accounts.executor import BuildCache, LocalCodeExecutor  # noqa: E402
+
+SOLUTION = r"""
+#include <bits/stdc++.h>
+using namespace std;
+int main() {
+    int n; cin >> n;
+    vector<long long> a(n);
+    for (auto &x : a) cin >> x;
+    long long target; cin >> target;
+    unordered_map<long long, int> seen;
+    for (int i = 0; i < n; i++) {
+        auto it = seen.find(target - a[i]);
+        if (it != seen.end()) { cout << it->second << " " << i << "\n"; return 0; }
+        seen[a[i]] = i;
+    }
+}
+"""
+CASE = {"stdin": "4\n2 7 11 15\n9\n", "expected_output": "0 1"}
+
+
+def _children_cpu():
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _per_case(n):
+    executor = LocalCodeExecutor(backend="subprocess")
+    for _ in range(n):
+        build_dir = tempfile.mkdtemp()
+        try:
+            src = os.path.join(build_dir, "main.cpp")
+            with open(src, "w") as f:
+                f.write(SOLUTION)
+            subprocess.run(["g++", "-O2", "-std=c++17", "-o", os.path.join(build_dir, "main"), src], check=True)
+            cases = executor._prepare_cases(build_dir, [CASE])
+            executor._run_all_cold([os.path.join(build_dir, "main")], build_dir, cases)
+        finally:
+            shutil.rmtree(build_dir)
+
+
+def _once(n, cache_root):
+    executor = LocalCodeExecutor(backend="subprocess")
+    cache = BuildCache(root=cache_root)
+    # Same as LocalCodeExecutor.execute_code("cpp", ...) with a private cache
+    artifact, error, _ = cache.build("cpp", SOLUTION)
+    assert error is None, error
+    workdir = tempfile.mkdtemp()
+    try:
+        cases = executor._prepare_cases(workdir, [CASE] * n)
+        runs = executor._run_all_cold([os.path.join(artifact, "main")], workdir, cases)
+        assert all(r["exit_code"] == 0 for r in runs)
+    finally:
+        shutil.rmtree(workdir)
+
+
+def _measure(fn, *args):
+    cpu0, wall0 = _children_cpu(), time.perf_counter()
+    fn(*args)
+    return _children_cpu() - cpu0, time.perf_counter() - wall0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, nargs="*", default=[5, 20, 50])
+    args = parser.parse_args()
+
+    print(f"{'cases':>6} {'per-case CPU (s)':>17} {'once CPU (s)':>13} {'once wall (s)':>14} {'saving':>7}")
+    for n in args.cases:
+        cache_root = tempfile.mkdtemp(prefix="bench_builds_")
+        try:
+            before, _ = _measure(_per_case, n)
+            after, wall = _measure(_once, n, cache_root)
+        finally:
+            shutil.rmtree(cache_root)
+        print(f"{n:>6} {before:>17.2f} {after:>13.2f} {wall:>14.2f} {before / after:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+"""Wall-clock enqueue time: one POST per test case vs the Judge0 batch endpoint.
+
+Runs against a local stand-in Judge0 (see stub_judge0.py) so the numbers only
+reflect round-trips, not sandbox work.
+
+Usage (from the repo root):
+    python tools/benchmarks/judge0_enqueue.py [--latency-ms 20] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import django
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(repo_root, "src", "student_auth"))
+sys.path.append(os.path.dirname(__file__))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_auth.settings")
+django.setup()
+
+from accounts.tasks import _create_judge0_batch, _create_judge0_submission  # noqa: E402
+from stub_judge0 import StubJudge0  # noqa: E402
+
+
+def _payloads(n):
+    return [
+        {"source_code": "print(input())", "language_id": 71, "stdin": str(i), "expected_output": str(i)}
+        for i in range(n)
+    ]
+
+
+def _per_case(url, payloads):
+    return [_create_judge0_submission(url, p) for p in payloads]
+
+
+def _timed(fn, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", type=int, nargs="*", default=[10, 50, 200])
+    args = parser.parse_args()
+
+    with StubJudge0(latency_ms=args.latency_ms) as stub:
+        print(f"stub Judge0 at {stub.url}, {args.latency_ms:.0f} ms per request\n")
+        print(f"{'cases':>6} {'per-case (s)':>14} {'batch (s)':>11} {'speedup':>8}")
+        for n in args.cases:
+            payloads = _payloads(n)
+            serial = _timed(_per_case, stub.url, payloads, repeat=args.repeat)
+            batched = _timed(_create_judge0_batch, stub.url, payloads, repeat=args.repeat)
+            print(f"{n:>6} {serial:>14.3f} {batched:>11.3f} {serial / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
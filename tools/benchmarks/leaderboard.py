@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""Contest leaderboard latency: Python aggregation per request vs the standings engine.
+
+"legacy" is the block the leaderboard views used to run on every request:
+load every solved UserSolution with its Student, aggregate in Python, sort,
+and rank with ``rows.index(r)`` (quadratic). The new numbers are for
+``accounts.standings``: ``aggregate`` (one GROUP BY, what a rebuild runs),
+and ``ranked`` reading one page or the whole board from the materialized
+entries (what the views run per request), plus ``iter_ranked`` streaming the
+whole board with and without per-problem columns (the CSV export).
+
+Runs against a throwaway test database (a temporary SQLite file by default,
+Postgres with ``USE_SQLITE=0``).
+
+Usage (from the repo root):
+    python tools/benchmarks/leaderboard.py [--students 10000] [--problems 10] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+import django
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(repo_root, "src", "student_auth"))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_auth.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from accounts import standings  # noqa: E402
+from accounts.models import Contest, Problem, Student, UserSolution  # noqa: E402
+
+
+def legacy(contest):
+    qs = (
+        UserSolution.objects.filter(is_solved=True, problem__contest=contest)
+        .select_related("student", "problem__contest")
+        .only("student_id", "solved_at", "problem_id", "best_time_ms")
+    )
+    agg = {}
+    for sol in qs:
+        if not sol.solved_at:
+            continue
+        sid = sol.student_id
+        if sid not in agg:
+            agg[sid] = {
+                "student": sol.student,
+                "solved": 0,
+                "total_time_s": 0.0,
+                "total_best_time_ms": 0.0,
+                "first_solve": None,
+                "points": 0,
+            }
+        agg[sid]["solved"] += 1
+        delta = (sol.solved_at - contest.start_at).total_seconds() if contest.start_at and sol.solved_at else 0
+        if delta < 0:
+            delta = 0
+        agg[sid]["total_time_s"] += float(delta)
+        if sol.best_time_ms:
+            agg[sid]["total_best_time_ms"] += float(sol.best_time_ms or 0.0)
+        if not agg[sid]["first_solve"] or sol.solved_at < agg[sid]["first_solve"]:
+            agg[sid]["first_solve"] = sol.solved_at
+        agg[sid]["points"] += 1
+
+    rows = [
+        {
+            "student_id": sid,
+            "name": data["student"].name,
+            "email": data["student"].email,
+            "solved": data["solved"],
+            "total_time_s": round(data["total_time_s"], 3),
+            "total_best_time_ms": round(data["total_best_time_ms"], 3),
+            "points": data["points"],
+            "first_solve_at": data["first_solve"],
+        }
+        for sid, data in agg.items()
+    ]
+    rows.sort(key=lambda r: (-r["solved"], r["total_best_time_ms"], r["total_time_s"], r["student_id"]))
+    rank = 0
+    prev_key = None
+    for r in rows:
+        key = (r["solved"], r["total_best_time_ms"], r["total_time_s"])
+        if key != prev_key:
+            rank = rows.index(r) + 1
+            prev_key = key
+        r["rank"] = rank
+    return rows
+
+
+def _populate(students, problems):
+    rng = random.Random(7)
+    start = timezone.now() - timedelta(hours=3)
+    contest = Contest.objects.create(name="Bench", start_at=start, duration_minutes=240)
+    probs = Problem.objects.bulk_create(
+        [Problem(contest=contest, code=f"P{i}", title=f"P{i}") for i in range(problems)]
+    )
+    people = Student.objects.bulk_create(
+        [
+            Student(name=f"S{i}", email=f"s{i}@example.com", password="x", mobile="1", college="c", passout_year=2025, branch="CS")
+            for i in range(students)
+        ],
+        batch_size=2000,
+    )
+    # bulk_create skips the signals that maintain standings; rebuilt below
+    UserSolution.objects.bulk_create(
+        [
+            UserSolution(
+                student=s,
+                problem=p,
+                is_solved=True,
+                solved_at=start + timedelta(seconds=rng.randint(1, 10_000)),
+                best_time_ms=rng.uniform(1, 500),
+            )
+            for s in people
+            for p in probs
+            if rng.random() < 0.7
+        ],
+        batch_size=2000,
+    )
+    return contest
+
+
+def _timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--students", type=int, default=10_000)
+    parser.add_argument("--problems", type=int, default=10)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if connection.vendor == "sqlite":
+        db_dir = tempfile.mkdtemp(prefix="bench_db_")
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(db_dir, "bench.sqlite3")
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        contest = _populate(args.students, args.problems)
+        solutions = UserSolution.objects.filter(problem__contest=contest).count()
+        rebuild_s, _ = _timed(lambda: standings.rebuild(contest), 1)
+
+        legacy_s, legacy_rows = _timed(lambda: legacy(contest), args.repeat)
+        aggregate_s, _ = _timed(lambda: list(standings.aggregate(contest)), args.repeat)
+        middle = args.students // 2
+        page_s, _ = _timed(lambda: standings.ranked(contest, offset=middle, limit=args.page_size), args.repeat)
+        full_s, rows = _timed(lambda: standings.ranked(contest), args.repeat)
+        assert [r["rank"] for r in rows] == [r["rank"] for r in legacy_rows]
+        stream_s, _ = _timed(lambda: sum(1 for _ in standings.iter_ranked(contest)), args.repeat)
+        per_problem_s, _ = _timed(
+            lambda: sum(1 for _ in standings.iter_ranked(contest, per_problem=True)), args.repeat
+        )
+
+        print(f"{connection.vendor}: {args.students} students x {args.problems} problems, {solutions} solutions\n")
+        print(f"{'legacy per request (Python + rows.index)':<44} {legacy_s * 1000:>10.1f} ms")
+        print(f"{'aggregate (GROUP BY, per rebuild)':<44} {aggregate_s * 1000:>10.1f} ms")
+        print(f"{'rebuild (aggregate + write entries)':<44} {rebuild_s * 1000:>10.1f} ms")
+        print(f"{f'ranked page of {args.page_size} (per request)':<44} {page_s * 1000:>10.1f} ms")
+        print(f"{'ranked full board (per request)':<44} {full_s * 1000:>10.1f} ms")
+        print(f"{'iter_ranked full board (CSV export)':<44} {stream_s * 1000:>10.1f} ms")
+        print(f"{'iter_ranked + per-problem columns':<44} {per_problem_s * 1000:>10.1f} ms")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
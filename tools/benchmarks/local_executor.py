@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Local fallback latency: fresh interpreter per case vs warm forked runners.
+
+Uses the two-sum cases under src/student_auth/testcases/, repeated to the
+requested counts, and a straightforward accepted solution.
+
+Usage (from the repo root):
+    python tools/benchmarks/local_executor.py [--cases 10 50 200] [--repeat 3]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(repo_root, "src", "student_auth"))
+
+from accounts.executor import LocalCodeExecutor  # noqa: E402
+
+SOLUTION = """
+n = int(input())
+nums = list(map(int, input().split()))
+target = int(input())
+seen = {}
+for i, x in enumerate(nums):
+    if target - x in seen:
+        print(seen[target - x], i)
+        break
+    seen[x] = i
+"""
+
+
+def _cases(n):
+    path = os.path.join(repo_root, "src", "student_auth", "testcases", "two_sum_python.json")
+    with open(path) as f:
+        base = json.load(f)["test_cases"]
+    return [base[i % len(base)] for i in range(n)]
+
+
+def _timed(executor, cases, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        results = executor.execute_python_code(SOLUTION, cases)
+        best = min(best, time.perf_counter() - t0)
+        assert all(r["passed"] for r in results), results[0]
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", type=int, nargs="*", default=[10, 50, 200])
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    cold = LocalCodeExecutor(max_workers=args.workers, backend="subprocess")
+    warm = LocalCodeExecutor(max_workers=args.workers, backend="warm")
+    _timed(warm, _cases(1), 1)  # start the runners outside the measurement
+
+    print(f"workers: {cold.max_workers}\n")
+    print(f"{'cases':>6} {'subprocess (s)':>15} {'warm (s)':>10} {'speedup':>8}")
+    for n in args.cases:
+        cases = _cases(n)
+        c = _timed(cold, cases, args.repeat)
+        w = _timed(warm, cases, args.repeat)
+        print(f"{n:>6} {c:>15.3f} {w:>10.3f} {c / w:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""Queue wait for Python submissions during a C++ burst: one shared queue vs routed queues.
+
+A discrete-event replay of the worker pool, so it runs anywhere and is
+deterministic: a burst of ``--cpp`` C++ submissions arrives at t=0, while
+Python submissions (a share of them "run" requests) keep arriving at a
+steady rate. Every job is routed with ``accounts.queues.evaluation_options``
+and served the way a ``prefetch_multiplier=1`` worker takes messages from the
+Redis broker (lowest priority number first, then oldest).
+
+- "shared": the old setup, every worker on one FIFO queue (no priorities).
+- "routed": the same number of workers split into eval.python / eval.compiled
+  pools (``--python-workers`` of them on eval.python), with priorities.
+
+Durations are the evaluation times the task holds a worker for; the defaults
+are rough figures for Judge0 polling with a compile per case (C++) vs a
+short interpreted run (Python).
+
+Usage (from the repo root):
+    python tools/benchmarks/queue_routing.py [--cpp 40] [--python 60] [--workers 8] [--python-workers 3]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+from unittest.mock import patch
+
+import django
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(repo_root, "src", "student_auth"))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_auth.settings")
+django.setup()
+
+from accounts import queues  # noqa: E402
+
+
+def _jobs(args):
+    rng = random.Random(11)
+    jobs = []
+    for _ in range(args.cpp):
+        jobs.append({"language": "cpp", "interactive": False, "arrival": 0.0, "duration": rng.uniform(6, 10)})
+    for i in range(args.python):
+        jobs.append(
+            {
+                "language": "python",
+                "interactive": rng.random() < args.run_share,
+                "arrival": i * args.python_interval,
+                "duration": rng.uniform(0.5, 1.5),
+            }
+        )
+    # Judge0 is healthy in this scenario; routing otherwise as in production
+    with patch("accounts.queues.judge0_health.is_available", return_value=(True, None)):
+        for job in jobs:
+            job.update(queues.evaluation_options(job["language"], job["interactive"]))
+    return jobs
+
+
+def simulate(jobs, pools, use_priority):
+    """Serve ``jobs``; ``pools`` maps a pool name to (queues, worker count).
+
+    Returns each job's queue wait in seconds, in the order of ``jobs``.
+    """
+    waits = [None] * len(jobs)
+    free_at = {name: [0.0] * workers for name, (_, workers) in pools.items()}
+    pending = set(range(len(jobs)))
+    while pending:
+        # The pool with the earliest idle worker takes its next message
+        name, slot, now = min(
+            ((name, i, t) for name, times in free_at.items() for i, t in enumerate(times)),
+            key=lambda x: x[2],
+        )
+        mine = [j for j in pending if jobs[j]["queue"] in pools[name][0]]
+        if not mine:
+            free_at[name][slot] = float("inf")
+            continue
+        ready = [j for j in mine if jobs[j]["arrival"] <= now]
+        if not ready:
+            free_at[name][slot] = min(jobs[j]["arrival"] for j in mine)
+            continue
+        key = (lambda j: (jobs[j]["priority"], jobs[j]["arrival"], j)) if use_priority else (
+            lambda j: (jobs[j]["arrival"], j)
+        )
+        job = min(ready, key=key)
+        pending.remove(job)
+        waits[job] = now - jobs[job]["arrival"]
+        free_at[name][slot] = now + jobs[job]["duration"]
+    return waits
+
+
+def _summary(waits):
+    waits = sorted(waits)
+    if not waits:
+        return "-"
+    p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))]
+    return f"{statistics.median(waits):>7.1f} {p95:>7.1f} {waits[-1]:>7.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cpp", type=int, default=40, help="C++ submissions in the burst")
+    parser.add_argument("--python", type=int, default=60, help="Python submissions")
+    parser.add_argument("--python-interval", type=float, default=0.5, help="seconds between Python arrivals")
+    parser.add_argument("--run-share", type=float, default=0.5, help="share of Python jobs that are runs")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--python-workers", type=int, default=3)
+    args = parser.parse_args()
+
+    jobs = _jobs(args)
+    all_queues = {queues.EVAL_PYTHON, queues.EVAL_COMPILED, queues.EVAL_FALLBACK}
+    scenarios = {
+        "shared": simulate(jobs, {"all": (all_queues, args.workers)}, use_priority=False),
+        "routed": simulate(
+            jobs,
+            {
+                "python": ({queues.EVAL_PYTHON}, args.python_workers),
+                "compiled": ({queues.EVAL_COMPILED, queues.EVAL_FALLBACK}, args.workers - args.python_workers),
+            },
+            use_priority=True,
+        ),
+    }
+
+    print(
+        f"{args.cpp} C++ at t=0, {args.python} Python every {args.python_interval}s "
+        f"({args.run_share:.0%} runs), {args.workers} workers\n"
+    )
+    print(f"{'queue wait (s)':<22} {'p50':>7} {'p95':>7} {'max':>7}")
+    for name, waits in scenarios.items():
+        for label, pick in (
+            ("python run", lambda j: j["language"] == "python" and j["interactive"]),
+            ("python submit", lambda j: j["language"] == "python" and not j["interactive"]),
+            ("cpp submit", lambda j: j["language"] == "cpp"),
+        ):
+            print(f"{name + ' / ' + label:<22} {_summary([w for j, w in zip(jobs, waits) if pick(j)])}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
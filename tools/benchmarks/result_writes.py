@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+"""Persisting a submission's case results: update_or_create per case vs one upsert.
+
+"Per case" is how evaluate_submission used to write results (a SELECT plus an
+INSERT/UPDATE per case, then the Submission save); "bulk" is
+``accounts.results.save_results`` (one upsert and the Submission save in one
+transaction). Each variant is timed writing fresh rows and overwriting them
+(a re-evaluation), serially and as a burst of concurrent workers, which is
+where SQLite reports ``database is locked``.
+
+Runs against a throwaway test database: a temporary file with the default
+SQLite settings, or Postgres with ``USE_SQLITE=0`` and the usual
+``POSTGRES_*`` variables.
+
+Usage (from the repo root):
+    python tools/benchmarks/result_writes.py [--cases 100] [--workers 8] [--repeat 3]
+    USE_SQLITE=0 POSTGRES_HOST=... python tools/benchmarks/result_writes.py
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import django
+
+repo_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.append(os.path.join(repo_root, "src", "student_auth"))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "student_auth.settings")
+django.setup()
+
+from django.db import OperationalError, connection, connections  # noqa: E402
+from django.utils import timezone  # noqa: E402
+
+from accounts.models import (  # noqa: E402
+    Contest,
+    Problem,
+    Submission,
+    SubmissionTestCaseResult,
+    TestCaseBlob,
+)
+from accounts.results import result_row, save_results  # noqa: E402
+
+FINAL_FIELDS = ["score", "max_score", "status", "updated_at"]
+
+
+def _tests(n):
+    return [{"stdin": str(i), "expected_output": str(i), "group": "default", "weight": 1.0} for i in range(n)]
+
+
+def _fields(i, run):
+    return {"output": str(i + run), "passed": run == 0, "status": "Accepted", "time_ms": 1.5, "memory_kb": 9000}
+
+
+def _per_case(sub, tests, run):
+    for i, test in enumerate(tests):
+        case, _ = TestCaseBlob.objects.get_or_create(
+            digest=TestCaseBlob.digest_for(test["stdin"], test["expected_output"]),
+            defaults={"stdin": test["stdin"], "expected_output": test["expected_output"]},
+        )
+        SubmissionTestCaseResult.objects.update_or_create(
+            submission=sub,
+            index=i,
+            defaults={"group": test["group"], "weight": test["weight"], "case": case, **_fields(i, run)},
+        )
+    sub.score, sub.max_score, sub.status = 1.0, float(len(tests)), Submission.Status.DONE
+    sub.save(update_fields=FINAL_FIELDS)
+
+
+def _bulk(sub, tests, run):
+    rows = [result_row(sub, i, test, **_fields(i, run)) for i, test in enumerate(tests)]
+    sub.score, sub.max_score, sub.status = 1.0, float(len(tests)), Submission.Status.DONE
+    save_results(sub, rows, update_fields=FINAL_FIELDS)
+
+
+def _serial(write, problem, tests, repeat):
+    """Best (insert, overwrite) wall time over ``repeat`` fresh submissions."""
+    best = [float("inf"), float("inf")]
+    for _ in range(repeat):
+        sub = Submission.objects.create(problem=problem, code="print(input())", language="python")
+        for run in (0, 1):
+            t0 = time.perf_counter()
+            write(sub, tests, run)
+            best[run] = min(best[run], time.perf_counter() - t0)
+    return best
+
+
+def _burst(write, problem, tests, workers):
+    """Wall time and lock errors when ``workers`` threads write at once."""
+    subs = [
+        Submission.objects.create(problem=problem, code="print(input())", language="python")
+        for _ in range(workers)
+    ]
+    errors = []
+    gate = threading.Barrier(workers)
+
+    def work(sub):
+        try:
+            gate.wait()
+            write(sub, tests, 0)
+        except OperationalError as e:
+            errors.append(str(e))
+        finally:
+            connections.close_all()
+
+    threads = [threading.Thread(target=work, args=(sub,)) for sub in subs]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - t0, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cases", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if connection.vendor == "sqlite":
+        # A file, not the in-memory default, so locking behaves as in production
+        db_dir = tempfile.mkdtemp(prefix="bench_db_")
+        connection.settings_dict["TEST"]["NAME"] = os.path.join(db_dir, "bench.sqlite3")
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        contest = Contest.objects.create(name="Bench", start_at=timezone.now())
+        problem = Problem.objects.create(contest=contest, code="B1", title="Bench")
+        tests = _tests(args.cases)
+
+        print(f"{connection.vendor}, {args.cases} cases per submission\n")
+        print(f"{'variant':>9} {'insert (ms)':>12} {'overwrite (ms)':>15} {f'burst x{args.workers} (ms)':>17} {'locked':>7}")
+        for name, write in (("per-case", _per_case), ("bulk", _bulk)):
+            insert, overwrite = _serial(write, problem, tests, args.repeat)
+            burst, locked = _burst(write, problem, tests, args.workers)
+            print(f"{name:>9} {insert * 1000:>12.1f} {overwrite * 1000:>15.1f} {burst * 1000:>17.1f} {locked:>7}")
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Minimal stand-in for the Judge0 HTTP API, for local benchmarks.
+
+Implements just enough of the API used by ``accounts.tasks``:
+
+- ``GET  /about``
+- ``POST /submissions``            -> ``{"token": ...}``
+- ``POST /submissions/batch``      -> ``[{"token": ...}, ...]`` (capped at ``max_batch``)
+- ``GET  /submissions/batch``      -> ``{"submissions": [...]}``
+
+Every request sleeps ``latency_ms`` to model the network/Rails round-trip, and
+each submission finishes ``run_ms`` after creation with stdout == expected_output.
+"""
+
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class StubJudge0:
+    def __init__(self, latency_ms=20.0, run_ms=0.0, max_batch=20):
+        self.latency_s = latency_ms / 1000.0
+        self.run_s = run_ms / 1000.0
+        self.max_batch = max_batch
+        self.submissions = {}
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _create(self, payload):
+        token = uuid.uuid4().hex
+        with self._lock:
+            self.submissions[token] = {"payload": payload, "created": time.time()}
+        return token
+
+    def _view(self, token):
+        sub = self.submissions.get(token)
+        if sub is None:
+            return None
+        if time.time() - sub["created"] < self.run_s:
+            return {"token": token, "status": {"id": 2, "description": "Processing"}}
+        return {
+            "token": token,
+            "status": {"id": 3, "description": "Accepted"},
+            "stdout": sub["payload"].get("expected_output", ""),
+            "stderr": None,
+            "time": "0.01",
+            "memory": 1024,
+        }
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True  # keep-alive + delayed ACK would add ~40ms
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body):
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _enter(self):
+                with stub._lock:
+                    stub.request_count += 1
+                time.sleep(stub.latency_s)
+
+            def do_GET(self):
+                self._enter()
+                url = urlparse(self.path)
+                if url.path == "/about":
+                    return self._reply(200, {"version": "stub"})
+                if url.path == "/submissions/batch":
+                    tokens = parse_qs(url.query).get("tokens", [""])[0].split(",")
+                    return self._reply(
+                        200, {"submissions": [stub._view(t) for t in tokens if t]}
+                    )
+                return self._reply(404, {"error": "not found"})
+
+            def do_POST(self):
+                self._enter()
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                url = urlparse(self.path)
+                if url.path == "/submissions":
+                    return self._reply(201, {"token": stub._create(body)})
+                if url.path == "/submissions/batch":
+                    items = body.get("submissions", [])
+                    if len(items) > stub.max_batch:
+                        return self._reply(
+                            422, {"error": f"number of submissions must be <= {stub.max_batch}"}
+                        )
+                    return self._reply(201, [{"token": stub._create(i)} for i in items])
+                return self._reply(404, {"error": "not found"})
+
+        return Handler